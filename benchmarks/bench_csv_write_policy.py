@@ -0,0 +1,75 @@
+"""
+CSV 쓰기 정책별 처리량 벤치마크
+
+사용법:
+    python -m benchmarks.bench_csv_write_policy [--rows 행수] [--dir 출력디렉토리]
+
+매 행 기록(기존 동작)부터 N행/T밀리초 버퍼링, 주기적 fsync 까지 정책별로
+초당 기록 행 수와 기록 1회당 지연 시간을 비교한다. SD 카드 성능을 보려면
+--dir 로 해당 장치의 경로를 지정한다.
+"""
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+from duet_monitor.core.csv_handler import CsvHandler
+from duet_monitor.core.session_catalog import get_meta_path
+from duet_monitor.core.load_generator import LoadGenerator
+
+# (이름, flush_rows, flush_interval_ms, fsync_interval_ms)
+POLICIES = [
+    ("매 행 기록", 1, 0, None),
+    ("매 행 기록 + fsync", 1, 0, 0),
+    ("50행 버퍼", 50, 1000, None),
+    ("500행 버퍼", 500, 5000, None),
+    ("50행 + fsync 1초", 50, 1000, 1000),
+    ("50행 + fsync 10초", 50, 1000, 10000),
+]
+
+
+def run_policy(rows, directory: str, flush_rows: int, interval_ms: int, fsync_ms):
+    """정책 하나로 rows 를 기록하고 (초당 행 수, 기록 통계) 반환"""
+    handler = CsvHandler(flush_rows, interval_ms, fsync_ms, rotate_by=None, compression=None)
+    path = os.path.join(directory, "bench_policy.csv")
+    handler.initialize(path)
+    start = time.perf_counter()
+    for row in rows:
+        handler.append_data(row)
+    handler.close()
+    elapsed = time.perf_counter() - start
+    stats = handler.get_flush_stats()
+    # 세그먼트와 함께 생성된 메타데이터/매니페스트 파일까지 삭제
+    for segment in handler.get_segment_paths():
+        for leftover in (segment, get_meta_path(segment)):
+            if os.path.exists(leftover):
+                os.remove(leftover)
+    if handler.manifest_path and os.path.exists(handler.manifest_path):
+        os.remove(handler.manifest_path)
+    return len(rows) / elapsed, stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="CSV 쓰기 정책 벤치마크")
+    parser.add_argument("--rows", type=int, default=20000, help="기록할 행 수")
+    parser.add_argument("--dir", default=None, help="출력 디렉토리 (기본: 임시 디렉토리)")
+    args = parser.parse_args()
+
+    frame = LoadGenerator(seed=0).generate_frame(args.rows)
+    frame["timestamp"] = frame["timestamp"].astype(str)
+    rows = frame.to_dict("records")
+
+    directory = args.dir or tempfile.mkdtemp(prefix="csv_bench_")
+    print(f"출력 위치: {directory}, {args.rows:,}행")
+    print(f"{'정책':<20} {'행/초':>10} {'기록 횟수':>9} {'fsync':>6} {'평균 지연(ms)':>13} {'최대 지연(ms)':>13}")
+    for name, flush_rows, interval_ms, fsync_ms in POLICIES:
+        rate, stats = run_policy(rows, directory, flush_rows, interval_ms, fsync_ms)
+        print(f"{name:<20} {rate:>10,.0f} {stats['flush_count']:>9} {stats['fsync_count']:>6} "
+              f"{stats['avg_latency_ms']:>13.3f} {stats['max_latency_ms']:>13.3f}")
+    if not args.dir:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+단일 행 경로 vs 배치 경로 수신 처리량 벤치마크
+
+사용법:
+    python -m benchmarks.bench_ingest_batch [--duration 초]
+
+10 / 100 / 1000 샘플/초로 샘플을 흘려보내면서 두 경로의 CPU 사용량과
+처리 지연을 비교하고, 마지막으로 속도 제한 없이 최대 처리량을 측정한다.
+"""
+import argparse
+import time
+
+import duet_monitor.utils.debug as debug
+from duet_monitor.core.data_processor import DataProcessor
+from duet_monitor.core.ingest_batcher import IngestBatcher
+from duet_monitor.core.load_generator import LoadGenerator
+from duet_monitor.config.settings import INGEST_BATCH_SIZE, INGEST_BATCH_INTERVAL_MS
+
+RATES = [10, 100, 1000]
+
+
+def run_paced(rate: int, duration: float, batched: bool):
+    """주어진 속도로 샘플을 넣고 (CPU 초, 실제 처리 샘플 수) 반환"""
+    processor = DataProcessor()
+    batcher = None
+    if batched:
+        batcher = IngestBatcher(processor.update_dataframe_batch,
+                                INGEST_BATCH_SIZE, INGEST_BATCH_INTERVAL_MS)
+        batcher.start()
+    total = int(rate * duration)
+    samples = LoadGenerator(rate_hz=rate, seed=rate).generate_records(total)
+    interval = 1.0 / rate
+    cpu_start = time.process_time()
+    next_time = time.perf_counter()
+    for sample in samples:
+        if batcher:
+            batcher.add(sample)
+        else:
+            processor.update_dataframe(sample)
+        next_time += interval
+        delay = next_time - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+    if batcher:
+        batcher.stop()
+    return time.process_time() - cpu_start, total
+
+
+def run_unpaced(count: int, batched: bool) -> float:
+    """속도 제한 없이 count개 처리 후 초당 처리량 반환"""
+    processor = DataProcessor()
+    samples = LoadGenerator(seed=0).generate_records(count)
+    start = time.perf_counter()
+    if batched:
+        batcher = IngestBatcher(processor.update_dataframe_batch,
+                                INGEST_BATCH_SIZE, INGEST_BATCH_INTERVAL_MS)
+        batcher.start()
+        for sample in samples:
+            batcher.add(sample)
+        batcher.stop()
+    else:
+        for sample in samples:
+            processor.update_dataframe(sample)
+    return count / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="수신 배치 처리 벤치마크")
+    parser.add_argument("--duration", type=float, default=3.0, help="속도별 측정 시간(초)")
+    parser.add_argument("--count", type=int, default=5000, help="최대 처리량 측정 샘플 수")
+    args = parser.parse_args()
+
+    debug.DEBUG = False  # 디버그 출력이 측정을 왜곡하지 않도록 비활성화
+
+    print(f"{'속도(샘플/초)':>14} {'경로':>6} {'CPU(초)':>9} {'CPU 사용률':>10} {'샘플당 CPU(us)':>15}")
+    for rate in RATES:
+        for batched in (False, True):
+            cpu, total = run_paced(rate, args.duration, batched)
+            label = "배치" if batched else "단일"
+            print(f"{rate:>14} {label:>6} {cpu:>9.3f} {cpu / args.duration * 100:>9.1f}% "
+                  f"{cpu / total * 1e6:>15.1f}")
+
+    print()
+    for batched in (False, True):
+        label = "배치" if batched else "단일"
+        print(f"최대 처리량 ({label}): {run_unpaced(args.count, batched):,.0f} 샘플/초")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,221 @@
+"""
+REST 업로드 vs MQTT 직접 발행 벤치마크
+
+사용법:
+    python -m benchmarks.bench_mqtt_transport [--samples 샘플수] [--rest-samples 샘플수]
+                                              [--latency 지연ms] [--drop]
+
+로컬 HTTPS 서버(bench_upload_session)와 최소 MQTT 3.1.1 브로커 대역(CONNECT/PUBLISH QoS1/
+PINGREQ 만 처리)에 같은 응답 지연을 주고, 장치 하나의 샘플을 UploadPipeline 으로 보내
+초당 전송 수를 비교한다. --drop 을 주면 MQTT 전송 중간에 브로커가 연결을 한 번 끊어
+자동 재연결 후에도 모든 메시지가 PUBACK 되는지 확인한다.
+"""
+import argparse
+import os
+import socket
+import struct
+import tempfile
+import threading
+import time
+from collections import deque
+
+import duet_monitor.utils.debug as debug
+from duet_monitor.mqtt import mqtt_client
+from duet_monitor.mqtt.mqtt_transport import MqttTransport
+from duet_monitor.mqtt.upload_pipeline import UploadPipeline
+from duet_monitor.core.load_generator import LoadGenerator
+from benchmarks.bench_upload_session import start_server
+
+
+class StandInBroker:
+    def __init__(self, latency_ms: float = 0.0, password: str = None):
+        """
+        최소 MQTT 브로커 대역 (구독/전달 없이 PUBACK 만 응답)
+
+        Args:
+            latency_ms: CONNACK/PUBACK 지연(ms), 연결마다 보낸 순서대로 응답
+            password: 허용할 비밀번호 (None이면 모두 허용, 다르면 CONNACK 5)
+        """
+        self.latency = latency_ms / 1000.0
+        self.password = password
+        self.received = 0
+        self.connects = 0
+        self._conns = []
+        self._lock = threading.Lock()
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.sock.bind(("127.0.0.1", 0))
+        self.sock.listen(16)
+        self.port = self.sock.getsockname()[1]
+        threading.Thread(target=self._accept, daemon=True).start()
+
+    def drop_connections(self):
+        """열린 연결을 모두 끊음 (클라이언트 재연결 확인용)"""
+        with self._lock:
+            conns, self._conns = self._conns, []
+        for conn in conns:
+            try:
+                conn.shutdown(socket.SHUT_RDWR)
+                conn.close()
+            except OSError:
+                pass
+
+    def _accept(self):
+        while True:
+            try:
+                conn, _ = self.sock.accept()
+            except OSError:
+                return
+            conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            with self._lock:
+                self._conns.append(conn)
+            threading.Thread(target=self._serve, args=(conn,), daemon=True).start()
+
+    @staticmethod
+    def _read_exact(conn, size: int) -> bytes:
+        data = b""
+        while len(data) < size:
+            chunk = conn.recv(size - len(data))
+            if not chunk:
+                raise ConnectionError()
+            data += chunk
+        return data
+
+    def _serve(self, conn):
+        replies = deque()
+        wakeup = threading.Condition()
+
+        def writer():
+            # 지연 응답을 보낸 순서대로 전송
+            while True:
+                with wakeup:
+                    while not replies:
+                        wakeup.wait()
+                    due, data = replies.popleft()
+                if data is None:
+                    return
+                delay = due - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+                try:
+                    conn.sendall(data)
+                except OSError:
+                    return
+
+        def reply(data, delayed=True):
+            with wakeup:
+                replies.append((time.monotonic() + (self.latency if delayed else 0), data))
+                wakeup.notify()
+
+        threading.Thread(target=writer, daemon=True).start()
+        try:
+            while True:
+                header = self._read_exact(conn, 1)[0]
+                length, shift = 0, 0
+                while True:
+                    byte = self._read_exact(conn, 1)[0]
+                    length |= (byte & 0x7F) << shift
+                    shift += 7
+                    if not byte & 0x80:
+                        break
+                body = self._read_exact(conn, length) if length else b""
+                kind = header >> 4
+                if kind == 1:  # CONNECT
+                    rc = 0 if self.password is None or self._password(body) == self.password else 5
+                    self.connects += rc == 0
+                    reply(bytes([0x20, 2, 0, rc]))
+                    if rc:
+                        break
+                elif kind == 3:  # PUBLISH
+                    self.received += 1
+                    if (header >> 1) & 3:
+                        topic_len = struct.unpack_from("!H", body)[0]
+                        reply(b"\x40\x02" + body[2 + topic_len:4 + topic_len])
+                elif kind == 12:  # PINGREQ
+                    reply(b"\xd0\x00", delayed=False)
+                elif kind == 14:  # DISCONNECT
+                    break
+        except (ConnectionError, OSError):
+            pass
+        reply(None, delayed=False)
+        time.sleep(0.05)
+        try:
+            conn.close()
+        except OSError:
+            pass
+
+    @staticmethod
+    def _password(body: bytes):
+        """CONNECT 본문에서 비밀번호 추출"""
+        offset = 2 + struct.unpack_from("!H", body)[0] + 1  # 프로토콜 이름, 레벨
+        flags = body[offset]
+        offset += 3  # 플래그, keepalive
+        fields = []
+        while offset < len(body):
+            size = struct.unpack_from("!H", body, offset)[0]
+            fields.append(body[offset + 2:offset + 2 + size])
+            offset += 2 + size
+        if not flags & 0x40:
+            return None
+        return fields[-1].decode("utf-8")
+
+
+def run_pipeline(samples, **kwargs):
+    """샘플을 파이프라인으로 모두 보내고 (걸린 시간, 통계) 반환"""
+    pipeline = UploadPipeline(token="bench", max_pending=len(samples), **kwargs)
+    pipeline.start()
+    start = time.perf_counter()
+    for sample in samples:
+        pipeline.submit(f"smartair/{sample['id']}/airquality", sample, sample["id"])
+    pipeline.stop(timeout=120)
+    return time.perf_counter() - start, pipeline.get_stats()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="REST 업로드 vs MQTT 직접 발행 벤치마크")
+    parser.add_argument("--samples", type=int, default=5000, help="MQTT 샘플 수")
+    parser.add_argument("--rest-samples", type=int, default=300, help="REST 샘플 수")
+    parser.add_argument("--latency", type=float, default=5.0, help="서버/브로커 응답 지연(ms)")
+    parser.add_argument("--drop", action="store_true", help="MQTT 전송 중 연결을 한 번 끊음")
+    args = parser.parse_args()
+
+    debug.DEBUG = False
+    samples = LoadGenerator(devices=1, seed=0).generate_records(max(args.samples, args.rest_samples))
+
+    # REST (공유 세션, 작업 스레드 4개, 장치 하나라 순서대로 하나씩)
+    server, url, cert = start_server(tempfile.mkdtemp(prefix="upload_bench_"), args.latency)
+    os.environ["REQUESTS_CA_BUNDLE"] = cert
+    rest_time, rest_stats = run_pipeline(
+        samples[:args.rest_samples],
+        publish_func=lambda topic, payload, token: mqtt_client.mqtt_publish(topic, payload, token, url=url))
+    mqtt_client.close_session()
+    server.shutdown()
+
+    # MQTT (연결 하나, QoS1 창)
+    broker = StandInBroker(args.latency, password="bench")
+    transport = MqttTransport(host="127.0.0.1", port=broker.port, token="bench")
+    transport.connect()
+    if args.drop:
+        threading.Timer(0.3, broker.drop_connections).start()
+    mqtt_time, mqtt_stats = run_pipeline(samples[:args.samples], publish_async_func=transport.publish_async)
+    transport_stats = transport.get_stats()
+    transport.close()
+
+    # 인증 거부 확인
+    rejected = MqttTransport(host="127.0.0.1", port=broker.port, token="wrong")
+    rejected.connect(timeout=1)
+    reject_code, _ = rejected.publish("smartair/817/airquality", samples[0])
+    rejected.close()
+
+    rest_rate = rest_stats["sent"] / rest_time
+    mqtt_rate = mqtt_stats["sent"] / mqtt_time
+    print(f"응답 지연 {args.latency:g} ms, 장치 1대")
+    print(f"REST : {rest_stats['sent']:6d}/{args.rest_samples} 성공, {rest_time:6.2f} 초, {rest_rate:9.1f} 메시지/초")
+    print(f"MQTT : {mqtt_stats['sent']:6d}/{args.samples} 성공, {mqtt_time:6.2f} 초, {mqtt_rate:9.1f} 메시지/초 "
+          f"(창 {transport.max_inflight}, 연결 {transport_stats['connects']}회, 브로커 수신 {broker.received})")
+    print(f"향상: {mqtt_rate / rest_rate:.1f}배")
+    print(f"잘못된 토큰 발행 결과 코드: {reject_code}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+발행 정책별 업로드 감소량 벤치마크
+
+사용법:
+    python -m benchmarks.bench_publish_policy [--samples 샘플수] [--devices 장치수]
+                                              [--interval 샘플간격초] [--window 구간초] [--n N]
+
+부하 생성기 샘플을 가상 시각(--interval 간격)으로 PublishPolicyRouter 에 넣고,
+정책별로 발행되는 메시지 수와 JSON 바이트 수, 샘플당 처리 시간을 raw 와 비교한다.
+"""
+import argparse
+import json
+import time
+
+import duet_monitor.utils.debug as debug
+from duet_monitor.core.load_generator import LoadGenerator
+from duet_monitor.mqtt.publish_policy import PublishPolicyRouter
+
+
+def run_policy(records, interval, policy):
+    """샘플을 모두 넣고 (발행 메시지 목록, 샘플당 처리 시간 µs) 반환"""
+    router = PublishPolicyRouter([{"policy": policy}])
+    out = []
+    start = time.perf_counter()
+    for i, record in enumerate(records):
+        device_id = record["id"]
+        out += router.route(f"smartair/{device_id}/airquality", record, device_id, now=i * interval)
+    out += [payload for _, _, payload in router.flush(now=len(records) * interval, force=True)]
+    elapsed = time.perf_counter() - start
+    return out, elapsed / len(records) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="발행 정책별 업로드 감소량 벤치마크")
+    parser.add_argument("--samples", type=int, default=20000, help="샘플 수")
+    parser.add_argument("--devices", type=int, default=4, help="장치 수")
+    parser.add_argument("--interval", type=float, default=0.1, help="샘플 간격(초, 전체 장치 기준)")
+    parser.add_argument("--window", type=float, default=10.0, help="window 정책 구간(초)")
+    parser.add_argument("--n", type=int, default=10, help="every_nth 정책 N")
+    args = parser.parse_args()
+
+    debug.DEBUG = False
+    records = LoadGenerator(devices=args.devices, seed=0).generate_records(args.samples)
+    policies = [
+        ("raw", {"type": "raw"}),
+        (f"every_nth n={args.n}", {"type": "every_nth", "n": args.n}),
+        (f"window {args.window:g}s mean", {"type": "window", "window_s": args.window}),
+        (f"window {args.window:g}s +min/max", {"type": "window", "window_s": args.window,
+                                               "stats": ["min", "max"]}),
+        ("deadband", {"type": "deadband", "threshold": 2, "heartbeat_s": 60,
+                      "thresholds": {"*particles*": 200, "raw*": 300, "temperature": 0.5,
+                                     "hum": 1, "tvoc": 50, "eco2": 100}}),
+    ]
+
+    print(f"샘플 {args.samples}개, 장치 {args.devices}대, 간격 {args.interval:g} 초")
+    raw_bytes = None
+    for name, policy in policies:
+        out, per_sample_us = run_policy(records, args.interval, policy)
+        size = sum(len(json.dumps(payload, ensure_ascii=False, default=str)) for payload in out)
+        raw_bytes = raw_bytes or size
+        print(f"{name:24s}: {len(out):7d} 메시지 ({len(out) / len(records):6.1%}), "
+              f"{size / 1024:9.1f} KB ({size / raw_bytes:6.1%}), {per_sample_us:6.2f} µs/샘플")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+SQLite 저장 처리량 / 시간 범위 조회 지연 벤치마크
+
+사용법:
+    python -m benchmarks.bench_sqlite_ingest [--rows 행수] [--devices 장치수] [--dir 출력디렉토리]
+
+수신 경로와 같은 크기(64행)의 배치로 삽입하며 커밋 구간별 초당 행 수를 재고
+(커밋당 1행은 1행씩 삽입해 매 행 커밋),
+이후 장치 하나의 1분 / 10분 구간 조회 시간을 측정한다.
+"""
+import argparse
+import os
+import tempfile
+import time
+from datetime import timedelta
+
+import duet_monitor.utils.debug as debug
+from duet_monitor.core.load_generator import LoadGenerator
+from duet_monitor.core.sqlite_handler import SqliteHandler
+
+COMMIT_ROWS = [1, 100, 500, 2000]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="SQLite 저장 벤치마크")
+    parser.add_argument("--rows", type=int, default=50000, help="삽입할 행 수")
+    parser.add_argument("--devices", type=int, default=10, help="장치 수")
+    parser.add_argument("--dir", default=None, help="출력 디렉토리 (기본: 임시 디렉토리)")
+    args = parser.parse_args()
+
+    debug.DEBUG = False
+    directory = args.dir or tempfile.mkdtemp(prefix="sqlite_bench_")
+    generator = LoadGenerator(devices=args.devices, rate_hz=1.0, seed=0)
+    records = generator.generate_records(args.rows)
+    start_time = generator.start_time
+
+    print(f"출력 위치: {directory}, {args.rows:,}행, 장치 {args.devices}개")
+    for commit_rows in COMMIT_ROWS:
+        path = os.path.join(directory, f"bench_{commit_rows}.db")
+        rows = records if commit_rows > 1 else records[:2000]
+        handler = SqliteHandler(commit_rows=commit_rows, commit_interval_ms=60000)
+        handler.initialize(path)
+        batch = min(64, commit_rows)
+        begin = time.perf_counter()
+        for i in range(0, len(rows), batch):
+            handler.append_batch(rows[i:i + batch])
+        handler.flush()
+        elapsed = time.perf_counter() - begin
+        print(f"커밋당 {commit_rows:>5}행: {len(rows) / elapsed:>10,.0f} 행/초 ({handler.commit_count}회 커밋)")
+        if commit_rows != COMMIT_ROWS[-1]:
+            handler.close()
+            os.remove(path)
+
+    device_id = generator.first_device_id
+    for minutes in (1, 10):
+        begin = time.perf_counter()
+        df = handler.query(start_time, start_time + timedelta(minutes=minutes), device_id=device_id,
+                           columns=["pt1_pm25_standard"])
+        print(f"{minutes:>2}분 구간 조회: {(time.perf_counter() - begin) * 1000:.1f} ms ({len(df)}행)")
+    handler.close()
+
+
+if __name__ == "__main__":
+    main()
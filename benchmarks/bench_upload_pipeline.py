@@ -0,0 +1,72 @@
+"""
+동기 업로드 vs 업로드 파이프라인 벤치마크
+
+사용법:
+    python -m benchmarks.bench_upload_pipeline [--samples 샘플수] [--devices 장치수] [--latency 서버지연ms]
+
+로컬 HTTPS 서버(bench_upload_session 과 같은 자체 서명 인증서 서버)에 지연을 주고,
+시리얼 콜백 안에서 바로 업로드하는 기존 방식과 UploadPipeline.submit 만 호출하는 방식의
+콜백 처리 속도(= 시리얼 수신이 감당할 수 있는 최대 샘플/초)와 업로드 완료까지의 시간을 비교한다.
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import duet_monitor.utils.debug as debug
+from duet_monitor.mqtt import mqtt_client
+from duet_monitor.mqtt.upload_pipeline import UploadPipeline
+from duet_monitor.core.load_generator import LoadGenerator
+from benchmarks.bench_upload_session import start_server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="동기 업로드 vs 업로드 파이프라인 벤치마크")
+    parser.add_argument("--samples", type=int, default=200, help="샘플 수")
+    parser.add_argument("--devices", type=int, default=4, help="장치 수")
+    parser.add_argument("--latency", type=float, default=20.0, help="서버 처리 지연(ms)")
+    args = parser.parse_args()
+
+    debug.DEBUG = False
+    server, url, cert = start_server(tempfile.mkdtemp(prefix="upload_bench_"), args.latency)
+    os.environ["REQUESTS_CA_BUNDLE"] = cert
+    samples = LoadGenerator(devices=args.devices, seed=0).generate_records(args.samples)
+
+    def publish(topic, payload, token):
+        return mqtt_client.mqtt_publish(topic, payload, token, url=url)
+
+    # 기존 방식: 콜백 안에서 응답을 기다림
+    ok = 0
+    start = time.perf_counter()
+    for sample in samples:
+        code, _ = publish(f"smartair/{sample['id']}/airquality", sample, "bench")
+        ok += code == 200
+    sync_time = time.perf_counter() - start
+
+    # 파이프라인: 콜백은 대기열에 넣기만 함 (한도를 넉넉히 두어 대체 없이 비교)
+    pipeline = UploadPipeline(publish_func=publish, token="bench", max_pending=args.samples)
+    pipeline.start()
+    start = time.perf_counter()
+    results = [pipeline.submit(f"smartair/{sample['id']}/airquality", sample, sample["id"])
+               for sample in samples]
+    submit_time = time.perf_counter() - start
+    pipeline.stop(timeout=60)
+    drain_time = time.perf_counter() - start
+    stats = pipeline.get_stats()
+    latencies = sorted(r.get_latency() for r in results if r.get_latency() is not None)
+    mqtt_client.close_session()
+    server.shutdown()
+
+    print(f"샘플 {args.samples}개, 장치 {args.devices}대, 서버 지연 {args.latency:g} ms, "
+          f"작업 스레드 {pipeline.workers}개")
+    print(f"동기 업로드  : 콜백 {sync_time / args.samples * 1000:8.3f} ms/샘플 "
+          f"(최대 {args.samples / sync_time:9.1f} 샘플/초), 완료 {sync_time:6.2f} 초, 성공 {ok}")
+    print(f"파이프라인   : 콜백 {submit_time / args.samples * 1000:8.3f} ms/샘플 "
+          f"(최대 {args.samples / submit_time:9.1f} 샘플/초), 완료 {drain_time:6.2f} 초, 성공 {stats['sent']}")
+    if latencies:
+        print(f"파이프라인 업로드 지연: 중앙값 {latencies[len(latencies) // 2] * 1000:.1f} ms, "
+              f"최대 {latencies[-1] * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
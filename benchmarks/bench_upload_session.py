@@ -0,0 +1,101 @@
+"""
+업로드 연결 재사용 벤치마크
+
+사용법:
+    python -m benchmarks.bench_upload_session [--requests 요청수] [--latency 서버지연ms]
+
+로컬 HTTPS 서버(openssl 자체 서명 인증서)를 띄우고, 요청마다 requests.post 로
+새 연결을 맺는 기존 방식과 공유 세션을 쓰는 mqtt_publish_only 의 초당 요청 수를 비교한다.
+openssl 명령이 필요하다.
+"""
+import argparse
+import os
+import ssl
+import subprocess
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+import duet_monitor.utils.debug as debug
+from duet_monitor.mqtt import mqtt_client
+from duet_monitor.core.load_generator import LoadGenerator
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive 허용
+    disable_nagle_algorithm = True  # 작은 응답이 지연 ACK 에 묶이지 않도록
+    latency = 0.0
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        if self.latency:
+            time.sleep(self.latency)
+        body = b"ok"
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def start_server(directory: str, latency_ms: float):
+    """자체 서명 인증서로 로컬 HTTPS 서버 시작, (서버, URL, 인증서 경로) 반환"""
+    cert = os.path.join(directory, "cert.pem")
+    key = os.path.join(directory, "key.pem")
+    subprocess.run(["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-keyout", key,
+                    "-out", cert, "-days", "1", "-subj", "/CN=localhost",
+                    "-addext", "subjectAltName=DNS:localhost,IP:127.0.0.1"],
+                   check=True, capture_output=True)
+    _Handler.latency = latency_ms / 1000.0
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    context.load_cert_chain(cert, key)
+    server.socket = context.wrap_socket(server.socket, server_side=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"https://localhost:{server.server_address[1]}/mqtt/receive", cert
+
+
+def main():
+    parser = argparse.ArgumentParser(description="업로드 연결 재사용 벤치마크")
+    parser.add_argument("--requests", type=int, default=300, help="요청 수")
+    parser.add_argument("--latency", type=float, default=0.0, help="서버 처리 지연(ms)")
+    args = parser.parse_args()
+
+    debug.DEBUG = False
+    directory = tempfile.mkdtemp(prefix="upload_bench_")
+    server, url, cert = start_server(directory, args.latency)
+    # 두 방식 모두 자체 서명 인증서로 검증 (환경 변수 CA 번들이 세션 verify 보다 우선하므로 함께 지정)
+    os.environ["REQUESTS_CA_BUNDLE"] = cert
+    payloads = LoadGenerator(devices=1, seed=0).generate_records(args.requests)
+    topic = "smartair/817/airquality"
+    headers = {"Authorization": "Bearer bench", "Content-Type": "application/json", "Accept": "*/*"}
+
+    # 기존 방식: 요청마다 새 연결 (TCP + TLS 핸드셰이크)
+    start = time.perf_counter()
+    for payload in payloads:
+        requests.post(url, headers=headers, json={"topic": topic, "payload": payload},
+                      timeout=5)
+    before = args.requests / (time.perf_counter() - start)
+
+    # 공유 세션: keep-alive 연결 재사용
+    ok = 0
+    start = time.perf_counter()
+    for payload in payloads:
+        ok += mqtt_client.mqtt_publish_only(topic, payload, "bench", url=url)
+    after = args.requests / (time.perf_counter() - start)
+    mqtt_client.close_session()
+    server.shutdown()
+
+    print(f"요청 {args.requests}회, 서버 지연 {args.latency:g} ms")
+    print(f"요청마다 새 연결: {before:8.1f} 요청/초 ({1000 / before:6.2f} ms/요청)")
+    print(f"공유 세션       : {after:8.1f} 요청/초 ({1000 / after:6.2f} ms/요청), 성공 {ok}/{args.requests}")
+    print(f"향상: {after / before:.1f}배")
+
+
+if __name__ == "__main__":
+    main()
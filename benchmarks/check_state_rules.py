@@ -0,0 +1,101 @@
+"""
+센서 상태 판정 경계값 검사
+
+사용법:
+    python -m benchmarks.check_state_rules
+
+SENSOR_STATE_RULES 의 모든 경계값과 그 바로 위/아래 값을 SensorStateClassifier 와
+기존 led_display.update_basic_leds 의 if/elif 판정으로 각각 분류해 결과가 같은지 비교한다.
+다른 값이 있으면 목록을 출력하고 종료 코드 1로 끝난다.
+"""
+import sys
+
+from duet_monitor.config.settings import SENSOR_STATE_RULES
+from duet_monitor.core.state_classifier import SensorStateClassifier
+
+# 기존 판정의 색상 → 상태 이름
+COLOR_STATES = {"blue": "low", "green": "normal", "yellow": "warning", "red": "critical", "gray": "unknown"}
+
+# 검사할 센서 이름 (규칙마다 기존 판정이 있던 이름 하나씩)
+SENSORS = ["temperature", "humidity", "pressure", "eco2", "tvoc", "pt1_pm25"]
+
+# 경계값 주변에서 함께 검사할 오프셋
+OFFSETS = [-1.0, -0.01, -1e-9, 0.0, 1e-9, 0.01, 1.0]
+
+
+def legacy_color(name, value):
+    """기존 led_display.update_basic_leds 의 센서별 색상 판정"""
+    color = 'gray'
+    if name.lower() == 'temperature':
+        if value < 18:
+            color = 'blue'
+        elif 18 <= value <= 26:
+            color = 'green'
+        elif 26 < value <= 30:
+            color = 'yellow'
+        else:
+            color = 'red'
+    elif name.lower() == 'humidity':
+        if value < 30:
+            color = 'blue'
+        elif 30 <= value < 40 or 60 < value <= 70:
+            color = 'yellow'
+        elif 40 <= value <= 60:
+            color = 'green'
+        else:
+            color = 'red'
+    elif name.lower() == 'pressure':
+        if 980 <= value <= 1050:
+            color = 'green'
+        elif 950 <= value < 980 or 1050 < value <= 1080:
+            color = 'yellow'
+        else:
+            color = 'red'
+    elif name.lower() == 'eco2':
+        if 400 <= value <= 1000:
+            color = 'green'
+        elif 1000 < value <= 2000:
+            color = 'yellow'
+        else:
+            color = 'red'
+    elif name.lower() == 'tvoc':
+        if value <= 200:
+            color = 'green'
+        elif 200 < value <= 400:
+            color = 'yellow'
+        else:
+            # 기존 코드에는 400 초과 분기가 없어 회색으로 남았음 (규칙 표에서 critical 로 지정)
+            color = 'red'
+    elif 'pm10' in name.lower() or 'pm25' in name.lower() or 'pm100' in name.lower():
+        if value <= 15:
+            color = 'green'
+        elif 15 < value <= 35:
+            color = 'yellow'
+        else:
+            color = 'red'
+    return color
+
+
+def main():
+    classifier = SensorStateClassifier()
+    edges = sorted({float(e) for rule in SENSOR_STATE_RULES for e in rule["edges"]})
+    checked = 0
+    mismatches = []
+    for name in SENSORS:
+        for edge in edges:
+            for offset in OFFSETS:
+                value = edge + offset
+                expected = COLOR_STATES[legacy_color(name, value)]
+                actual = classifier.classify({name: value})[name]
+                checked += 1
+                if actual != expected:
+                    mismatches.append((name, value, expected, actual))
+
+    for name, value, expected, actual in mismatches:
+        print(f"{name:12s} {value!r:>22}: 기존 {expected:8s} 규칙 표 {actual}")
+    print(f"{checked}개 값 검사, 불일치 {len(mismatches)}개")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
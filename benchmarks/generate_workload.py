@@ -0,0 +1,58 @@
+"""
+표준 벤치마크 작업 부하 생성
+
+사용법:
+    python -m benchmarks.generate_workload --samples 1000000 --devices 50 --csv data/load.csv
+    python -m benchmarks.generate_workload --samples 100000 --serial data/load.bin --corrupt 0.01
+    python -m benchmarks.generate_workload --pty --rate 100
+
+--pty 는 가상 시리얼 포트를 만들어 경로를 출력한 뒤, 프로그램의 시리얼 연결에
+그 경로를 입력하면 실제 장치처럼 데이터를 흘려보낸다 (POSIX 전용).
+"""
+import argparse
+import time
+
+from duet_monitor.core.load_generator import LoadGenerator
+
+
+def main():
+    parser = argparse.ArgumentParser(description="DUET 합성 작업 부하 생성")
+    parser.add_argument("--samples", type=int, default=100000, help="전체 샘플 수")
+    parser.add_argument("--devices", type=int, default=1, help="장치 수")
+    parser.add_argument("--rate", type=float, default=1.0, help="장치당 초당 샘플 수")
+    parser.add_argument("--drift", type=float, default=0.0, help="pt2 시간당 드리프트 비율")
+    parser.add_argument("--gaps", type=float, default=0.0, help="수신 공백 확률")
+    parser.add_argument("--corrupt", type=float, default=0.0, help="손상 라인 비율 (시리얼 출력)")
+    parser.add_argument("--new-column-after", type=int, default=None, help="새 컬럼이 나타나는 샘플 번호")
+    parser.add_argument("--seed", type=int, default=0, help="난수 시드")
+    parser.add_argument("--csv", help="CSV 출력 경로")
+    parser.add_argument("--serial", help="시리얼 원시 바이트 출력 경로")
+    parser.add_argument("--pty", action="store_true", help="가상 시리얼 포트로 전송")
+    args = parser.parse_args()
+
+    generator = LoadGenerator(devices=args.devices, rate_hz=args.rate, drift_per_hour=args.drift,
+                              gap_probability=args.gaps, corrupt_ratio=args.corrupt,
+                              new_column_after=args.new_column_after, seed=args.seed)
+    start = time.perf_counter()
+    if args.csv:
+        rows = generator.write_csv(args.csv, args.samples)
+        print(f"CSV {rows:,}행 저장: {args.csv}")
+    elif args.serial:
+        size = generator.write_serial_bytes(args.serial, args.samples)
+        print(f"시리얼 바이트 {size:,}B 저장: {args.serial}")
+    elif args.pty:
+        master_fd, slave_path = generator.open_pty()
+        print(f"가상 시리얼 포트: {slave_path} (Ctrl+C로 종료)")
+        try:
+            sent = generator.feed_pty(master_fd, args.samples)
+            print(f"{sent:,}개 샘플 전송")
+        except KeyboardInterrupt:
+            pass
+    else:
+        frame = generator.generate_frame(args.samples)
+        print(frame.describe().T[["mean", "min", "max"]])
+    print(f"소요 시간: {time.perf_counter() - start:.2f}초")
+
+
+if __name__ == "__main__":
+    main()
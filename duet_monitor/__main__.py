@@ -3,7 +3,7 @@ DUET 모니터링 시스템 메인 실행 파일
 """
 import tkinter as tk
 from .core.serial_handler import SerialHandler
-from .core.csv_handler import CsvHandler
+from .core.storage import create_storage_handler
 from .core.data_processor import DataProcessor
 from .ui.main_window import MainWindow
 
@@ -14,7 +14,7 @@ def main():
     
     # 핸들러 초기화
     serial_handler = SerialHandler()
-    csv_handler = CsvHandler()
+    csv_handler = create_storage_handler()
     data_processor = DataProcessor()
     
     # 메인 윈도우 초기화
@@ -7,5 +7,15 @@ SIGNUP_URL = f"{API_BASE}/join"
 REISSUE_URL = f"{API_BASE}/reissue"
 SNAPSHOT_URL = f"{API_BASE}/snapshots"  # 스냅샷 API 엔드포인트
 MQTT_RECEIVE_URL = f"{API_BASE}/mqtt/receive"  # MQTT 데이터 수신 엔드포인트
+
+# 업로드(REST) 연결 설정 - 세션을 재사용해 매 요청마다 TCP/TLS 연결을 새로 맺지 않음
+UPLOAD_CONNECT_TIMEOUT = 3.05  # 연결 대기 시간(초)
+UPLOAD_READ_TIMEOUT = 5  # 응답 대기 시간(초)
+UPLOAD_POOL_SIZE = 4  # 호스트당 유지할 연결 수 (동시 업로드 스레드 수 이상)
+
+# 비동기 업로드 파이프라인 (시리얼 수신과 네트워크 전송 분리)
+UPLOAD_WORKERS = 4  # 동시에 보내는 요청 수 (장치마다 최대 1개, UPLOAD_POOL_SIZE 이하)
+UPLOAD_LANE_MAX_PENDING = 32  # 장치별 대기 한도, 넘으면 가장 오래된 대기 샘플을 버리고 최신 샘플 유지
+UPLOAD_TRANSPORT = "rest"  # "rest": MQTT_RECEIVE_URL 로 POST, "mqtt": 브로커에 직접 발행 (paho-mqtt 필요, mqtt_config 참고)
 # 필요시 추가 엔드포인트
 # DASHBOARD_DATA_URL = f"{API_BASE}/your-endpoint"
\ No newline at end of file
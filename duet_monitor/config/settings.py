@@ -4,7 +4,7 @@
 import os
 import platform
 import matplotlib.font_manager as fm
-from typing import Dict, List, Tuple, Any
+from typing import Dict, List, Tuple, Any, Optional
 
 # 애플리케이션 설정
 APP_TITLE = "DUET 모니터링 시스템"
@@ -25,6 +25,80 @@ DEFAULT_DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(
 # 디렉터리가 없으면 생성
 os.makedirs(DEFAULT_DATA_DIR, exist_ok=True)
 
+# CSV 쓰기 정책 (행을 메모리에 모았다가 N행 또는 T밀리초마다 한 번에 기록)
+CSV_FLUSH_ROWS = 50  # 이 행 수가 쌓이면 기록 (1이면 매 행 기록)
+CSV_FLUSH_INTERVAL_MS = 1000  # 마지막 기록 후 이 시간이 지나면 기록
+CSV_FSYNC_INTERVAL_MS: Optional[int] = 10000  # 디스크 동기화(fsync) 간격 (None이면 사용 안 함, 0이면 매 기록)
+CSV_ASYNC_WRITE = True  # 전용 쓰기 스레드 사용 (SD 카드 지연이 수신을 막지 않도록)
+CSV_QUEUE_SIZE = 10000  # 쓰기 대기열 최대 행 수 (가득 차면 새 행은 버림)
+CSV_ROTATE_BY: Optional[str] = "day"  # 세그먼트 회전 기준: "hour", "day", "size", None(회전 안 함)
+CSV_ROTATE_MAX_BYTES = 256 * 1024 * 1024  # "size" 회전 시 세그먼트 최대 크기
+CSV_COMPRESSION: Optional[str] = "gzip"  # 닫힌 세그먼트 압축: "gzip", "zstd"(zstandard 필요), None
+CSV_COMPRESSION_WAIT_S = 30.0  # 종료 시 남은 압축을 기다리는 최대 시간 (못 끝낸 세그먼트는 다음 실행 때 압축)
+
+# CSV 스트리밍 로드 설정
+CSV_LOAD_CHUNK_ROWS = 50000  # 청크당 행 수
+# 미리 알려진 컬럼 dtype (fnmatch 패턴, 타입 추론 생략, 결측값이 있을 수 있어 실수형 사용)
+CSV_KNOWN_DTYPES: Dict[str, str] = {
+    "pt1_*": "float64",
+    "pt2_*": "float64",
+    "temperature": "float64",
+    "hum": "float64",
+    "pressure": "float64",
+    "tvoc": "float64",
+    "eco2": "float64",
+    "rawh2": "float64",
+    "rawethanol": "float64",
+    "sample_time": "float64",
+    "id": "float64",
+    "type": "float64",
+}
+# 다시 연 CSV를 파싱 없이 읽는 컬럼별 바이너리 캐시
+LOAD_CACHE_ENABLED = True
+LOAD_CACHE_DIR = os.path.join(DEFAULT_DATA_DIR, "cache")
+LOAD_CACHE_MAX_BYTES = 2 * 1024 * 1024 * 1024  # 캐시 전체 최대 크기 (넘으면 오래된 항목부터 삭제)
+
+# 데이터 내보내기(저장) 청크당 행 수
+EXPORT_CHUNK_ROWS = 50000
+
+# 여러 세션 파일 조회 시 동시에 읽을 파일 수
+QUERY_MAX_WORKERS = 4
+
+# 수집 파일 저장 형식 ("csv", "parquet"(pyarrow 필요), "binary"(고정 길이 바이너리 로그), "sqlite")
+STORAGE_FORMAT = "csv"
+BINARY_LOG_BUFFER_RECORDS = 4096  # 바이너리 로그 쓰기 버퍼 레코드 수
+SQLITE_COMMIT_ROWS = 500  # SQLite: 이 행 수가 쌓이면 한 트랜잭션으로 커밋
+SQLITE_COMMIT_INTERVAL_MS = 1000  # SQLite: 마지막 커밋 후 이 시간이 지나면 커밋
+PARQUET_COMPRESSION = "zstd"  # "zstd", "snappy", "gzip", "none"
+PARQUET_ROW_GROUP_SECONDS = 60  # 행 그룹 하나가 담는 시간 구간(초)
+PARQUET_MAX_BUFFER_ROWS = 10000  # 메모리에 모아둘 최대 행 수
+
+# 무제한 기록 모드 설정 (메모리 데이터 제한 "제한 없음")
+HISTORY_DIR = os.path.join(DEFAULT_DATA_DIR, "history")  # 디스크 세그먼트 저장 위치
+HOT_WINDOW_ROWS = 1000  # 메모리에 유지할 최근 행 수
+HISTORY_SEGMENT_ROWS = 65536  # 세그먼트 파일당 행 수
+HISTORY_SPILL_CHUNK_ROWS = 256  # 한 번에 디스크로 옮길 최소 행 수
+
+# 수신 데이터 배치 커밋 설정
+INGEST_BATCH_SIZE = 64  # 이 개수가 모이면 즉시 커밋
+INGEST_BATCH_INTERVAL_MS = 50  # 첫 샘플 수신 후 최대 대기 시간 (ms)
+
+# 수신 배치 선기록 저널 (전원 차단 시 반영되지 않은 배치를 다음 시작 때 복구)
+JOURNAL_ENABLED = False
+JOURNAL_PATH = os.path.join(DEFAULT_DATA_DIR, "ingest.wal")
+JOURNAL_FSYNC = True  # 배치마다 디스크 동기화
+JOURNAL_MAX_BYTES = 16 * 1024 * 1024  # 모두 반영된 상태에서 이 크기를 넘으면 비움
+
+# 업로드 아웃박스 (보내기 전에 디스크에 먼저 저장, 전송에 실패한 메시지는 연결이 돌아오면 순서대로 재전송)
+OUTBOX_ENABLED = True
+OUTBOX_PATH = os.path.join(DEFAULT_DATA_DIR, "outbox.db")
+OUTBOX_MAX_MESSAGES = 500000  # 넘으면 가장 오래된 메시지부터 삭제
+OUTBOX_MAX_AGE_S = 7 * 24 * 3600  # 이보다 오래된 메시지는 삭제 (초)
+OUTBOX_REPLAY_RATE = 20  # 밀린 메시지 재전송 속도 (메시지/초, 0이면 제한 없음)
+OUTBOX_REPLAY_BATCH = 100  # 한 번에 읽어 재전송할 메시지 수
+OUTBOX_RETRY_INTERVAL_S = 5  # 재전송 실패 후 다시 시도할 때까지 대기 시간 (초)
+OUTBOX_ACK_INTERVAL_MS = 1000  # 전송 완료 표시(삭제)를 모아서 반영하는 주기
+
 # 테이블 설정
 TABLE_MAX_ROWS = 100  # 테이블에 표시할 최대 행 수
 
@@ -107,4 +181,82 @@ LED_COLORS = {
     "on": "#00FF00",   # 녹색
     "off": "#FF0000",  # 빨간색
     "idle": "#AAAAAA"  # 회색
-} 
\ No newline at end of file
+} 
+# 수신 단계 스파이크/이상치 필터 (Hampel)
+OUTLIER_FILTER_ENABLED = False
+OUTLIER_FILTER_PATTERNS = ["pt1_*", "pt2_*", "rawh2", "rawethanol"]
+OUTLIER_FILTER_WINDOW = 11  # 판정 윈도우 크기
+OUTLIER_FILTER_SIGMAS = 3.0  # 중앙값에서 몇 배 표준편차 이상 벗어나면 이상치로 판단
+OUTLIER_FILTER_MIN_SIGMA = 1.0  # 값이 거의 일정할 때의 최소 표준편차
+OUTLIER_FILTER_MODE = "replace"  # "replace": 중앙값으로 대체 후 {컬럼}_raw 보존, "flag": {컬럼}_outlier 표시
+
+# 트윈 센서(pt1_X / pt2_X) 일치도 추적
+TWIN_WINDOW = 60  # 슬라이딩 윈도우 샘플 수
+TWIN_MIN_CORRELATION = 0.8  # 이보다 상관계수가 낮으면 드리프트
+TWIN_MAX_RATIO_DEVIATION = 0.3  # 평균 비율이 1에서 이만큼 벗어나면 드리프트
+
+# 이동 집계 설정 (일치하는 컬럼마다 "{컬럼}_{접미사}" 가상 컬럼 생성)
+# - sma: 이동 평균 (window개), ewma: 지수 이동 평균 (alpha), median: 이동 중앙값 (window개)
+ROLLING_AGGREGATES: List[Dict[str, Any]] = [
+    {"patterns": ["pt1_pm*", "pt2_pm*"],
+     "aggregates": [
+         {"type": "sma", "window": 10},
+         {"type": "ewma", "alpha": 0.2},
+         {"type": "median", "window": 15}
+     ]},
+]
+
+# 센서 상태 판정 규칙
+# - patterns: 센서 이름(소문자)과 비교할 fnmatch 패턴, 위에서부터 처음 일치한 규칙 적용
+# - edges: 구간 경계 (오름차순)
+# - levels: 구간별 상태 (len(edges) + 1 개)
+# - inclusive: 경계값이 속하는 쪽 ("lower": 아래 구간, "upper": 위 구간), 경계마다 하나 (생략하면 모두 "lower")
+SENSOR_STATE_RULES: List[Dict[str, Any]] = [
+    {"patterns": ["temperature"], "edges": [18, 26, 30],
+     "levels": ["low", "normal", "warning", "critical"],
+     "inclusive": ["upper", "lower", "lower"]},
+    {"patterns": ["humidity", "hum"], "edges": [30, 40, 60, 70],
+     "levels": ["low", "warning", "normal", "warning", "critical"],
+     "inclusive": ["upper", "upper", "lower", "lower"]},
+    {"patterns": ["pressure"], "edges": [950, 980, 1050, 1080],
+     "levels": ["critical", "warning", "normal", "warning", "critical"],
+     "inclusive": ["upper", "upper", "lower", "lower"]},
+    {"patterns": ["eco2"], "edges": [400, 1000, 2000],
+     "levels": ["critical", "normal", "warning", "critical"],
+     "inclusive": ["upper", "lower", "lower"]},
+    {"patterns": ["tvoc"], "edges": [200, 400],
+     "levels": ["normal", "warning", "critical"]},
+    {"patterns": ["*pm10*", "*pm25*", "*pm100*"], "edges": [15, 35],
+     "levels": ["normal", "warning", "critical"]},
+]
+SENSOR_STATE_DEFAULT = "normal"  # 규칙이 없는 숫자 센서의 상태
+
+# 상태별 LED 색상
+SENSOR_STATE_COLORS = {
+    "unknown": "gray",
+    "low": "blue",
+    "normal": "green",
+    "warning": "yellow",
+    "critical": "red"
+}
+
+# 경보로 취급할 상태 (상태 표시줄 경고 및 업로드 플래그에 사용)
+SENSOR_ALARM_LEVELS = ["critical"]
+UPLOAD_ALARM_FLAGS = False  # True이면 업로드 페이로드에 "alarms" 필드 추가
+
+# 업로드 발행 정책 (원본은 로컬에 모두 저장하고, 서버에는 정책에 따라 줄여서 발행)
+# - devices / topics: 장치 id / 토픽과 비교할 fnmatch 패턴 (생략하면 전체), 위에서부터 처음 일치한 규칙 적용
+# - raw: 모든 샘플 발행
+# - every_nth: n개마다 하나 발행
+# - window: window_s 초 구간마다 집계 하나 발행 (stat: "mean"/"min"/"max", stats 의 통계는 "window" 필드에 추가)
+# - deadband: 값이 마지막 발행값에서 threshold 넘게 바뀌면 발행 (thresholds 로 필드 패턴별 지정),
+#             바뀌지 않아도 heartbeat_s 초마다 발행
+PUBLISH_POLICIES: List[Dict[str, Any]] = [
+    # {"devices": ["817"], "topics": ["smartair/*/airquality"],
+    #  "policy": {"type": "window", "window_s": 10, "stat": "mean", "stats": ["min", "max"]}},
+    # {"policy": {"type": "deadband", "threshold": 1.0, "thresholds": {"temperature": 0.2, "hum": 0.5},
+    #             "heartbeat_s": 60}},
+    {"policy": {"type": "raw"}},
+]
+PUBLISH_EXCLUDE_FIELDS = ["id", "type", "sample_time"]  # 집계/변화 판단에서 제외 (마지막 값 그대로 발행)
+PUBLISH_FLUSH_INTERVAL_MS = 1000  # 샘플이 끊겨도 끝난 집계 구간을 발행하는 주기
@@ -2,4 +2,5 @@
 코어 패키지
 """
 from .data_collector import DataCollector
-from .data_processor import DataProcessor 
\ No newline at end of file
+from .data_processor import DataProcessor 
+from .query import query_sessions, QueryResult
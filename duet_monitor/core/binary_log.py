@@ -0,0 +1,427 @@
+"""
+고정 길이 바이너리 샘플 로그 모듈
+
+최고 속도 수집용 추가 전용 로그. 파일은 4 KiB 스키마 헤더(JSON) 뒤에
+(timestamp int64 ns, 센서 값 float64 ...) 고정 길이 레코드가 이어진다.
+쓰기는 구조화 배열 버퍼를 모았다가 큰 순차 쓰기로 기록하고, 읽기는 numpy.memmap 으로
+복사 없이 컬럼 뷰를 제공한다. CSV/Parquet 변환은 convert_log 로 오프라인에서 한다.
+"""
+import os
+import json
+import numpy as np
+import pandas as pd
+from datetime import datetime
+from typing import Dict, Any, Callable, List, Optional
+from ..config.settings import BINARY_LOG_BUFFER_RECORDS
+from .data_processor import flatten_row
+from .journal import DurabilityWaiters
+
+MAGIC = b"DUETBLOG"
+HEADER_SIZE = 4096
+_NAT = np.iinfo(np.int64).min
+
+
+def _to_ns(value: Any) -> int:
+    """타임스탬프 값을 int64 나노초로 변환 (변환할 수 없으면 NaT 값)"""
+    if value is None:
+        return _NAT
+    try:
+        return int(np.datetime64(value, "ns").astype(np.int64))
+    except (ValueError, TypeError):
+        try:
+            return int(pd.Timestamp(value).value)
+        except (ValueError, TypeError):
+            return _NAT
+
+
+_NUMERIC_TYPES = (int, float, bool)
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float, np.number)) and not isinstance(value, str)
+
+
+class BinaryLogHandler:
+    FILE_EXTENSION = ".dlog"
+
+    def __init__(self, buffer_records: int = BINARY_LOG_BUFFER_RECORDS):
+        """
+        바이너리 로그 핸들러 초기화
+
+        Args:
+            buffer_records: 메모리 버퍼 레코드 수 (가득 차면 한 번에 기록)
+        """
+        self.buffer_records = buffer_records
+        self.file_path: Optional[str] = None
+        self.log_file = None
+        self._durable = DurabilityWaiters()  # 디스크 동기화 후 호출할 콜백
+        self.columns: List[str] = []
+        self.column_index: Dict[str, int] = {}
+        self.dtype: Optional[np.dtype] = None
+        self.segment_paths: List[str] = []
+        self._buffer: Optional[np.ndarray] = None
+        self._count = 0
+        self.records_written = 0
+        self.skipped_values = 0  # 숫자가 아니어서 저장하지 못한 값 수
+
+    def initialize(self, file_path: str) -> bool:
+        """
+        로그 파일 초기화 (스키마는 첫 데이터로 결정)
+
+        Args:
+            file_path: 로그 파일 경로
+
+        Returns:
+            bool: 성공 여부
+        """
+        try:
+            self.close()
+            os.makedirs(os.path.dirname(file_path), exist_ok=True)
+            self.file_path = file_path
+            self.columns, self.column_index, self.dtype = [], {}, None
+            self.segment_paths = []
+            self.records_written = 0
+            self.skipped_values = 0
+            print(f"바이너리 로그 초기화됨: {file_path}")
+            return True
+
+        except Exception as e:
+            print(f"바이너리 로그 초기화 실패: {e}")
+            return False
+
+    def _open_segment(self, columns: List[str]):
+        """스키마 헤더를 쓰고 새 세그먼트 열기 (새 컬럼이 생기면 파일명_partNNN.dlog)"""
+        if not self.segment_paths:
+            path = self.file_path
+        else:
+            stem, ext = os.path.splitext(self.file_path)
+            path = f"{stem}_part{len(self.segment_paths):03d}{ext}"
+            print(f"새 컬럼 발견, 바이너리 로그 세그먼트 전환: {path}")
+        self.columns = columns
+        self.column_index = {column: i + 1 for i, column in enumerate(columns)}
+        self.dtype = np.dtype([("timestamp", "<i8")] + [(column, "<f8") for column in columns])
+        self._buffer = np.zeros(self.buffer_records, dtype=self.dtype)
+        self._count = 0
+
+        header = json.dumps({
+            "version": 1,
+            "columns": columns,
+            "record_size": self.dtype.itemsize,
+            "created": datetime.now().isoformat(),
+        }, ensure_ascii=False).encode("utf-8")
+        if len(MAGIC) + len(header) > HEADER_SIZE:
+            raise ValueError("컬럼이 너무 많아 스키마 헤더에 들어가지 않습니다.")
+        self.log_file = open(path, "wb")
+        self.log_file.write((MAGIC + header).ljust(HEADER_SIZE, b" "))
+        self.segment_paths.append(path)
+
+    def close(self) -> bool:
+        """
+        남은 버퍼를 기록하고 파일 닫기
+
+        Returns:
+            bool: 성공 여부
+        """
+        if self.log_file:
+            try:
+                self.flush()
+                self.log_file.close()
+                self.log_file = None
+                return True
+
+            except Exception as e:
+                print(f"바이너리 로그 닫기 실패: {e}")
+                self._durable.discard()
+                return False
+        return True
+
+    def flush(self) -> bool:
+        """
+        버퍼에 쌓인 레코드를 파일에 기록
+
+        Returns:
+            bool: 성공 여부
+        """
+        if not self.log_file:
+            return False
+        if self._count:
+            self.log_file.write(self._buffer[:self._count].tobytes())
+            self.records_written += self._count
+            self._count = 0
+        self.log_file.flush()
+        if len(self._durable):
+            os.fsync(self.log_file.fileno())
+            self._durable.notify()
+        return True
+
+    def when_durable(self, callback: Callable[[], Any]) -> bool:
+        """
+        지금까지 추가한 행이 디스크에 동기화되면 callback 호출 (버퍼가 가득 차거나 닫을 때 fsync 한 뒤)
+
+        Args:
+            callback: 동기화 후 호출할 함수
+
+        Returns:
+            bool: 등록 여부 (로그가 열려 있지 않으면이면 False)
+        """
+        if not self.log_file:
+            return False
+        self._durable.add(callback)
+        return True
+
+    def append_data(self, data: Dict[str, Any]) -> bool:
+        """
+        로그에 데이터 추가
+
+        Args:
+            data: 추가할 데이터 (pt1/pt2 중첩 딕셔너리는 평탄화됨)
+
+        Returns:
+            bool: 성공 여부
+        """
+        return self.append_batch([data])
+
+    def append_batch(self, data_list: List[Dict[str, Any]]) -> bool:
+        """
+        로그에 데이터 배치 추가 (숫자 값만 저장, 문자열 등은 건너뜀)
+
+        Args:
+            data_list: 추가할 데이터 리스트
+
+        Returns:
+            bool: 성공 여부
+        """
+        if not data_list:
+            return True
+        if self.file_path is None:
+            print("바이너리 로그가 초기화되지 않았습니다.")
+            return False
+        try:
+            rows = [flatten_row(data) for data in data_list]
+            if self.dtype is None:
+                # 첫 배치의 숫자 컬럼 합집합으로 스키마 결정
+                columns = list(dict.fromkeys(
+                    key for row in rows for key, value in row.items()
+                    if key != "timestamp" and _is_number(value)))
+                self._open_segment(columns)
+            for row in rows:
+                self._append_row(row)
+            return True
+
+        except Exception as e:
+            print(f"바이너리 로그 데이터 추가 실패: {e}")
+            return False
+
+    def _append_row(self, row: Dict[str, Any]):
+        """평탄화된 행 하나를 레코드로 변환해 버퍼에 추가"""
+        index = self.column_index
+        unknown = row.keys() - index.keys()
+        unknown.discard("timestamp")
+        if unknown:
+            new_columns = [key for key in row if key in unknown and _is_number(row[key])]
+            if new_columns:
+                self.close()
+                self._open_segment(self.columns + new_columns)
+                index = self.column_index
+            self.skipped_values += len(unknown) - len(new_columns)
+
+        record = [np.nan] * (len(self.columns) + 1)
+        record[0] = _to_ns(row.get("timestamp"))
+        for key, value in row.items():
+            position = index.get(key)
+            if position is not None:
+                if type(value) in _NUMERIC_TYPES:
+                    record[position] = value
+                elif _is_number(value):
+                    record[position] = float(value)
+                else:
+                    self.skipped_values += 1
+        self._buffer[self._count] = tuple(record)
+        self._count += 1
+        if self._count == self.buffer_records:
+            self.flush()
+
+    def get_segment_paths(self) -> List[str]:
+        """현재 세션에서 생성된 세그먼트 파일 경로 목록 반환"""
+        return list(self.segment_paths)
+
+    def save_dataframe(self, df: pd.DataFrame, file_path: str) -> bool:
+        """
+        데이터프레임을 CSV 파일로 저장
+
+        Args:
+            df: 저장할 데이터프레임
+            file_path: 저장할 파일 경로
+
+        Returns:
+            bool: 성공 여부
+        """
+        from .csv_handler import CsvHandler
+        return CsvHandler().save_dataframe(df, file_path)
+
+    def load_csv(self, file_path: str) -> Optional[pd.DataFrame]:
+        """
+        파일을 데이터프레임으로 로드 (.dlog 면 바이너리 로그, 그 외는 확장자에 맞는 핸들러)
+
+        Args:
+            file_path: 로드할 파일 경로
+
+        Returns:
+            Optional[pd.DataFrame]: 로드된 데이터프레임 (실패 시 None)
+        """
+        if file_path.endswith(".parquet"):
+            from .parquet_handler import ParquetHandler
+            return ParquetHandler().load_csv(file_path)
+        if file_path.endswith(".db"):
+            from .sqlite_handler import SqliteHandler
+            return SqliteHandler().load_csv(file_path)
+        if not file_path.endswith(self.FILE_EXTENSION):
+            from .csv_handler import CsvHandler
+            return CsvHandler().load_csv(file_path)
+        try:
+            return BinaryLogReader(file_path).to_dataframe()
+        except Exception as e:
+            print(f"바이너리 로그 로드 실패: {e}")
+            return None
+
+
+class BinaryLogReader:
+    def __init__(self, file_path: str):
+        """
+        바이너리 로그 읽기 (memmap, 파일 끝의 불완전한 레코드는 무시)
+
+        Args:
+            file_path: 로그 파일 경로
+        """
+        self.file_path = file_path
+        with open(file_path, "rb") as f:
+            header = f.read(HEADER_SIZE)
+        if not header.startswith(MAGIC):
+            raise ValueError(f"바이너리 로그 파일이 아닙니다: {file_path}")
+        self.schema = json.loads(header[len(MAGIC):].decode("utf-8").strip())
+        self.columns: List[str] = self.schema["columns"]
+        self.dtype = np.dtype([("timestamp", "<i8")] + [(c, "<f8") for c in self.columns])
+        count = (os.path.getsize(file_path) - HEADER_SIZE) // self.dtype.itemsize
+        if count > 0:
+            self.records = np.memmap(file_path, dtype=self.dtype, mode="r",
+                                     offset=HEADER_SIZE, shape=(count,))
+        else:
+            self.records = np.zeros(0, dtype=self.dtype)
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def column(self, name: str) -> np.ndarray:
+        """
+        컬럼 뷰 반환 (복사 없음, 파일이 매핑된 메모리를 그대로 참조)
+
+        Args:
+            name: 컬럼 이름 ("timestamp"는 int64 나노초)
+
+        Returns:
+            np.ndarray: 컬럼 값 (stride 뷰)
+        """
+        return self.records[name]
+
+    def record(self, index: int) -> Dict[str, Any]:
+        """
+        index 번째 레코드 반환 (O(1), 오프셋 = 헤더 + index × 레코드 크기)
+
+        Args:
+            index: 레코드 번호 (음수면 끝에서부터)
+
+        Returns:
+            Dict[str, Any]: 레코드 값
+        """
+        rec = self.records[index]
+        values = {name: float(rec[name]) for name in self.columns}
+        values["timestamp"] = pd.Timestamp(int(rec["timestamp"])) if rec["timestamp"] != _NAT else None
+        return values
+
+    def seek_time(self, timestamp) -> int:
+        """
+        timestamp 이상인 첫 레코드 번호 반환
+
+        레코드는 시간 순으로 추가되므로 memmap 된 timestamp 컬럼에서 이진 탐색한다.
+
+        Args:
+            timestamp: 찾을 시간
+
+        Returns:
+            int: 레코드 번호 (모두 이전이면 len)
+        """
+        return int(np.searchsorted(self.records["timestamp"], _to_ns(timestamp), side="left"))
+
+    def slice_time(self, start_time=None, end_time=None) -> np.ndarray:
+        """
+        시간 범위에 해당하는 레코드 뷰 반환 (복사 없음)
+
+        Args:
+            start_time: 시작 시간 (None이면 처음부터)
+            end_time: 종료 시간 (None이면 끝까지, 포함)
+
+        Returns:
+            np.ndarray: 구조화 배열 뷰
+        """
+        start = 0 if start_time is None else self.seek_time(start_time)
+        end = len(self.records) if end_time is None else int(
+            np.searchsorted(self.records["timestamp"], _to_ns(end_time), side="right"))
+        return self.records[start:end]
+
+    def to_dataframe(self, start_time=None, end_time=None,
+                     columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        데이터프레임으로 변환
+
+        Args:
+            start_time: 시작 시간
+            end_time: 종료 시간
+            columns: 포함할 컬럼 (None이면 전체)
+
+        Returns:
+            pd.DataFrame: timestamp 컬럼을 포함한 데이터
+        """
+        return _records_to_frame(self.slice_time(start_time, end_time), columns or self.columns)
+
+
+def _records_to_frame(records: np.ndarray, columns: List[str]) -> pd.DataFrame:
+    out = {"timestamp": np.array(records["timestamp"]).view("datetime64[ns]")}
+    for name in columns:
+        out[name] = np.array(records[name])
+    return pd.DataFrame(out)
+
+
+def convert_log(src_path: str, dst_path: str, chunk_records: int = 100000) -> int:
+    """
+    바이너리 로그를 CSV 또는 Parquet 로 변환 (오프라인, 청크 단위)
+
+    Args:
+        src_path: 바이너리 로그 경로
+        dst_path: 출력 경로 (.csv 또는 .parquet)
+        chunk_records: 한 번에 변환할 레코드 수
+
+    Returns:
+        int: 변환된 레코드 수
+    """
+    reader = BinaryLogReader(src_path)
+    total = len(reader)
+    if dst_path.endswith(".parquet"):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        writer = None
+        try:
+            for start in range(0, total, chunk_records):
+                frame = _records_to_frame(reader.records[start:start + chunk_records], reader.columns)
+                table = pa.Table.from_pandas(frame, preserve_index=False)
+                if writer is None:
+                    writer = pq.ParquetWriter(dst_path, table.schema, compression="zstd")
+                writer.write_table(table)
+        finally:
+            if writer is not None:
+                writer.close()
+    else:
+        with open(dst_path, "w", newline="", encoding="utf-8") as f:
+            for start in range(0, total, chunk_records):
+                frame = _records_to_frame(reader.records[start:start + chunk_records], reader.columns)
+                frame.to_csv(f, header=(start == 0), index=False)
+    return total
@@ -3,17 +3,164 @@ CSV 파일 핸들러 모듈
 """
 import pandas as pd
 import csv
+import io
 import os
-from typing import Dict, Any, Optional, List
+import glob
+import json
+import time
+import queue
+import threading
+from datetime import datetime
+from typing import Dict, Any, Optional, List, Callable
+from ..config.settings import (
+    CSV_FLUSH_ROWS, CSV_FLUSH_INTERVAL_MS, CSV_FSYNC_INTERVAL_MS, CSV_QUEUE_SIZE,
+    CSV_ROTATE_BY, CSV_ROTATE_MAX_BYTES, CSV_COMPRESSION, LOAD_CACHE_ENABLED
+)
+from .segment_compressor import SegmentCompressor
+from .csv_loader import StreamingCsvLoader
+from .session_catalog import SessionStats, write_meta
+from .load_cache import LoadCache
+from .export_job import ExportJob
+from .data_processor import flatten_row
+from .journal import DurabilityWaiters
+
+# 시간 기준 회전 주기별 구간 키 형식
+_ROTATE_PERIOD_FORMATS = {"hour": "%Y%m%d%H", "day": "%Y%m%d"}
+
+# 쓰기 스레드 종료 신호
+_STOP = object()
+
+
+class _DurableMarker:
+    """비동기 대기열에서 앞의 행들과 순서를 지키는 동기화 완료 콜백"""
+    __slots__ = ("callback",)
+
+    def __init__(self, callback: Callable[[], Any]):
+        self.callback = callback
 
 class CsvHandler:
-    def __init__(self):
-        """CSV 핸들러 초기화"""
+    FILE_EXTENSION = ".csv"
+    
+    def __init__(self, flush_rows: int = CSV_FLUSH_ROWS,
+                 flush_interval_ms: int = CSV_FLUSH_INTERVAL_MS,
+                 fsync_interval_ms: Optional[int] = CSV_FSYNC_INTERVAL_MS,
+                 flush_callback: Optional[Callable[[Dict[str, Any]], None]] = None,
+                 async_mode: bool = False, queue_size: int = CSV_QUEUE_SIZE,
+                 rotate_by: Optional[str] = CSV_ROTATE_BY,
+                 rotate_max_bytes: int = CSV_ROTATE_MAX_BYTES,
+                 compression: Optional[str] = CSV_COMPRESSION):
+        """
+        CSV 핸들러 초기화
+        
+        Args:
+            flush_rows: 이 행 수가 쌓이면 파일에 기록 (1이면 매 행 기록)
+            flush_interval_ms: 마지막 기록 후 이 시간이 지나면 기록 (새 행이 없어도 타이머/쓰기 스레드가 확인)
+            fsync_interval_ms: fsync 간격 (None이면 fsync 안 함, 0이면 매 기록마다)
+            flush_callback: 기록할 때마다 기록 정보(bytes, latency_ms, rows, fsync)를 받을 함수
+            async_mode: True면 append_* 는 대기열에 넣기만 하고 전용 스레드가 기록
+            queue_size: 비동기 모드 대기열 최대 행 수 (가득 차면 새 행은 버림)
+            rotate_by: 세그먼트 회전 기준 ("hour", "day", "size", None이면 회전 안 함)
+            rotate_max_bytes: "size" 회전 시 세그먼트 최대 크기
+            compression: 닫힌 세그먼트 압축 방식 ("gzip", "zstd", None이면 압축 안 함)
+        """
         self.file_path: Optional[str] = None
         self.csv_file = None
         self.csv_writer = None
         self.header_written = False
         
+        # 쓰기 정책
+        self.flush_rows = max(1, flush_rows)
+        self.flush_interval = flush_interval_ms / 1000.0
+        self.fsync_interval = fsync_interval_ms / 1000.0 if fsync_interval_ms is not None else None
+        self.flush_callback = flush_callback
+        
+        # 메모리 버퍼 (csv_writer는 이 버퍼에 쓰고, flush 시 파일로 한 번에 기록)
+        self._buffer = io.StringIO()
+        self._pending_rows = 0
+        self._last_flush = 0.0
+        self._last_fsync = 0.0
+        self.reset_flush_stats()
+        
+        # 컬럼 스키마 (키 → 위치) 및 세그먼트 파일 목록
+        self.columns: List[str] = []
+        self.column_index: Dict[str, int] = {}
+        self._row_template: List[Any] = []
+        self.segment_paths: List[str] = []
+        
+        # 세그먼트 회전 / 압축 / 매니페스트
+        self.rotate_by = rotate_by
+        self.rotate_max_bytes = rotate_max_bytes
+        self.compressor = SegmentCompressor(compression, done_callback=self._on_compressed) if compression else None
+        self.manifest_path: Optional[str] = None
+        self.segments: List[Dict[str, Any]] = []
+        self._manifest_lock = threading.Lock()
+        self._recovered: Dict[str, str] = {}  # 이전 실행에서 다시 압축하는 세그먼트 경로 → 매니페스트 경로
+        self._segment_bytes = 0
+        self._segment_rows = 0
+        self._segment_stats = SessionStats()
+        self._period_key: Optional[str] = None
+        
+        # 비동기 모드
+        self.async_mode = async_mode
+        self.queue_size = queue_size
+        self._queue: Optional[queue.Queue] = None
+        self._writer_thread: Optional[threading.Thread] = None
+        self._queue_lock = threading.Lock()  # 대기열 추가와 닫기 사이 경합 방지
+        self._closed = False  # 쓰기 스레드 종료 중/종료 후 (새 행은 버리고 개수 기록)
+        self._durable = DurabilityWaiters()  # 디스크 동기화 후 호출할 콜백
+        self._write_failed = False  # 비동기 기록 실패 (다음 동기화 콜백은 호출하지 않음)
+        
+        # 동기 모드 시간 기준 기록 (새 행이 오지 않아도 flush_interval 마다 버퍼 기록)
+        self._write_lock = threading.Lock()  # 호출 스레드의 기록과 타이머 기록 사이 경합 방지
+        self._flush_timer: Optional[threading.Thread] = None
+        self._flush_timer_stop = threading.Event()
+        self.enqueued_rows = 0
+        self.dropped_rows = 0
+        self.max_queue_depth = 0
+        
+        # 다시 연 CSV를 파싱 없이 읽기 위한 로드 캐시
+        self.load_cache = LoadCache() if LOAD_CACHE_ENABLED else None
+        
+    def reset_flush_stats(self):
+        """기록 통계 초기화"""
+        self.flush_stats = {
+            "flush_count": 0,
+            "fsync_count": 0,
+            "rows_written": 0,
+            "bytes_written": 0,
+            "total_latency_ms": 0.0,
+            "max_latency_ms": 0.0,
+            "last_flush": None,
+        }
+        
+    def get_flush_stats(self) -> Dict[str, Any]:
+        """
+        기록 통계 반환
+        
+        Returns:
+            Dict[str, Any]: 기록 횟수, 바이트 수, 지연 시간(평균/최대) 등
+        """
+        stats = dict(self.flush_stats)
+        count = stats["flush_count"]
+        stats["avg_latency_ms"] = stats["total_latency_ms"] / count if count else 0.0
+        stats["pending_rows"] = self._pending_rows
+        return stats
+        
+    def get_queue_stats(self) -> Dict[str, Any]:
+        """
+        비동기 쓰기 대기열 통계 반환
+        
+        Returns:
+            Dict[str, Any]: 현재/최대 대기열 깊이, 넣은 행 수, 버린 행 수
+        """
+        q = self._queue
+        return {
+            "queue_depth": q.qsize() if q else 0,
+            "max_queue_depth": self.max_queue_depth,
+            "enqueued_rows": self.enqueued_rows,
+            "dropped_rows": self.dropped_rows,
+        }
+        
     def initialize(self, file_path: str) -> bool:
         """
         CSV 파일 초기화
@@ -33,9 +180,28 @@ class CsvHandler:
             
             # 파일 열기
             self.file_path = file_path
-            self.csv_file = open(file_path, 'w', newline='', encoding='utf-8')
-            self.csv_writer = csv.writer(self.csv_file)
-            self.header_written = False
+            self.columns, self.column_index, self._row_template = [], {}, []
+            self.segment_paths = []
+            self.segments = []
+            self.manifest_path = os.path.splitext(file_path)[0] + ".manifest.json"
+            self._open_segment(file_path)
+            
+            # 이전 실행에서 압축하지 못한 세그먼트 다시 압축
+            if self.compressor:
+                self._recover_segments(os.path.dirname(file_path))
+            
+            # 비동기 모드면 쓰기 스레드 시작
+            with self._queue_lock:
+                self._closed = False
+                if self.async_mode:
+                    self.enqueued_rows = self.dropped_rows = self.max_queue_depth = 0
+                    self._queue = queue.Queue(maxsize=self.queue_size)
+                    self._writer_thread = threading.Thread(target=self._writer_loop, daemon=True)
+                    self._writer_thread.start()
+                else:
+                    self._flush_timer_stop.clear()
+                    self._flush_timer = threading.Thread(target=self._flush_timer_loop, daemon=True)
+                    self._flush_timer.start()
             
             print(f"CSV 파일 초기화됨: {file_path}")
             return True
@@ -45,6 +211,183 @@ class CsvHandler:
             self.close()
             return False
             
+    def _open_segment(self, path: str):
+        """세그먼트 파일 열기 (헤더는 첫 행을 쓸 때 기록)"""
+        self.csv_file = open(path, 'w', newline='', encoding='utf-8')
+        self._buffer = io.StringIO()
+        self.csv_writer = csv.writer(self._buffer)
+        self.header_written = False
+        self._pending_rows = 0
+        self._last_flush = self._last_fsync = time.monotonic()
+        self._segment_bytes = 0
+        self._segment_rows = 0
+        self._segment_stats = SessionStats()
+        self._period_key = self._current_period()
+        self.segment_paths.append(path)
+        with self._manifest_lock:
+            self.segments.append({
+                "file": os.path.basename(path),
+                "started": datetime.now().isoformat(),
+                "closed": None,
+                "rows": 0,
+                "bytes": 0,
+                "columns": [],
+                "compressed": None,
+            })
+        self._write_manifest()
+        
+    def _close_segment(self):
+        """현재 세그먼트를 기록/동기화 후 닫고 매니페스트/카탈로그 메타데이터 갱신, 압축 예약"""
+        self.flush(force_fsync=self.fsync_interval is not None)
+        self.csv_file.close()
+        if self._segment_rows:
+            write_meta(self.segment_paths[-1], self._segment_stats)
+        with self._manifest_lock:
+            entry = self.segments[-1]
+            entry.update(closed=datetime.now().isoformat(), rows=self._segment_rows,
+                         bytes=self._segment_bytes, columns=list(self.columns))
+        self._write_manifest()
+        if self.compressor and self._segment_rows:
+            self.compressor.submit(self.segment_paths[-1])
+            
+    def _rotate_segment(self, reason: str, columns: Optional[List[str]] = None):
+        """
+        현재 세그먼트를 닫고 다음 세그먼트 파일 열기 (파일명_partNNN.csv)
+        
+        압축은 백그라운드 스레드에서 하므로 수신/기록은 멈추지 않는다.
+        
+        Args:
+            reason: 회전 이유 ("schema", "hour", "day", "size")
+            columns: 새 세그먼트의 컬럼 (None이면 현재 컬럼 유지)
+        """
+        self._close_segment()
+        if columns is not None:
+            self._set_columns(columns)
+        stem, ext = os.path.splitext(self.file_path)
+        path = f"{stem}_part{len(self.segment_paths):03d}{ext}"
+        self._open_segment(path)
+        # 스키마는 유지되므로 새 파일에 현재 헤더를 바로 기록
+        if self.columns:
+            self.csv_writer.writerow(self.columns)
+            self.header_written = True
+        print(f"CSV 세그먼트 전환({reason}): {path}")
+        
+    def _current_period(self) -> Optional[str]:
+        """시간 기준 회전의 현재 구간 키 반환"""
+        period_format = _ROTATE_PERIOD_FORMATS.get(self.rotate_by)
+        return datetime.now().strftime(period_format) if period_format else None
+        
+    def _check_rotation(self):
+        """회전 조건(시간 구간 변경 / 크기 초과) 확인 후 필요하면 회전"""
+        if not self.header_written or not self._segment_rows:
+            return
+        if self.rotate_by == "size":
+            if self._segment_bytes + self._buffer.tell() >= self.rotate_max_bytes:
+                self._rotate_segment("size")
+        elif self.rotate_by in _ROTATE_PERIOD_FORMATS:
+            if self._current_period() != self._period_key:
+                self._rotate_segment(self.rotate_by)
+                
+    def _recover_segments(self, directory: str):
+        """
+        이전 실행의 매니페스트에서 닫혔지만 압축되지 않은 세그먼트를 찾아 다시 압축 예약
+        
+        종료 중에 압축 스레드가 끝나지 못하면 원본과 임시 파일(*.gz.tmp 등)이 남는다.
+        임시 파일은 삭제하고 원본은 처음부터 다시 압축한다.
+        
+        Args:
+            directory: 세션 파일 디렉토리
+        """
+        count = 0
+        for manifest_path in glob.glob(os.path.join(directory, "*.manifest.json")):
+            if manifest_path == self.manifest_path:
+                continue
+            try:
+                with open(manifest_path, "r", encoding="utf-8") as f:
+                    manifest = json.load(f)
+                for entry in manifest.get("segments", []):
+                    if not entry.get("closed") or entry.get("compressed") or not entry.get("rows"):
+                        continue
+                    path = os.path.join(directory, entry["file"])
+                    if self.compressor.is_pending(path):
+                        continue
+                    for extension in (".gz", ".zst"):
+                        if os.path.exists(path + extension + ".tmp"):
+                            os.remove(path + extension + ".tmp")
+                    if os.path.exists(path):
+                        self._recovered[path] = manifest_path
+                        count += int(self.compressor.submit(path))
+            except Exception as e:
+                print(f"세그먼트 복구 실패: {manifest_path} - {e}")
+        if count:
+            print(f"압축하지 못한 이전 세그먼트 {count}개를 다시 압축합니다.")
+            
+    def _on_compressed(self, source: str, target: str):
+        """압축 완료 콜백 (압축 스레드에서 호출)"""
+        name = os.path.basename(source)
+        manifest_path = self._recovered.pop(source, None)
+        if manifest_path is not None:
+            # 이전 실행의 세그먼트는 해당 매니페스트에 기록
+            try:
+                with self._manifest_lock:
+                    with open(manifest_path, "r", encoding="utf-8") as f:
+                        manifest = json.load(f)
+                    for entry in manifest.get("segments", []):
+                        if entry.get("file") == name:
+                            entry["compressed"] = os.path.basename(target)
+                    temp = manifest_path + ".tmp"
+                    with open(temp, "w", encoding="utf-8") as f:
+                        json.dump(manifest, f, ensure_ascii=False, indent=2)
+                    os.replace(temp, manifest_path)
+            except Exception as e:
+                print(f"매니페스트 저장 실패: {e}")
+            return
+        with self._manifest_lock:
+            for entry in self.segments:
+                if entry["file"] == name:
+                    entry["compressed"] = os.path.basename(target)
+        self._write_manifest()
+        
+    def _write_manifest(self):
+        """세그먼트 목록 매니페스트 저장 (임시 파일에 쓴 뒤 교체)"""
+        if not self.manifest_path:
+            return
+        try:
+            with self._manifest_lock:
+                manifest = {
+                    "session": os.path.basename(self.file_path) if self.file_path else None,
+                    "rotate_by": self.rotate_by,
+                    "compression": self.compressor.method if self.compressor else None,
+                    "segments": [dict(entry) for entry in self.segments],
+                }
+                temp = self.manifest_path + ".tmp"
+                with open(temp, "w", encoding="utf-8") as f:
+                    json.dump(manifest, f, ensure_ascii=False, indent=2)
+                os.replace(temp, self.manifest_path)
+        except Exception as e:
+            print(f"매니페스트 저장 실패: {e}")
+            
+    def get_manifest(self) -> Dict[str, Any]:
+        """현재 세션의 세그먼트 목록 반환"""
+        with self._manifest_lock:
+            return {"manifest_path": self.manifest_path, "segments": [dict(e) for e in self.segments]}
+            
+    def wait_compression(self, timeout: Optional[float] = None) -> bool:
+        """
+        백그라운드 압축이 모두 끝날 때까지 대기
+        
+        Args:
+            timeout: 최대 대기 시간(초)
+            
+        Returns:
+            bool: 모두 끝났으면 True
+        """
+        return self.compressor.wait(timeout) if self.compressor else True
+        
+    def get_segment_paths(self) -> List[str]:
+        """현재 세션에서 생성된 세그먼트 파일 경로 목록 반환"""
+        return list(self.segment_paths)
+        
     def close(self) -> bool:
         """
         CSV 파일 닫기
@@ -52,9 +395,26 @@ class CsvHandler:
         Returns:
             bool: 성공 여부
         """
+        # 새 행을 더 받지 않고, 쓰기 스레드가 대기열을 모두 기록할 때까지 대기
+        with self._queue_lock:
+            q, writer = self._queue, self._writer_thread
+            if writer is not None:
+                self._closed = True
+                self._queue = None
+                self._writer_thread = None
+        if writer is not None:
+            q.put(_STOP)
+            writer.join()
+        timer, self._flush_timer = self._flush_timer, None
+        if timer is not None:
+            self._flush_timer_stop.set()
+            timer.join()
+            
         if self.csv_file:
             try:
-                self.csv_file.close()
+                # 남은 버퍼를 기록하고 디스크에 동기화한 뒤 닫기 (매니페스트 갱신, 압축 예약)
+                with self._write_lock:
+                    self._close_segment()
                 self.csv_file = None
                 self.csv_writer = None
                 self.header_written = False
@@ -62,6 +422,7 @@ class CsvHandler:
                 
             except Exception as e:
                 print(f"CSV 파일 닫기 실패: {e}")
+                self._durable.discard()
                 return False
                 
         return True
@@ -74,22 +435,18 @@ class CsvHandler:
             data: 추가할 데이터
             
         Returns:
-            bool: 성공 여부
+            bool: 성공 여부 (비동기 모드에서 대기열이 가득 차 버려지면 False)
         """
         if not self.csv_file or not self.csv_writer:
             print("CSV 파일이 초기화되지 않았습니다.")
             return False
             
-        try:
-            # 헤더 작성 (첫 번째 데이터인 경우)
-            if not self.header_written:
-                self.csv_writer.writerow(data.keys())
-                self.header_written = True
-                
-            # 데이터 작성
-            self.csv_writer.writerow(data.values())
-            self.csv_file.flush()  # 즉시 디스크에 기록
+        if self._queue is not None or self._closed:
+            return self._enqueue([data]) == 1
             
+        try:
+            with self._write_lock:
+                self._write_rows([data])
             return True
             
         except Exception as e:
@@ -104,7 +461,7 @@ class CsvHandler:
             data_list: 추가할 데이터 리스트
             
         Returns:
-            bool: 성공 여부
+            bool: 성공 여부 (비동기 모드에서 일부라도 버려지면 False)
         """
         if not data_list:
             return True
@@ -113,44 +470,258 @@ class CsvHandler:
             print("CSV 파일이 초기화되지 않았습니다.")
             return False
             
+        if self._queue is not None or self._closed:
+            return self._enqueue(data_list) == len(data_list)
+            
         try:
-            # 헤더 작성 (첫 번째 데이터인 경우)
-            if not self.header_written:
-                self.csv_writer.writerow(data_list[0].keys())
-                self.header_written = True
-                
-            # 데이터 작성
+            with self._write_lock:
+                self._write_rows(data_list)
+            return True
+            
+        except Exception as e:
+            print(f"CSV 데이터 배치 추가 실패: {e}")
+            return False
+            
+    def when_durable(self, callback: Callable[[], Any]) -> bool:
+        """
+        지금까지 추가한 행이 디스크에 동기화되면 callback 호출 (fsync 를 쓰지 않으면 파일에 기록된 뒤)
+        
+        비동기 모드에서는 쓰기 스레드가 앞의 행을 기록하고 다음 fsync 를 마친 뒤 호출한다.
+        
+        Args:
+            callback: 쓰기 스레드(동기 모드는 기록한 스레드)에서 호출할 함수
+            
+        Returns:
+            bool: 등록 여부 (파일이 열려 있지 않거나, 닫는 중이거나, 대기열이 가득 차면 False)
+        """
+        if not self.csv_file:
+            return False
+        if self._queue is not None or self._closed:
+            with self._queue_lock:
+                if self._queue is None:
+                    return False
+                try:
+                    self._queue.put_nowait(_DurableMarker(callback))
+                except queue.Full:
+                    return False
+            return True
+        self._durable.add(callback)
+        return True
+        
+    def _write_rows(self, data_list: List[Dict[str, Any]]):
+        """
+        행을 메모리 버퍼에 쓰고 쓰기 정책 적용 (호출 스레드 또는 쓰기 스레드에서 실행)
+        
+        pt1/pt2 같은 중첩 딕셔너리는 "pt1_pm25_standard" 형식 컬럼으로 평탄화한다.
+        값은 키 기준으로 컬럼 위치에 배치되므로 키 순서가 바뀌거나 빠져도 컬럼이 어긋나지 않는다.
+        처음 보는 키가 나타나면 헤더를 확장한 새 세그먼트 파일로 전환한다.
+        """
+        self._check_rotation()
+        index = self.column_index
+        template = self._row_template
+        rows = []
+        for data in data_list:
+            data = flatten_row(data)
+            if not data.keys() <= index.keys():
+                if rows:
+                    self._write_run(rows)
+                    rows = []
+                self._extend_schema([key for key in data if key not in index])
+                index = self.column_index
+                template = self._row_template
+            row = template.copy()
+            for key, value in data.items():
+                row[index[key]] = value
+            rows.append(row)
+        if rows:
+            self._write_run(rows)
+        self._apply_policy()
+        
+    def _extend_schema(self, new_columns: List[str]):
+        """컬럼 추가 후 헤더 기록 (이미 헤더를 쓴 경우 확장된 헤더로 세그먼트 전환)"""
+        if self.header_written:
+            self._rotate_segment("schema", self.columns + new_columns)
+        else:
+            self._set_columns(self.columns + new_columns)
+            self.csv_writer.writerow(self.columns)
+            self.header_written = True
+            
+    def _set_columns(self, columns: List[str]):
+        """컬럼 목록, 위치 색인, 행 템플릿 갱신"""
+        self.columns = columns
+        self.column_index = {column: i for i, column in enumerate(columns)}
+        self._row_template = [""] * len(columns)
+        
+    def _write_run(self, rows: List[List[Any]]):
+        """같은 스키마의 행 묶음 기록"""
+        self.csv_writer.writerows(rows)
+        self._segment_stats.update_rows(rows, self.columns)
+        self._pending_rows += len(rows)
+        self._segment_rows += len(rows)
+        
+    def _enqueue(self, data_list: List[Dict[str, Any]]) -> int:
+        """
+        비동기 대기열에 행 추가 (가득 찼거나 닫는 중이면 버리고 개수 기록)
+        
+        Returns:
+            int: 대기열에 들어간 행 수
+        """
+        accepted = 0
+        with self._queue_lock:
+            if self._queue is None:
+                self.dropped_rows += len(data_list)
+                return 0
             for data in data_list:
-                self.csv_writer.writerow(data.values())
+                try:
+                    self._queue.put_nowait(data)
+                    accepted += 1
+                except queue.Full:
+                    self.dropped_rows += len(data_list) - accepted
+                    break
+            self.enqueued_rows += accepted
+            self.max_queue_depth = max(self.max_queue_depth, self._queue.qsize())
+        return accepted
+        
+    def _writer_loop(self):
+        """쓰기 스레드: 대기열에 쌓인 행을 모아 writerows 로 기록"""
+        q = self._queue
+        stopping = False
+        while not stopping:
+            try:
+                item = q.get(timeout=self.flush_interval or 0.1)
+            except queue.Empty:
+                # 새 행이 없어도 시간 조건이 되면 버퍼 기록 (동기화를 기다리는 콜백이 있으면 fsync 간격 확인)
+                if self._pending_rows or len(self._durable):
+                    self.flush()
+                continue
+            rows = []
+            while True:
+                if item is _STOP:
+                    stopping = True
+                    break
+                if isinstance(item, _DurableMarker):
+                    # 앞의 행을 버퍼에 쓴 뒤 등록해야 다음 동기화가 그 행들을 포함함
+                    self._write_async(rows)
+                    rows = []
+                    if self._write_failed:
+                        self._write_failed = False
+                    else:
+                        self._durable.add(item.callback)
+                else:
+                    rows.append(item)
+                try:
+                    item = q.get_nowait()
+                except queue.Empty:
+                    break
+            self._write_async(rows)
+            
+    def _flush_timer_loop(self):
+        """동기 모드 타이머: 새 행이 없어도 시간 조건이 되면 버퍼 기록 (동기화를 기다리는 콜백이 있으면 fsync 간격 확인)"""
+        while not self._flush_timer_stop.wait(self.flush_interval or 0.1):
+            with self._write_lock:
+                if not self.csv_file:
+                    break
+                elapsed = time.monotonic() - self._last_flush
+                if (self._pending_rows and elapsed >= self.flush_interval) or len(self._durable):
+                    self.flush()
+                        
+    def _write_async(self, rows: List[Dict[str, Any]]):
+        """쓰기 스레드에서 행 기록 (실패하면 그 행이 속한 배치의 동기화 콜백은 호출하지 않음)"""
+        if not rows:
+            return
+        try:
+            self._write_rows(rows)
+        except Exception as e:
+            print(f"CSV 비동기 기록 실패: {e}")
+            self._write_failed = True
+                    
+    def _apply_policy(self):
+        """쓰기 정책에 따라 필요하면 버퍼 기록"""
+        if (self._pending_rows >= self.flush_rows or
+                time.monotonic() - self._last_flush >= self.flush_interval):
+            self.flush()
+            
+    def flush(self, force_fsync: bool = False) -> bool:
+        """
+        메모리 버퍼를 파일에 기록
+        
+        Args:
+            force_fsync: True면 fsync 간격과 관계없이 동기화
+            
+        Returns:
+            bool: 성공 여부
+        """
+        if not self.csv_file:
+            return False
+            
+        try:
+            text = self._buffer.getvalue()
+            now = time.monotonic()
+            do_fsync = self.fsync_interval is not None and (
+                force_fsync or now - self._last_fsync >= self.fsync_interval)
+            if not text and not do_fsync:
+                self._last_flush = now
+                if self.fsync_interval is None:
+                    self._durable.notify()
+                return True
                 
-            self.csv_file.flush()  # 즉시 디스크에 기록
+            start = time.perf_counter()
+            if text:
+                self.csv_file.write(text)
+                self._buffer.seek(0)
+                self._buffer.truncate()
+            self.csv_file.flush()
+            if do_fsync:
+                os.fsync(self.csv_file.fileno())
+                self._last_fsync = now
+            latency_ms = (time.perf_counter() - start) * 1000.0
             
+            # 기록 통계
+            info = {
+                "bytes": len(text.encode('utf-8')),
+                "rows": self._pending_rows,
+                "latency_ms": latency_ms,
+                "fsync": do_fsync,
+            }
+            stats = self.flush_stats
+            stats["flush_count"] += 1
+            stats["fsync_count"] += int(do_fsync)
+            stats["rows_written"] += info["rows"]
+            stats["bytes_written"] += info["bytes"]
+            self._segment_bytes += info["bytes"]
+            stats["total_latency_ms"] += latency_ms
+            stats["max_latency_ms"] = max(stats["max_latency_ms"], latency_ms)
+            stats["last_flush"] = info
+            self._pending_rows = 0
+            self._last_flush = now
+            if do_fsync or self.fsync_interval is None:
+                self._durable.notify()
+            
+            if self.flush_callback:
+                self.flush_callback(info)
             return True
             
         except Exception as e:
-            print(f"CSV 데이터 배치 추가 실패: {e}")
+            print(f"CSV 버퍼 기록 실패: {e}")
             return False
             
     def save_dataframe(self, df: pd.DataFrame, file_path: str) -> bool:
         """
-        데이터프레임을 CSV 파일로 저장
+        데이터프레임을 파일로 저장 (호출한 스레드에서 청크 단위로 기록, 확장자로 형식 결정)
+        
+        UI에서는 ExportJob 을 직접 만들어 start() 로 백그라운드에서 실행한다.
         
         Args:
             df: 저장할 데이터프레임
-            file_path: 저장할 파일 경로
+            file_path: 저장할 파일 경로 (.csv, .csv.gz, .parquet)
             
         Returns:
             bool: 성공 여부
         """
         try:
-            # 디렉토리 확인
-            os.makedirs(os.path.dirname(file_path), exist_ok=True)
-            
-            # CSV로 저장
-            df.to_csv(file_path, index=False, encoding='utf-8')
-            
-            print(f"데이터프레임 저장됨: {file_path}")
-            return True
+            job = ExportJob(df, file_path)
+            job.run()
+            return job.result == "done"
             
         except Exception as e:
             print(f"데이터프레임 저장 실패: {e}")
@@ -167,16 +738,9 @@ class CsvHandler:
             Optional[pd.DataFrame]: 로드된 데이터프레임 (실패 시 None)
         """
         try:
-            # CSV 파일 읽기
-            df = pd.read_csv(file_path, encoding='utf-8')
+            # 알려진 dtype과 고정 타임스탬프 형식으로 청크 단위 로드 (캐시가 있으면 캐시에서)
+            df = StreamingCsvLoader(file_path, cache=self.load_cache).load()
             
-            # 타임스탬프 컬럼이 있으면 datetime으로 변환
-            if 'timestamp' in df.columns:
-                try:
-                    df['timestamp'] = pd.to_datetime(df['timestamp'])
-                except:
-                    pass
-                    
             print(f"CSV 파일 로드됨: {file_path}")
             return df
             
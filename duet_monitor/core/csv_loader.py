@@ -0,0 +1,231 @@
+"""
+CSV 스트리밍 로더 모듈
+
+수 GB 크기의 수집 파일을 청크 단위로 읽는다. DUET 센서 컬럼은 미리 알려진 dtype으로
+읽어 타입 추론을 건너뛰고, 타임스탬프는 ISO8601 고정 형식으로 빠르게 변환한다.
+진행률 보고와 취소를 지원하며, 청크를 DataProcessor 에 바로 넣어 전체 데이터프레임을
+만들지 않고도 최근 행(링 버퍼) 또는 디스크 세그먼트(무제한 모드)로 적재할 수 있다.
+로드 캐시를 주면 캐시가 있는 파일은 파싱 없이 캐시에서 읽고, 없으면 읽으면서 캐시를 만든다.
+압축된 세그먼트(.csv.gz, .csv.zst)는 스트림으로 풀면서 읽는다. (.zst 는 zstandard 필요)
+"""
+import os
+import gzip
+import fnmatch
+import threading
+import pandas as pd
+from typing import Dict, List, Optional, Callable, Iterator
+from ..config.settings import CSV_LOAD_CHUNK_ROWS, CSV_KNOWN_DTYPES
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    zstandard = None
+    ZSTD_AVAILABLE = False
+
+
+class StreamingCsvLoader:
+    def __init__(self, file_path: str, usecols: Optional[List[str]] = None,
+                 chunk_rows: int = CSV_LOAD_CHUNK_ROWS, timestamp_format: str = "ISO8601",
+                 progress_callback: Optional[Callable[[float, int], None]] = None,
+                 total_rows: Optional[int] = None, cache=None):
+        """
+        스트리밍 로더 초기화
+
+        Args:
+            file_path: 읽을 CSV 파일 경로 (.csv.gz, .csv.zst 도 가능)
+            usecols: 읽을 컬럼 (None이면 전체, timestamp는 항상 포함)
+            chunk_rows: 청크당 행 수
+            timestamp_format: 타임스탬프 형식 (strftime 형식 또는 "ISO8601")
+            progress_callback: 청크마다 (진행률 0~1, 누적 행 수)로 호출
+            total_rows: 전체 행 수 (카탈로그에서 알면 행 기준으로 진행률 계산)
+            cache: 로드 캐시 (LoadCache, None이면 사용 안 함)
+        """
+        self.file_path = file_path
+        self.usecols = usecols
+        self.chunk_rows = chunk_rows
+        self.timestamp_format = timestamp_format
+        self.progress_callback = progress_callback
+        self.total_rows = total_rows
+        self.cache = cache
+        self.from_cache = False
+        self._cancel_event = threading.Event()
+        self.total_bytes = os.path.getsize(file_path)
+        self.progress = 0.0
+        self.rows_read = 0
+        self.columns: List[str] = []
+
+    def cancel(self):
+        """로드 취소 요청 (다음 청크 경계에서 중단)"""
+        self._cancel_event.set()
+
+    def is_cancelled(self) -> bool:
+        """취소 여부 반환"""
+        return self._cancel_event.is_set()
+
+    def _open(self):
+        """(원본 파일, 읽기용 스트림) 반환 - 진행률은 원본 파일 위치로 계산"""
+        if self.file_path.endswith(".zst") and not ZSTD_AVAILABLE:
+            raise ImportError(f"zstandard 패키지가 없어 zstd 압축 파일을 읽을 수 없습니다: {self.file_path}")
+        raw = open(self.file_path, "rb")
+        if self.file_path.endswith(".gz"):
+            return raw, gzip.GzipFile(fileobj=raw, mode="rb")
+        if self.file_path.endswith(".zst"):
+            return raw, zstandard.ZstdDecompressor().stream_reader(raw)
+        return raw, raw
+
+    def read_header(self) -> List[str]:
+        """
+        헤더(컬럼 목록)만 읽기
+
+        Returns:
+            List[str]: 파일의 컬럼 목록
+        """
+        raw, stream = self._open()
+        try:
+            return list(pd.read_csv(stream, nrows=0, encoding="utf-8").columns)
+        finally:
+            raw.close()
+
+    @staticmethod
+    def get_dtypes(columns: List[str]) -> Dict[str, str]:
+        """
+        알려진 컬럼의 dtype 결정 (CSV_KNOWN_DTYPES 패턴, 일치하지 않는 컬럼은 추론)
+
+        Args:
+            columns: 컬럼 목록
+
+        Returns:
+            Dict[str, str]: 컬럼별 dtype
+        """
+        dtypes = {}
+        for column in columns:
+            for pattern, dtype in CSV_KNOWN_DTYPES.items():
+                if fnmatch.fnmatchcase(column, pattern):
+                    dtypes[column] = dtype
+                    break
+        return dtypes
+
+    def _parse_timestamps(self, values: pd.Series) -> pd.Series:
+        """고정 형식으로 변환, 형식이 맞지 않는 파일이면 일반 파서로 재시도"""
+        parsed = pd.to_datetime(values, format=self.timestamp_format, errors="coerce")
+        if parsed.isna().all() and values.notna().any():
+            parsed = pd.to_datetime(values, errors="coerce")
+        return parsed
+
+    def iter_chunks(self) -> Iterator[pd.DataFrame]:
+        """
+        청크 단위로 읽기
+
+        Yields:
+            pd.DataFrame: 타임스탬프가 변환된 청크
+        """
+        cached = self.cache.iter_chunks(self.file_path, self.chunk_rows, self.usecols) if self.cache else None
+        if cached is not None:
+            self.total_rows, chunks = cached
+            yield from self._iter_cached(chunks)
+            return
+        
+        header = self.read_header()
+        usecols = None
+        if self.usecols is not None:
+            usecols = [c for c in header if c in self.usecols or c == "timestamp"]
+        self.columns = usecols or header
+        dtypes = self.get_dtypes(self.columns)
+
+        # 전체 컬럼을 읽을 때만 캐시 생성
+        writer = self.cache.writer(self.file_path) if self.cache and usecols is None else None
+        raw, stream = self._open()
+        try:
+            reader = pd.read_csv(stream, usecols=usecols, dtype=dtypes, chunksize=self.chunk_rows,
+                                 encoding="utf-8", low_memory=False)
+            for chunk in reader:
+                if self.is_cancelled():
+                    break
+                if "timestamp" in chunk.columns:
+                    chunk["timestamp"] = self._parse_timestamps(chunk["timestamp"])
+                if writer:
+                    writer.add(chunk)
+                self.rows_read += len(chunk)
+                if self.total_rows:
+                    self.progress = min(self.rows_read / self.total_rows, 1.0)
+                else:
+                    self.progress = min(raw.tell() / self.total_bytes, 1.0) if self.total_bytes else 1.0
+                if self.progress_callback:
+                    self.progress_callback(self.progress, self.rows_read)
+                yield chunk
+            if writer:
+                if self.is_cancelled():
+                    writer.abort()
+                else:
+                    writer.commit()
+                writer = None
+        finally:
+            raw.close()
+            if writer:
+                writer.abort()
+                
+    def _iter_cached(self, chunks: Iterator[pd.DataFrame]) -> Iterator[pd.DataFrame]:
+        """캐시에서 읽은 청크에 진행률/취소 적용"""
+        self.from_cache = True
+        for chunk in chunks:
+            if self.is_cancelled():
+                break
+            if not self.columns:
+                self.columns = list(chunk.columns)
+            self.rows_read += len(chunk)
+            self.progress = min(self.rows_read / self.total_rows, 1.0) if self.total_rows else 1.0
+            if self.progress_callback:
+                self.progress_callback(self.progress, self.rows_read)
+            yield chunk
+
+    def load(self, max_rows: Optional[int] = None) -> Optional[pd.DataFrame]:
+        """
+        전체(또는 마지막 max_rows 행) 로드
+
+        Args:
+            max_rows: 유지할 최대 행 수 (None이면 전체)
+
+        Returns:
+            Optional[pd.DataFrame]: 로드된 데이터 (취소되면 None)
+        """
+        if self.cache is not None:
+            # 캐시가 있으면 청크로 나누지 않고 한 번에 읽음
+            df = self.cache.get(self.file_path, self.usecols)
+            if df is not None:
+                self.from_cache = True
+                self.columns = list(df.columns)
+                self.rows_read = self.total_rows = len(df)
+                self.progress = 1.0
+                if self.progress_callback:
+                    self.progress_callback(self.progress, self.rows_read)
+                return df.tail(max_rows).reset_index(drop=True) if max_rows is not None else df
+        
+        frames = []
+        kept = 0
+        for chunk in self.iter_chunks():
+            frames.append(chunk)
+            kept += len(chunk)
+            # 최근 행만 필요하면 오래된 청크는 버려 메모리 사용량 제한
+            while max_rows is not None and frames and kept - len(frames[0]) >= max_rows:
+                kept -= len(frames.pop(0))
+        if self.is_cancelled():
+            return None
+        if not frames:
+            return pd.DataFrame(columns=self.columns)
+        df = pd.concat(frames, ignore_index=True)
+        return df.tail(max_rows).reset_index(drop=True) if max_rows is not None else df
+
+    def fold_into(self, data_processor) -> int:
+        """
+        청크를 DataProcessor 에 바로 적재 (제한 모드: 최근 행만 유지, 무제한 모드: 디스크로 이동)
+
+        Args:
+            data_processor: 적재할 DataProcessor
+
+        Returns:
+            int: 읽은 행 수
+        """
+        for chunk in self.iter_chunks():
+            data_processor.ingest_frame(chunk)
+        return self.rows_read
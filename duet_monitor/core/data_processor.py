@@ -2,14 +2,26 @@
 데이터 처리 모듈
 """
 import pandas as pd
-import numpy as np
 import json
 import ast
 from typing import Dict, Any, List, Set, Optional, Tuple
 from duet_monitor.utils.helpers import process_data_item
-from datetime import datetime, timedelta
-import random
-from ..config.settings import SENSOR_UNITS
+from datetime import datetime
+import os
+import threading
+from functools import partial
+from ..config.settings import (
+    SENSOR_UNITS, HISTORY_DIR, HOT_WINDOW_ROWS, HISTORY_SEGMENT_ROWS, HISTORY_SPILL_CHUNK_ROWS,
+    ROLLING_AGGREGATES, OUTLIER_FILTER_ENABLED, OUTLIER_FILTER_PATTERNS, OUTLIER_FILTER_WINDOW,
+    OUTLIER_FILTER_SIGMAS, OUTLIER_FILTER_MIN_SIGMA, OUTLIER_FILTER_MODE,
+    TWIN_WINDOW, TWIN_MIN_CORRELATION, TWIN_MAX_RATIO_DEVIATION
+)
+from .segment_store import SegmentStore
+from .state_classifier import SensorStateClassifier
+from .rolling import RollingAggregator
+from .outlier_filter import OutlierFilter
+from .twin_tracker import TwinSensorTracker
+from .load_generator import LoadGenerator
 
 class DataProcessor:
     def __init__(self):
@@ -21,7 +33,19 @@ class DataProcessor:
         self.max_rows = 1000
         self.selected_graph_sensor = None
         self.new_columns = set()  # 새로 추가된 컬럼 추적
+        self._history_lock = threading.Lock()  # 디스크 이동과 내보내기 스냅샷 사이 경합 방지
         self.latest_values = {}
+        self.history_store: Optional[SegmentStore] = None  # 무제한 모드용 디스크 세그먼트 저장소
+        self.hot_window_rows = HOT_WINDOW_ROWS
+        self.state_classifier = SensorStateClassifier()  # LED/경보/업로드 플래그 공용 상태 판정기
+        self.rolling = RollingAggregator(ROLLING_AGGREGATES)  # 컬럼별 이동 집계 (가상 컬럼)
+        self.twin_tracker = TwinSensorTracker(TWIN_WINDOW, TWIN_MIN_CORRELATION, TWIN_MAX_RATIO_DEVIATION)
+        self.outlier_filter: Optional[OutlierFilter] = None  # 수신 단계 스파이크 필터 (선택)
+        if OUTLIER_FILTER_ENABLED:
+            self.outlier_filter = OutlierFilter(
+                OUTLIER_FILTER_PATTERNS, OUTLIER_FILTER_WINDOW, OUTLIER_FILTER_SIGMAS,
+                OUTLIER_FILTER_MIN_SIGMA, OUTLIER_FILTER_MODE
+            )
         debug_print_main(f"[DataProcessor] 초기 DataFrame 컬럼: {list(self.df.columns)}")
 
     def set_max_rows(self, max_rows: int) -> None:
@@ -29,13 +53,34 @@ class DataProcessor:
         메모리에 저장할 최대 데이터 행 수 설정
         
         Args:
-            max_rows: 최대 행 수 (0은 제한 없음)
+            max_rows: 최대 행 수 (0은 제한 없음: 핫 윈도우만 메모리에 두고 나머지는 디스크로 이동)
         """
         self.max_rows = max_rows
         
+        if max_rows > 0:
+            # 제한 모드로 전환하면 디스크 세그먼트는 더 이상 필요 없음
+            if self.history_store is not None:
+                self.history_store.destroy()
+                self.history_store = None
+        elif self.history_store is None:
+            session = datetime.now().strftime("%Y%m%d_%H%M%S")
+            self.history_store = SegmentStore(os.path.join(HISTORY_DIR, session), HISTORY_SEGMENT_ROWS)
+        
         # 현재 데이터가 제한을 초과하면 잘라내기
-        if max_rows > 0 and len(self.df) > max_rows:
-            self.df = self.df.tail(max_rows)
+        self._trim_dataframe()
+        
+    def _trim_dataframe(self):
+        """최대 행 수에 맞게 데이터프레임 정리 (무제한 모드에서는 오래된 행을 디스크로 이동)"""
+        if self.max_rows > 0:
+            if len(self.df) > self.max_rows:
+                self.df = self.df.tail(self.max_rows)
+        elif self.history_store is not None:
+            # 행마다 디스크에 쓰지 않도록 일정량이 쌓였을 때 한 번에 이동
+            if len(self.df) > self.hot_window_rows + HISTORY_SPILL_CHUNK_ROWS:
+                spill_df = self.df.iloc[:-self.hot_window_rows]
+                with self._history_lock:
+                    if self.history_store.append_frame(spill_df):
+                        self.df = self.df.iloc[-self.hot_window_rows:]
         
     def set_dataframe(self, df: pd.DataFrame) -> bool:
         """
@@ -63,6 +108,30 @@ class DataProcessor:
             print(f"데이터프레임 설정 오류: {e}")
             return False
 
+    def ingest_frame(self, df: pd.DataFrame) -> bool:
+        """
+        이미 평탄화된 데이터프레임 청크 추가 (파일 스트리밍 로드용)
+        
+        최대 행 수 제한 모드에서는 최근 행만 남고, 무제한 모드에서는 오래된 행이 디스크로 이동한다.
+        
+        Args:
+            df: 추가할 청크
+            
+        Returns:
+            bool: 성공 여부
+        """
+        try:
+            if df is None or df.empty:
+                return True
+            self.new_columns.update(set(df.columns) - set(self.df.columns))
+            self.df = df.copy() if self.df.empty else pd.concat([self.df, df], ignore_index=True)
+            self._trim_dataframe()
+            self.latest_values = df.iloc[-1].to_dict()
+            return True
+        except Exception as e:
+            print(f"청크 적재 오류: {e}")
+            return False
+            
     def update_dataframe(self, data: Dict[str, Any]) -> bool:
         """
         데이터프레임에 새 데이터 추가
@@ -81,6 +150,7 @@ class DataProcessor:
             except Exception as e:
                 debug_print_main(f"[DataProcessor] flatten_dict 예외: {e} (data={data})")
                 processed_data = {}
+            processed_data = self._prepare_row(processed_data)
             debug_print_main(f"[DataProcessor] flatten_dict 결과: {processed_data}")
             new_df = pd.DataFrame([processed_data])
             debug_print_main(f"[DataProcessor] 새 데이터프레임 생성됨, 컬럼: {list(new_df.columns)}")
@@ -94,9 +164,7 @@ class DataProcessor:
                 self.df = pd.concat([self.df, new_df], ignore_index=True)
                 debug_print_main(f"[DataProcessor] 데이터프레임 연결됨, 현재 크기: {len(self.df)}")
             self.new_columns.update(new_columns)
-            if len(self.df) > self.max_rows:
-                self.df = self.df.tail(self.max_rows)
-                debug_print_main(f"[DataProcessor] 최대 행 수 조정, 현재 크기: {len(self.df)}")
+            self._trim_dataframe()
             self.latest_values = processed_data.copy()
             debug_print_main(f"[DataProcessor] 최신 값 업데이트됨: {self.latest_values}")
             debug_print_main(f"[DataProcessor] 최종 DataFrame 컬럼: {list(self.df.columns)}")
@@ -108,6 +176,58 @@ class DataProcessor:
             print(f"데이터프레임 업데이트 오류: {e}")
             return False
     
+    def _prepare_row(self, row: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        평탄화된 행에 수신 단계 처리 적용 (이상치 필터 → 트윈 센서 통계 → 이동 집계 가상 컬럼)
+        
+        Args:
+            row: 평탄화된 샘플
+            
+        Returns:
+            Dict[str, Any]: 처리된 행
+        """
+        # 파생 컬럼(_raw, _sma10 등)이 다시 처리되지 않도록 원본 컬럼만 대상으로 함
+        source_columns = list(row)
+        if self.outlier_filter is not None:
+            self.outlier_filter.apply(row, source_columns)
+        self.twin_tracker.update(row, source_columns)
+        return self.rolling.update(row, source_columns)
+        
+    def get_twin_stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        pt1/pt2 트윈 센서 쌍별 일치도 통계 반환
+        
+        Returns:
+            Dict[str, Dict[str, Any]]: 센서 이름(pt 접두사 제외)별 상관계수, 비율, 편차, 드리프트 여부
+        """
+        return self.twin_tracker.get_stats()
+        
+    def set_outlier_filter(self, enabled: bool) -> None:
+        """
+        수신 단계 이상치 필터 사용 여부 설정
+        
+        Args:
+            enabled: 사용 여부
+        """
+        if enabled and self.outlier_filter is None:
+            self.outlier_filter = OutlierFilter(
+                OUTLIER_FILTER_PATTERNS, OUTLIER_FILTER_WINDOW, OUTLIER_FILTER_SIGMAS,
+                OUTLIER_FILTER_MIN_SIGMA, OUTLIER_FILTER_MODE
+            )
+        elif not enabled:
+            self.outlier_filter = None
+            
+    def get_outlier_counts(self) -> Dict[str, int]:
+        """
+        컬럼별 이상치 처리 횟수 반환
+        
+        Returns:
+            Dict[str, int]: 컬럼별 횟수 (필터가 꺼져 있으면 빈 딕셔너리)
+        """
+        if self.outlier_filter is None:
+            return {}
+        return self.outlier_filter.get_counts()
+    
     def update_dataframe_batch(self, data_list: List[Dict[str, Any]]) -> bool:
         """
         데이터프레임에 여러 데이터 일괄 추가
@@ -120,15 +240,17 @@ class DataProcessor:
         """
         try:
             from duet_monitor.utils.debug import debug_print_main
-            debug_print_main(f"[DataProcessor] update_dataframe_batch 진입: {data_list}")
+            debug_print_main(f"[DataProcessor] update_dataframe_batch 진입: {len(data_list)}개")
             if not data_list:
                 debug_print_main("[DataProcessor] data_list 비어있음")
                 return True
-            processed_data_list = [flatten_dict(data) for data in data_list]
-            debug_print_main(f"[DataProcessor] flatten_dict 결과(배치): {processed_data_list}")
-            new_df = pd.DataFrame(processed_data_list)
-            debug_print_main(f"[DataProcessor] 새 데이터프레임(배치) 생성됨, 컬럼: {list(new_df.columns)}")
-            new_columns = set(new_df.columns) - set(self.df.columns)
+            processed_data_list = [self._prepare_row(flatten_dict(data)) for data in data_list]
+            # 스키마 확인은 배치당 한 번: 배치 전체 키의 합집합을 기존 컬럼과 비교
+            batch_columns = list(dict.fromkeys(key for row in processed_data_list for key in row))
+            new_columns = set(batch_columns) - set(self.df.columns)
+            if new_columns:
+                debug_print_main(f"[DataProcessor] 새로운 컬럼 발견(배치): {new_columns}")
+            new_df = pd.DataFrame.from_records(processed_data_list, columns=batch_columns)
             if self.df.empty:
                 self.df = new_df
                 debug_print_main("[DataProcessor] 최초 데이터프레임(배치) 생성")
@@ -136,13 +258,9 @@ class DataProcessor:
                 self.df = pd.concat([self.df, new_df], ignore_index=True)
                 debug_print_main(f"[DataProcessor] 데이터프레임(배치) 연결됨, 현재 크기: {len(self.df)}")
             self.new_columns.update(new_columns)
-            if len(self.df) > self.max_rows:
-                self.df = self.df.tail(self.max_rows)
-                debug_print_main(f"[DataProcessor] 최대 행 수 조정(배치), 현재 크기: {len(self.df)}")
+            self._trim_dataframe()
             self.latest_values = processed_data_list[-1].copy()
             debug_print_main(f"[DataProcessor] 배치 최신 값 업데이트됨: {self.latest_values}")
-            debug_print_main(f"[DataProcessor] 배치 최종 DataFrame 컬럼: {list(self.df.columns)}")
-            debug_print_main(f"[DataProcessor] 배치 최종 DataFrame 마지막 행: {self.df.iloc[-1].to_dict() if not self.df.empty else '없음'}")
             return True
         except Exception as e:
             import traceback
@@ -237,6 +355,15 @@ class DataProcessor:
         """
         return self.latest_values
     
+    def get_sensor_states(self) -> Dict[str, str]:
+        """
+        최신 값 기준 센서 상태 반환
+        
+        Returns:
+            Dict[str, str]: 센서별 상태 (low/normal/warning/critical/unknown)
+        """
+        return self.state_classifier.classify(self.latest_values)
+    
     def get_new_columns(self) -> Set[str]:
         """
         새로 추가된 컬럼 목록 반환
@@ -255,6 +382,18 @@ class DataProcessor:
         self.df = pd.DataFrame()
         self.new_columns.clear()
         self.latest_values = {}
+        self.rolling.reset()
+        self.twin_tracker.reset()
+        if self.outlier_filter is not None:
+            self.outlier_filter.reset()
+        if self.history_store is not None:
+            self.history_store.clear()
+    
+    def close(self):
+        """종료 처리 (이번 실행의 디스크 세그먼트 삭제)"""
+        if self.history_store is not None:
+            self.history_store.destroy()
+            self.history_store = None
     
     def generate_test_data(self, num_samples: int = 100) -> None:
         """
@@ -265,66 +404,10 @@ class DataProcessor:
         """
         print(f"테스트 데이터 {num_samples}개 생성됨")
         
-        # 현재 시간
-        now = datetime.now()
-        
-        # 타임스탬프 생성 (최근 시간부터 과거 순으로)
-        timestamps = [now - timedelta(seconds=i) for i in range(num_samples)]
-        timestamps.reverse()  # 과거부터 현재 순으로 정렬
-        
-        # 기본 데이터
-        data = []
-        
-        # 샘플 ID 설정
-        sample_id = 817
-        
-        for i in range(num_samples):
-            # 샘플 타임 값 생성 (밀리초 단위)
-            sample_time = 795000 + (i * 10000)
-            
-            # PT1과 PT2 데이터 생성 (파티클 센서 데이터) - 문자열화하지 않고 딕셔너리 형태 유지
-            pt1_data = {
-                "pm10_standard": random.randint(1, 5),
-                "pm25_standard": random.randint(3, 7),
-                "pm100_standard": random.randint(3, 7),
-                "particles_03um": random.randint(600, 900),
-                "particles_05um": random.randint(150, 250),
-                "particles_10um": random.randint(20, 50),
-                "particles_25um": random.randint(0, 5),
-                "particles_50um": random.randint(0, 2),
-                "particles_100um": random.randint(0, 1)
-            }
-            
-            pt2_data = {
-                "pm10_standard": random.randint(1, 5),
-                "pm25_standard": random.randint(3, 6),
-                "pm100_standard": random.randint(3, 6),
-                "particles_03um": random.randint(500, 800),
-                "particles_05um": random.randint(150, 200),
-                "particles_10um": random.randint(10, 40),
-                "particles_25um": random.randint(0, 4),
-                "particles_50um": random.randint(0, 1),
-                "particles_100um": random.randint(0, 1)
-            }
-            
-            # 샘플 데이터 생성 - pt1, pt2는 딕셔너리 형태 그대로 유지
-            sample = {
-                "type": 2,
-                "id": sample_id,
-                "sample_time": sample_time,
-                "pt1": pt1_data,  # 직접 딕셔너리 할당
-                "pt2": pt2_data,  # 직접 딕셔너리 할당
-                "temperature": round(27.7 + random.uniform(-0.2, 0.2), 2),
-                "hum": round(35.0 + random.uniform(-1.0, 1.5), 2),
-                "pressure": 402,
-                "tvoc": random.randint(0, 80),
-                "eco2": 400 + (random.randint(0, 5) * 50 if random.random() > 0.8 else 0),
-                "rawh2": random.randint(12400, 12900),
-                "rawethanol": random.randint(940, 1200),
-                "timestamp": timestamps[i]
-            }
-            
-            data.append(sample)
+        # 벡터화된 부하 생성기로 샘플 생성 (마지막 샘플이 현재 시간, 1초 간격)
+        # pt1, pt2는 딕셔너리 형태 그대로 유지
+        generator = LoadGenerator(devices=1, rate_hz=1.0)
+        data = generator.generate_records(num_samples, timestamp_format="datetime")
             
         # 데이터프레임 생성
         df = pd.DataFrame(data)
@@ -362,6 +445,9 @@ class DataProcessor:
         Returns:
             pd.DataFrame: 필터링된 데이터프레임
         """
+        if self.history_store is not None:
+            return self.get_range(start_time, end_time)
+            
         if self.df.empty:
             return pd.DataFrame()
             
@@ -377,6 +463,79 @@ class DataProcessor:
             
         return filtered_df
         
+    def get_export_source(self):
+        """
+        디스크 세그먼트와 메모리 행을 이어서 내보내는 원본 반환 (ExportJob 에 전달)
+        
+        세그먼트는 기록할 차례에 하나씩 읽으므로 전체를 메모리에 올리지 않는다.
+        
+        Returns:
+            ExportSource: 내보내기 원본 (디스크 구간에 없는 문자열 컬럼은 warnings 에 기록)
+        """
+        from .export_job import ExportSource
+        with self._history_lock:
+            hot_df = self.df.copy()
+            segments = self.history_store.snapshot() if self.history_store is not None else []
+        if 'timestamp' in hot_df.columns:
+            hot_df['timestamp'] = pd.to_datetime(hot_df['timestamp'], errors='coerce', format='ISO8601')
+        
+        columns = list(hot_df.columns)
+        for segment, _ in segments:
+            columns += [c for c in segment.columns if c not in columns]
+        if segments and 'timestamp' not in columns:
+            columns.insert(0, 'timestamp')
+        parts = [(rows, partial(segment.read, None, rows)) for segment, rows in segments]
+        parts.append((len(hot_df), lambda: hot_df))
+        samples = [segment.read(None, 1) for segment, _ in segments[:1]] + [hot_df.head(100)]
+        source = ExportSource(parts, columns, pd.concat(samples, ignore_index=True).reindex(columns=columns))
+        
+        if segments:
+            cold_rows = sum(rows for _, rows in segments)
+            cold_columns = {c for segment, _ in segments for c in segment.columns}
+            missing = [c for c in hot_df.columns if c != 'timestamp' and c not in cold_columns]
+            if missing:
+                source.warnings.append(
+                    f"디스크로 옮긴 {cold_rows:,}행에는 숫자 컬럼만 저장되어 있어 "
+                    f"{', '.join(missing[:5])}{' 등' if len(missing) > 5 else ''} 값이 비어 있습니다."
+                )
+        return source
+    
+    def get_range(self, start_time: Optional[datetime] = None,
+                  end_time: Optional[datetime] = None,
+                  columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        디스크 세그먼트와 메모리 핫 윈도우를 합쳐 시간 범위 데이터 반환
+        
+        Args:
+            start_time: 시작 시간
+            end_time: 종료 시간
+            columns: 읽을 컬럼 (None이면 전체)
+            
+        Returns:
+            pd.DataFrame: 범위 내 데이터 (디스크 구간은 숫자 컬럼만 포함)
+        """
+        frames = []
+        if self.history_store is not None:
+            cold_df = self.history_store.read_range(start_time, end_time, columns)
+            if not cold_df.empty:
+                frames.append(cold_df)
+                
+        hot_df = self.df.copy()
+        if not hot_df.empty:
+            if 'timestamp' in hot_df.columns:
+                hot_df['timestamp'] = pd.to_datetime(hot_df['timestamp'], errors='coerce', format='ISO8601')
+                if start_time is not None:
+                    hot_df = hot_df[hot_df['timestamp'] >= pd.Timestamp(start_time)]
+                if end_time is not None:
+                    hot_df = hot_df[hot_df['timestamp'] <= pd.Timestamp(end_time)]
+            if columns is not None:
+                hot_df = hot_df[[c for c in ['timestamp'] + list(columns) if c in hot_df.columns]]
+            frames.append(hot_df)
+            
+        if not frames:
+            return pd.DataFrame()
+        return pd.concat(frames, ignore_index=True)
+        
     def get_statistics(self, column: str) -> Dict[str, float]:
         """
         특정 컬럼의 통계 정보 반환
@@ -431,4 +590,26 @@ def flatten_dict(d, parent_key='', sep='_'):
             debug_print_main(f"[flatten_dict] 예외: {e} (key={new_key}, value={v})")
             items.append((new_key, str(v)))
     debug_print_main(f"[flatten_dict] 결과: {items}")
-    return dict(items)
\ No newline at end of file
+    return dict(items)
+
+
+def flatten_row(data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    pt1/pt2 같은 한 단계 중첩 딕셔너리를 빠르게 평탄화 (저장 경로용, 더 깊으면 flatten_dict 사용)
+    
+    Args:
+        data: 수신된 샘플
+        
+    Returns:
+        Dict[str, Any]: "pt1_pm25_standard" 형식 키의 평탄화된 샘플
+    """
+    row = {}
+    for key, value in data.items():
+        if isinstance(value, dict):
+            for sub_key, sub_value in value.items():
+                if isinstance(sub_value, dict):
+                    return flatten_dict(data)
+                row[f"{key}_{sub_key}"] = sub_value
+        else:
+            row[key] = value
+    return row
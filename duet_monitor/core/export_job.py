@@ -0,0 +1,205 @@
+"""
+백그라운드 내보내기 모듈
+
+데이터프레임 스냅샷을 작업 스레드에서 청크 단위로 CSV / 압축 CSV(.csv.gz) / Parquet 파일로
+기록한다. 진행률 보고와 취소를 지원하며, 임시 파일(.part)에 쓴 뒤 완료되면 이름을 바꾸므로
+취소하거나 실패해도 대상 경로에 반쯤 쓴 파일이 남지 않는다.
+ExportSource 를 주면 여러 데이터프레임(디스크 세그먼트 + 메모리 행 등)을 하나씩 읽어서 이어 쓴다.
+"""
+import os
+import gzip
+import threading
+import pandas as pd
+from typing import Callable, Iterator, List, Optional, Tuple, Union
+from ..config.settings import EXPORT_CHUNK_ROWS, PARQUET_COMPRESSION
+from .parquet_handler import PYARROW_AVAILABLE, pa, pq
+
+EXPORT_FORMATS = ("csv", "csv.gz", "parquet")
+
+
+def get_export_format(file_path: str) -> str:
+    """
+    파일 확장자로 내보내기 형식 결정
+
+    Args:
+        file_path: 저장할 파일 경로
+
+    Returns:
+        str: "csv", "csv.gz", "parquet" 중 하나 (알 수 없으면 "csv")
+    """
+    if file_path.endswith(".csv.gz"):
+        return "csv.gz"
+    if file_path.endswith(".parquet"):
+        return "parquet"
+    return "csv"
+
+
+class ExportSource:
+    def __init__(self, parts: List[Tuple[int, Callable[[], pd.DataFrame]]], columns: List[str],
+                 sample: pd.DataFrame):
+        """
+        여러 부분을 이어서 내보내는 원본 (부분은 기록할 차례가 되었을 때 읽음)
+
+        Args:
+            parts: (행 수, 데이터프레임을 읽는 함수) 목록 (기록 순서)
+            columns: 내보낼 컬럼 (부분에 없는 컬럼은 빈 값)
+            sample: 컬럼 타입을 정할 표본 (Parquet 스키마에 사용)
+        """
+        self.parts = parts
+        self.columns = columns
+        self.sample = sample
+        self.total_rows = sum(rows for rows, _ in parts)
+        self.skipped_rows = 0
+        self.warnings: List[str] = []  # 모두 담지 못한 이유 (저장 후 사용자에게 표시)
+
+    @classmethod
+    def from_dataframe(cls, df: pd.DataFrame) -> "ExportSource":
+        return cls([(len(df), lambda: df)], list(df.columns), df)
+
+    def iter_frames(self) -> Iterator[pd.DataFrame]:
+        """
+        부분을 차례로 읽어 컬럼을 맞춰 반환 (읽지 못한 부분은 건너뛰고 warnings 에 기록)
+
+        Yields:
+            pd.DataFrame: columns 순서의 데이터프레임
+        """
+        for rows, read in self.parts:
+            try:
+                frame = read()
+            except Exception as e:
+                self.skipped_rows += rows
+                self.warnings.append(f"{rows:,}행을 읽지 못해 제외했습니다: {e}")
+                continue
+            if list(frame.columns) != self.columns:
+                frame = frame.copy()
+                for column in self.columns:
+                    if column not in frame.columns:
+                        frame[column] = pd.Series([None] * len(frame), index=frame.index, dtype=object)
+                frame = frame[self.columns]
+            yield frame
+
+
+class ExportJob:
+    def __init__(self, df: Union[pd.DataFrame, ExportSource], file_path: str, export_format: Optional[str] = None,
+                 chunk_rows: int = EXPORT_CHUNK_ROWS,
+                 progress_callback: Optional[Callable[[float, int], None]] = None):
+        """
+        내보내기 작업 초기화
+
+        Args:
+            df: 내보낼 데이터프레임 (호출한 쪽에서 만든 스냅샷, 작업 중 변경하면 안 됨) 또는 ExportSource
+            file_path: 저장할 파일 경로
+            export_format: "csv", "csv.gz", "parquet" (None이면 확장자로 결정)
+            chunk_rows: 청크당 행 수
+            progress_callback: 청크마다 (진행률 0~1, 기록한 행 수)로 호출 (작업 스레드에서 호출)
+        """
+        self.source = df if isinstance(df, ExportSource) else ExportSource.from_dataframe(df)
+        self.file_path = file_path
+        self.export_format = export_format or get_export_format(file_path)
+        if self.export_format not in EXPORT_FORMATS:
+            raise ValueError(f"지원하지 않는 내보내기 형식: {self.export_format}")
+        if self.export_format == "parquet" and not PYARROW_AVAILABLE:
+            raise ValueError("Parquet 내보내기에는 pyarrow 패키지가 필요합니다.")
+        self.chunk_rows = max(1, chunk_rows)
+        self.progress_callback = progress_callback
+        self._cancel_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.progress = 0.0
+        self.rows_written = 0
+        self.result = None  # None(진행 중), "done", "cancelled" 또는 예외
+
+    @property
+    def warnings(self) -> List[str]:
+        """모두 내보내지 못한 이유 목록"""
+        return self.source.warnings
+
+    def start(self):
+        """작업 스레드에서 내보내기 시작"""
+        self._thread = threading.Thread(target=self.run, daemon=True)
+        self._thread.start()
+
+    def cancel(self):
+        """취소 요청 (다음 청크 경계에서 중단)"""
+        self._cancel_event.set()
+
+    def is_cancelled(self) -> bool:
+        """취소 여부 반환"""
+        return self._cancel_event.is_set()
+
+    def is_running(self) -> bool:
+        """작업 중인지 여부 반환"""
+        return self._thread is not None and self._thread.is_alive()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        작업이 끝날 때까지 대기
+
+        Args:
+            timeout: 최대 대기 시간(초)
+
+        Returns:
+            bool: 끝났으면 True
+        """
+        if self._thread is not None:
+            self._thread.join(timeout)
+        return not self.is_running()
+
+    def run(self):
+        """내보내기 실행 (호출한 스레드에서 실행, 결과는 result 에 저장)"""
+        temp = self.file_path + ".part"
+        try:
+            directory = os.path.dirname(self.file_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            if self.export_format == "parquet":
+                self._write_parquet(temp)
+            else:
+                self._write_csv(temp)
+            if self.is_cancelled():
+                os.remove(temp)
+                self.result = "cancelled"
+                return
+            os.replace(temp, self.file_path)
+            print(f"데이터프레임 저장됨: {self.file_path} ({self.rows_written}행)")
+            self.result = "done"
+        except Exception as e:
+            print(f"데이터프레임 저장 실패: {e}")
+            if os.path.exists(temp):
+                os.remove(temp)
+            self.result = e
+
+    def _iter_chunks(self):
+        """(첫 청크 여부, 청크) 반복 (취소되면 중단), 청크를 기록한 뒤 진행률 갱신"""
+        total = self.source.total_rows
+        first = True
+        for frame in self.source.iter_frames():
+            for start in range(0, len(frame), self.chunk_rows):
+                if self.is_cancelled():
+                    return
+                chunk = frame.iloc[start:start + self.chunk_rows]
+                yield first, chunk
+                first = False
+                self.rows_written += len(chunk)
+                self.progress = min(self.rows_written / total, 1.0) if total else 1.0
+                if self.progress_callback:
+                    self.progress_callback(self.progress, self.rows_written)
+        if first and not self.is_cancelled():
+            # 행이 없어도 헤더(스키마)는 기록
+            yield True, pd.DataFrame(columns=self.source.columns)
+
+    def _write_csv(self, path: str):
+        if self.export_format == "csv.gz":
+            f = gzip.open(path, "wt", encoding="utf-8", newline="", compresslevel=6)
+        else:
+            f = open(path, "w", encoding="utf-8", newline="")
+        with f:
+            for first, chunk in self._iter_chunks():
+                chunk.to_csv(f, index=False, header=first)
+
+    def _write_parquet(self, path: str):
+        compression = None if PARQUET_COMPRESSION == "none" else PARQUET_COMPRESSION
+        # 스키마는 전체 스냅샷(또는 원본 표본) 기준으로 정해 청크마다 타입이 달라지지 않도록 함
+        schema = pa.Schema.from_pandas(self.source.sample[self.source.columns], preserve_index=False)
+        with pq.ParquetWriter(path, schema, compression=compression) as writer:
+            for _, chunk in self._iter_chunks():
+                writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
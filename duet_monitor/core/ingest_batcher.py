@@ -0,0 +1,145 @@
+"""
+수신 데이터 마이크로 배치 모듈
+
+시리얼 콜백에서 들어오는 샘플을 모아 두었다가 일정 개수 또는 일정 시간마다
+한 번에 커밋한다. (DataProcessor.update_dataframe_batch 와 함께 사용)
+저널을 주면 커밋 전에 배치를 저널에 먼저 기록하고, 저장소가 배치를 디스크에 동기화한 뒤
+반영 완료를 표시한다.
+"""
+import time
+import threading
+from typing import Dict, Any, List, Callable, Optional
+
+
+class IngestBatcher:
+    def __init__(self, commit_callback: Callable[[List[Dict[str, Any]]], Any],
+                 max_batch_size: int = 64, max_delay_ms: int = 50, journal=None):
+        """
+        배치 수집기 초기화
+
+        Args:
+            commit_callback: 배치를 커밋할 함수 (샘플 딕셔너리 리스트를 받음).
+                False를 반환하면 실패로 보고 저널에 미반영으로 남기고, 동기화 완료 콜백 등록 함수
+                (예: CsvHandler.when_durable)를 반환하면 그 콜백이 호출될 때 반영 완료를 표시한다.
+                그 외의 값이면 바로 반영 완료를 표시한다.
+            max_batch_size: 이 개수가 모이면 즉시 커밋
+            max_delay_ms: 첫 샘플이 들어온 뒤 이 시간이 지나면 커밋
+            journal: 선기록 저널 (WriteAheadJournal, None이면 사용 안 함)
+        """
+        self.commit_callback = commit_callback
+        self.journal = journal
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay_ms / 1000.0
+
+        self._buffer: List[Dict[str, Any]] = []
+        self._first_time = 0.0
+        self._lock = threading.Lock()
+        self._commit_lock = threading.Lock()  # 커밋 순서 보장
+        self._wakeup = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.is_running = False
+
+        # 통계
+        self.batch_count = 0
+        self.sample_count = 0
+
+    def start(self) -> bool:
+        """
+        시간 기준 커밋 스레드 시작
+
+        Returns:
+            bool: 성공 여부
+        """
+        if self.is_running:
+            return True
+        self.is_running = True
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return True
+
+    def stop(self) -> bool:
+        """
+        스레드 중지 (남은 샘플은 모두 커밋)
+
+        Returns:
+            bool: 성공 여부
+        """
+        self.is_running = False
+        self._wakeup.set()
+        if self._thread and self._thread.is_alive():
+            self._thread.join(timeout=2.0)
+        self._thread = None
+        self.flush()
+        return True
+
+    def add(self, data: Dict[str, Any]):
+        """
+        샘플 추가 (개수 조건을 만족하면 호출한 스레드에서 바로 커밋)
+
+        Args:
+            data: 수신된 샘플
+        """
+        with self._lock:
+            if not self._buffer:
+                self._first_time = time.monotonic()
+                self._wakeup.set()
+            self._buffer.append(data)
+            is_full = len(self._buffer) >= self.max_batch_size
+        if is_full:
+            self.flush()
+
+    def flush(self) -> int:
+        """
+        버퍼에 쌓인 샘플 커밋
+
+        Returns:
+            int: 커밋된 샘플 수
+        """
+        with self._commit_lock:
+            with self._lock:
+                batch = self._buffer
+                self._buffer = []
+            if not batch:
+                return 0
+            seq = self.journal.append(batch) if self.journal else None
+            try:
+                result = self.commit_callback(batch)
+                if seq is not None:
+                    self._mark_applied(seq, result)
+            except Exception as e:
+                print(f"배치 커밋 오류: {e}")
+            self.batch_count += 1
+            self.sample_count += len(batch)
+            return len(batch)
+
+    def _mark_applied(self, seq: int, result: Any):
+        """커밋 결과에 따라 저널에 반영 완료 표시 (실패면 표시하지 않아 다음 시작 시 복구됨)"""
+        if result is False:
+            print(f"배치 {seq} 저장 실패 (저널에 미반영으로 남김)")
+        elif callable(result):
+            journal = self.journal
+            if not result(lambda: journal.mark_applied(seq)):
+                print(f"배치 {seq} 동기화 대기 등록 실패 (저널에 미반영으로 남김)")
+        else:
+            self.journal.mark_applied(seq)
+
+    def get_pending_count(self) -> int:
+        """커밋 대기 중인 샘플 수 반환"""
+        with self._lock:
+            return len(self._buffer)
+
+    def _run(self):
+        """시간 기준 커밋 루프"""
+        while self.is_running:
+            with self._lock:
+                pending = bool(self._buffer)
+                remaining = self.max_delay - (time.monotonic() - self._first_time)
+            if not pending:
+                # 새 샘플이 들어올 때까지 대기
+                self._wakeup.wait(timeout=1.0)
+                self._wakeup.clear()
+                continue
+            if remaining > 0:
+                time.sleep(remaining)
+                continue
+            self.flush()
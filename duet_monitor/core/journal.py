@@ -0,0 +1,224 @@
+"""
+수신 배치 선기록(write-ahead) 저널 모듈
+
+배치를 저장소(CSV 등)에 반영하기 전에 순번과 CRC32를 붙여 저널 파일에 먼저 추가하고,
+저장소가 그 배치를 디스크에 동기화한 뒤 반영 완료 표시를 추가한다. 전원이 끊겨도 다음 시작 시
+recover() 가 끝부분의 잘린 레코드를 잘라내고 반영되지 않은 배치를 돌려주므로 다시 반영할 수 있다.
+(반영 완료 표시 직전에 끊기면 같은 배치가 한 번 더 반영될 수 있다)
+반영 완료 표시는 배치마다 따로 기록하므로 반영에 실패한 배치는 뒤의 배치가 반영되어도 남는다.
+
+레코드 형식: [종류 1B][순번 8B][길이 4B][CRC32 4B][JSON 본문]
+"""
+import os
+import json
+import zlib
+import struct
+import threading
+from typing import Dict, Any, Callable, List, Optional, Set, Tuple
+from ..config.settings import JOURNAL_PATH, JOURNAL_FSYNC, JOURNAL_MAX_BYTES
+
+_HEADER = struct.Struct("<BQII")
+_RECORD_BATCH = 1
+_RECORD_APPLIED = 2  # 해당 순번 배치 반영 완료
+_RECORD_CHECKPOINT = 3  # 이 순번까지 모두 반영 완료 (파일을 비울 때 기록)
+
+
+def _checksum(kind: int, seq: int, payload: bytes) -> int:
+    return zlib.crc32(payload, zlib.crc32(struct.pack("<BQ", kind, seq))) & 0xFFFFFFFF
+
+
+class WriteAheadJournal:
+    def __init__(self, path: str = JOURNAL_PATH, fsync: bool = JOURNAL_FSYNC,
+                 max_bytes: int = JOURNAL_MAX_BYTES):
+        """
+        저널 초기화
+
+        Args:
+            path: 저널 파일 경로
+            fsync: 배치를 추가할 때마다 디스크 동기화 (False면 OS 캐시에 맡김)
+            max_bytes: 모든 배치가 반영된 상태에서 이 크기를 넘으면 파일을 비움
+        """
+        self.path = path
+        self.fsync = fsync
+        self.max_bytes = max_bytes
+        self.file = None
+        self.last_seq = 0
+        self.applied_seq = 0  # 이 순번까지 모두 반영됨
+        self._unapplied: Set[int] = set()  # 기록했지만 반영 완료 표시가 없는 순번
+        self._lock = threading.Lock()
+        self.truncated_bytes = 0
+
+    def recover(self) -> List[Tuple[int, List[Dict[str, Any]]]]:
+        """
+        저널을 처음부터 검사해 잘린 끝부분을 잘라내고 반영되지 않은 배치 반환 (시작 시 한 번 호출)
+
+        Returns:
+            List[Tuple[int, List[Dict[str, Any]]]]: (순번, 배치) 목록 (순번 순)
+        """
+        pending: Dict[int, List[Dict[str, Any]]] = {}
+        applied: Set[int] = set()
+        valid_end = 0
+        self.truncated_bytes = 0
+        if os.path.exists(self.path):
+            with open(self.path, "rb") as f:
+                data = f.read()
+            offset = 0
+            while offset + _HEADER.size <= len(data):
+                kind, seq, length, crc = _HEADER.unpack_from(data, offset)
+                start = offset + _HEADER.size
+                payload = data[start:start + length]
+                if (kind not in (_RECORD_BATCH, _RECORD_APPLIED, _RECORD_CHECKPOINT) or len(payload) != length or
+                        _checksum(kind, seq, payload) != crc):
+                    break
+                if kind == _RECORD_BATCH:
+                    try:
+                        pending[seq] = json.loads(payload.decode("utf-8"))
+                    except ValueError:
+                        break
+                elif kind == _RECORD_APPLIED:
+                    applied.add(seq)
+                else:
+                    self.applied_seq = max(self.applied_seq, seq)
+                self.last_seq = max(self.last_seq, seq)
+                offset = valid_end = start + length
+            if valid_end < len(data):
+                # 쓰는 도중 끊긴 레코드 잘라내기
+                self.truncated_bytes = len(data) - valid_end
+                with open(self.path, "r+b") as f:
+                    f.truncate(valid_end)
+                print(f"저널 끝부분 {self.truncated_bytes}바이트 잘라냄: {self.path}")
+        unapplied = [seq for seq in sorted(pending) if seq > self.applied_seq and seq not in applied]
+        self._unapplied = set(unapplied)
+        return [(seq, pending[seq]) for seq in unapplied]
+
+    def open(self) -> bool:
+        """
+        추가 기록용으로 열기 (recover() 후 호출)
+
+        Returns:
+            bool: 성공 여부
+        """
+        try:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self.file = open(self.path, "ab")
+            return True
+        except Exception as e:
+            print(f"저널 열기 실패: {e}")
+            self.file = None
+            return False
+
+    def _write(self, kind: int, seq: int, payload: bytes, sync: bool):
+        self.file.write(_HEADER.pack(kind, seq, len(payload), _checksum(kind, seq, payload)) + payload)
+        self.file.flush()
+        if sync:
+            os.fsync(self.file.fileno())
+
+    def append(self, batch: List[Dict[str, Any]]) -> Optional[int]:
+        """
+        배치 추가 (반영 전에 호출)
+
+        Args:
+            batch: 샘플 딕셔너리 리스트 (JSON으로 저장, datetime 등은 문자열로 변환)
+
+        Returns:
+            Optional[int]: 배치 순번 (실패 시 None)
+        """
+        if self.file is None:
+            return None
+        try:
+            payload = json.dumps(batch, ensure_ascii=False, default=str).encode("utf-8")
+            with self._lock:
+                self.last_seq += 1
+                self._write(_RECORD_BATCH, self.last_seq, payload, self.fsync)
+                self._unapplied.add(self.last_seq)
+                return self.last_seq
+        except Exception as e:
+            print(f"저널 기록 실패: {e}")
+            return None
+
+    def mark_applied(self, seq: int) -> bool:
+        """
+        배치 반영 완료 표시 (저장소가 디스크에 동기화한 뒤 호출, 모두 반영되었고 파일이 크면 비움)
+
+        Args:
+            seq: 반영된 배치 순번 (이 배치만 반영된 것으로 표시)
+
+        Returns:
+            bool: 성공 여부
+        """
+        if self.file is None:
+            return False
+        try:
+            with self._lock:
+                self._unapplied.discard(seq)
+                self.applied_seq = min(self._unapplied) - 1 if self._unapplied else self.last_seq
+                if not self._unapplied and self.file.tell() >= self.max_bytes:
+                    self._reset()
+                else:
+                    self._write(_RECORD_APPLIED, seq, b"", False)
+            return True
+        except Exception as e:
+            print(f"저널 반영 표시 실패: {e}")
+            return False
+
+    def _reset(self):
+        """파일을 비우고 현재 순번만 남김 (순번은 이어서 증가)"""
+        self.file.seek(0)
+        self.file.truncate()
+        self._write(_RECORD_CHECKPOINT, self.applied_seq, b"", True)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """저널 상태 반환 (마지막 순번, 반영 순번, 파일 크기)"""
+        with self._lock:
+            return {
+                "last_seq": self.last_seq,
+                "applied_seq": self.applied_seq,
+                "unapplied": len(self._unapplied),
+                "bytes": self.file.tell() if self.file else 0,
+                "truncated_bytes": self.truncated_bytes,
+            }
+
+    def close(self):
+        """저널 닫기"""
+        with self._lock:
+            if self.file is not None:
+                self.file.close()
+                self.file = None
+
+
+class DurabilityWaiters:
+    """
+    저장소의 디스크 동기화 완료 콜백 목록 (CsvHandler 등의 when_durable 에서 사용)
+
+    저장소는 동기화가 끝나면 notify() 를 호출하고, 그때까지 등록된 콜백을 모두 호출한다.
+    """
+
+    def __init__(self):
+        self._callbacks: List[Callable[[], Any]] = []
+        self._lock = threading.Lock()
+
+    def add(self, callback: Callable[[], Any]):
+        with self._lock:
+            self._callbacks.append(callback)
+
+    def __len__(self) -> int:
+        return len(self._callbacks)
+
+    def discard(self) -> int:
+        """등록된 콜백을 호출하지 않고 버림 (저장 실패 시, 해당 배치는 미반영으로 남음)"""
+        with self._lock:
+            count = len(self._callbacks)
+            self._callbacks = []
+        return count
+
+    def notify(self):
+        """등록된 콜백을 모두 호출하고 비움"""
+        with self._lock:
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception as e:
+                print(f"동기화 완료 콜백 오류: {e}")
@@ -0,0 +1,355 @@
+"""
+CSV 로드 캐시 모듈
+
+한 번 읽은 CSV 파일을 컬럼별 바이너리 배열 파일로 저장해 두고, 같은 파일(경로/크기/수정 시각이
+같음)을 다시 열면 파싱 없이 numpy.memmap 으로 읽는다. 숫자 컬럼은 float64, 타임스탬프는
+int64 (원래 시간 단위), 문자열 컬럼은 int32 코드 + 범주 목록으로 저장한다. 읽을 때는 메타데이터에
+기록한 원래 dtype 으로 되돌려 새로 파싱한 결과와 같은 dtype 을 준다. 캐시 전체 크기가
+한도를 넘으면 가장 오래 사용하지 않은 항목부터 지운다.
+"""
+import os
+import json
+import shutil
+import hashlib
+import numpy as np
+import pandas as pd
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Iterator, Tuple
+from ..config.settings import LOAD_CACHE_DIR, LOAD_CACHE_MAX_BYTES
+
+_META_FILE = "meta.json"
+
+
+def _safe_name(index: int) -> str:
+    """컬럼 파일 이름 (컬럼명에 경로 문자가 있어도 안전하도록 순번 사용)"""
+    return f"col{index:04d}.bin"
+
+
+class CacheWriter:
+    def __init__(self, cache: "LoadCache", key: str, source: Dict[str, Any]):
+        """
+        캐시 항목 기록기 (청크를 받는 대로 컬럼 파일에 이어서 기록)
+
+        Args:
+            cache: 소속 캐시
+            key: 캐시 키
+            source: 원본 파일 정보 (경로, 크기, 수정 시각)
+        """
+        self.cache = cache
+        self.key = key
+        self.source = source
+        self.temp_dir = os.path.join(cache.cache_dir, f".{key}.tmp")
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+        os.makedirs(self.temp_dir, exist_ok=True)
+        self.columns: List[Dict[str, Any]] = []
+        self._files = []
+        self._categories: List[Dict[str, int]] = []
+        self.rows = 0
+        self.failed = False
+
+    def _kind(self, values: pd.Series) -> str:
+        if pd.api.types.is_datetime64_any_dtype(values):
+            return "datetime"
+        if pd.api.types.is_numeric_dtype(values):
+            return "number"
+        return "category"
+
+    def add(self, chunk: pd.DataFrame):
+        """
+        청크 추가 (컬럼 구성이나 종류가 바뀌면 캐시하지 않음)
+
+        Args:
+            chunk: 읽은 청크
+        """
+        if self.failed:
+            return
+        try:
+            if not self.columns:
+                for i, column in enumerate(chunk.columns):
+                    info = {"name": column, "kind": self._kind(chunk[column]), "file": _safe_name(i),
+                            "dtype": str(chunk[column].dtype)}
+                    if info["kind"] == "datetime":
+                        info["unit"] = np.datetime_data(chunk[column].to_numpy().dtype)[0]
+                    self.columns.append(info)
+                    self._files.append(open(os.path.join(self.temp_dir, _safe_name(i)), "wb"))
+                    self._categories.append({})
+            if [c["name"] for c in self.columns] != list(chunk.columns):
+                self.failed = True
+                return
+            for info, f, categories in zip(self.columns, self._files, self._categories):
+                values = chunk[info["name"]]
+                kind = self._kind(values)
+                if kind != info["kind"] and not (info["kind"] == "number" and values.isna().all()):
+                    self.failed = True
+                    return
+                if str(values.dtype) != info["dtype"]:
+                    # 청크마다 추론된 dtype 이 다르면 (int64 / float64 등) 모두 담을 수 있는 dtype 으로 기록
+                    info["dtype"] = "float64" if info["kind"] == "number" else (
+                        "object" if info["kind"] == "category" else info["dtype"])
+                if info["kind"] == "datetime":
+                    data = values.to_numpy(dtype=f"datetime64[{info['unit']}]").view(np.int64)
+                elif info["kind"] == "number":
+                    data = values.to_numpy(dtype=np.float64, na_value=np.nan)
+                else:
+                    # 문자열은 파일 전체에서 공유하는 범주 코드로 변환 (결측은 -1)
+                    codes = np.full(len(values), -1, dtype=np.int32)
+                    notna = values.notna().to_numpy()
+                    labels = values[notna].astype(str)
+                    for label in labels.unique():
+                        if label not in categories:
+                            categories[label] = len(categories)
+                    codes[notna] = labels.map(categories).to_numpy(dtype=np.int32)
+                    data = codes
+                f.write(np.ascontiguousarray(data).tobytes())
+            self.rows += len(chunk)
+        except Exception as e:
+            print(f"로드 캐시 기록 실패: {e}")
+            self.failed = True
+
+    def _close_files(self):
+        for f in self._files:
+            f.close()
+        self._files = []
+
+    def commit(self) -> bool:
+        """
+        기록 완료 후 캐시 항목으로 등록 (임시 디렉토리를 이름 변경)
+
+        Returns:
+            bool: 성공 여부
+        """
+        self._close_files()
+        if self.failed:
+            self.abort()
+            return False
+        try:
+            for info, categories in zip(self.columns, self._categories):
+                if info["kind"] == "category":
+                    info["categories"] = list(categories)
+            meta = dict(self.source, rows=self.rows, columns=self.columns,
+                        created=datetime.now().isoformat())
+            with open(os.path.join(self.temp_dir, _META_FILE), "w", encoding="utf-8") as f:
+                json.dump(meta, f, ensure_ascii=False)
+            target = os.path.join(self.cache.cache_dir, self.key)
+            shutil.rmtree(target, ignore_errors=True)
+            os.replace(self.temp_dir, target)
+            self.cache.evict(keep=self.key)
+            return True
+        except Exception as e:
+            print(f"로드 캐시 등록 실패: {e}")
+            self.abort()
+            return False
+
+    def abort(self):
+        """기록 중인 항목 삭제"""
+        self._close_files()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+
+class LoadCache:
+    def __init__(self, cache_dir: str = LOAD_CACHE_DIR, max_bytes: int = LOAD_CACHE_MAX_BYTES):
+        """
+        로드 캐시 초기화
+
+        Args:
+            cache_dir: 캐시 디렉토리
+            max_bytes: 캐시 전체 최대 크기 (넘으면 오래 사용하지 않은 항목부터 삭제)
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+
+    def _source_info(self, file_path: str) -> Dict[str, Any]:
+        stat = os.stat(file_path)
+        return {"path": os.path.abspath(file_path), "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+    def _key(self, source: Dict[str, Any]) -> str:
+        text = f"{source['path']}|{source['size']}|{source['mtime_ns']}"
+        return hashlib.sha1(text.encode("utf-8")).hexdigest()[:20]
+
+    def _read_entry(self, file_path: str) -> Optional[Dict[str, Any]]:
+        """원본 파일에 맞는 캐시 항목 메타데이터 (없거나 원본이 바뀌었으면 None)"""
+        try:
+            source = self._source_info(file_path)
+            entry_dir = os.path.join(self.cache_dir, self._key(source))
+            meta_path = os.path.join(entry_dir, _META_FILE)
+            if not os.path.exists(meta_path):
+                return None
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            if meta.get("size") != source["size"] or meta.get("mtime_ns") != source["mtime_ns"]:
+                return None
+            # 최근 사용 시각 갱신 (LRU 기준)
+            os.utime(meta_path)
+            meta["dir"] = entry_dir
+            return meta
+        except Exception as e:
+            print(f"로드 캐시 확인 실패: {e}")
+            return None
+
+    def contains(self, file_path: str) -> bool:
+        """캐시 항목이 있는지 확인"""
+        return self._read_entry(file_path) is not None
+
+    def _open_columns(self, meta: Dict[str, Any], usecols: Optional[List[str]]):
+        """컬럼 파일을 copy-on-write memmap 으로 열기 (수정해도 캐시 파일은 바뀌지 않음)"""
+        columns = []
+        for info in meta["columns"]:
+            name = info["name"]
+            if usecols is not None and name not in usecols and name != "timestamp":
+                continue
+            dtype = np.float64 if info["kind"] == "number" else (
+                np.int64 if info["kind"] == "datetime" else np.int32)
+            path = os.path.join(meta["dir"], info["file"])
+            if meta["rows"]:
+                data = np.memmap(path, dtype=dtype, mode="c", shape=(meta["rows"],))
+            else:
+                data = np.empty(0, dtype=dtype)
+            columns.append((info, data))
+        return columns
+
+    @staticmethod
+    def _build_frame(columns, start: int, stop: int) -> pd.DataFrame:
+        """
+        memmap 구간으로 데이터프레임 생성 (float64 / 시간 컬럼은 복사하지 않음, 쓰기 시 해당 페이지만 복사)
+
+        원래 dtype 이 float64 가 아닌 숫자 컬럼과 문자열 컬럼은 원래 dtype 으로 변환한다.
+        """
+        data = {}
+        for info, values in columns:
+            part = values[start:stop]
+            dtype = info.get("dtype")
+            if info["kind"] == "datetime":
+                data[info["name"]] = part.view(f"datetime64[{info.get('unit', 'ns')}]")
+            elif info["kind"] == "category":
+                categorical = pd.Categorical.from_codes(part, info["categories"])
+                data[info["name"]] = categorical.astype(dtype) if dtype else categorical
+            elif dtype and dtype != "float64":
+                data[info["name"]] = pd.Series(part, copy=False).astype(dtype)
+            else:
+                data[info["name"]] = part
+        return pd.DataFrame(data, copy=False)
+
+    def iter_chunks(self, file_path: str, chunk_rows: int,
+                    usecols: Optional[List[str]] = None) -> Optional[Tuple[int, Iterator[pd.DataFrame]]]:
+        """
+        캐시에서 청크 단위로 읽기
+
+        Args:
+            file_path: 원본 파일 경로
+            chunk_rows: 청크당 행 수
+            usecols: 읽을 컬럼 (None이면 전체, timestamp는 항상 포함)
+
+        Returns:
+            Optional[Tuple[int, Iterator[pd.DataFrame]]]: (전체 행 수, 청크 반복자) (캐시가 없으면 None)
+        """
+        meta = self._read_entry(file_path)
+        if meta is None:
+            return None
+        columns = self._open_columns(meta, usecols)
+        rows = meta["rows"]
+
+        def generate():
+            if not rows:
+                yield self._build_frame(columns, 0, 0)
+            for start in range(0, rows, chunk_rows):
+                yield self._build_frame(columns, start, min(start + chunk_rows, rows))
+        return rows, generate()
+
+    def get(self, file_path: str, usecols: Optional[List[str]] = None) -> Optional[pd.DataFrame]:
+        """
+        캐시에서 전체 읽기
+
+        Args:
+            file_path: 원본 파일 경로
+            usecols: 읽을 컬럼
+
+        Returns:
+            Optional[pd.DataFrame]: 데이터프레임 (캐시가 없으면 None)
+        """
+        meta = self._read_entry(file_path)
+        if meta is None:
+            return None
+        return self._build_frame(self._open_columns(meta, usecols), 0, meta["rows"])
+
+    def writer(self, file_path: str) -> Optional[CacheWriter]:
+        """
+        캐시 항목 기록기 생성
+
+        Args:
+            file_path: 원본 파일 경로
+
+        Returns:
+            Optional[CacheWriter]: 기록기 (실패 시 None)
+        """
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            source = self._source_info(file_path)
+            return CacheWriter(self, self._key(source), source)
+        except Exception as e:
+            print(f"로드 캐시 생성 실패: {e}")
+            return None
+
+    def put(self, file_path: str, df: pd.DataFrame) -> bool:
+        """
+        데이터프레임을 캐시에 저장
+
+        Args:
+            file_path: 원본 파일 경로
+            df: 원본 파일 내용
+
+        Returns:
+            bool: 성공 여부
+        """
+        writer = self.writer(file_path)
+        if writer is None:
+            return False
+        writer.add(df)
+        return writer.commit()
+
+    def _entries(self) -> List[Dict[str, Any]]:
+        """캐시 항목 목록 (경로, 크기, 최근 사용 시각)"""
+        entries = []
+        if not os.path.isdir(self.cache_dir):
+            return entries
+        for name in os.listdir(self.cache_dir):
+            entry_dir = os.path.join(self.cache_dir, name)
+            meta_path = os.path.join(entry_dir, _META_FILE)
+            if name.startswith(".") or not os.path.exists(meta_path):
+                continue
+            size = sum(os.path.getsize(os.path.join(entry_dir, f)) for f in os.listdir(entry_dir))
+            entries.append({"key": name, "dir": entry_dir, "bytes": size,
+                            "last_used": os.path.getmtime(meta_path)})
+        return entries
+
+    def evict(self, keep: Optional[str] = None) -> int:
+        """
+        전체 크기가 한도를 넘으면 오래 사용하지 않은 항목부터 삭제
+
+        Args:
+            keep: 지우지 않을 항목 키 (방금 만든 항목)
+
+        Returns:
+            int: 삭제한 항목 수
+        """
+        entries = sorted(self._entries(), key=lambda e: e["last_used"])
+        total = sum(e["bytes"] for e in entries)
+        removed = 0
+        for entry in entries:
+            if total <= self.max_bytes:
+                break
+            if entry["key"] == keep:
+                continue
+            shutil.rmtree(entry["dir"], ignore_errors=True)
+            total -= entry["bytes"]
+            removed += 1
+        return removed
+
+    def get_stats(self) -> Dict[str, Any]:
+        """캐시 항목 수와 전체 크기 반환"""
+        entries = self._entries()
+        return {"entries": len(entries), "bytes": sum(e["bytes"] for e in entries),
+                "max_bytes": self.max_bytes}
+
+    def clear(self):
+        """캐시 전체 삭제"""
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
@@ -0,0 +1,340 @@
+"""
+합성 부하 생성 모듈
+
+NumPy 벡터 연산으로 여러 장치의 DUET 샘플을 대량 생성한다.
+벤치마크와 테스트 모드가 같은 작업 부하를 쓰도록 메모리(데이터프레임/레코드),
+CSV 파일, 시리얼 원시 바이트(JSON 라인), 가상 시리얼(pty) 출력을 지원한다.
+"""
+import os
+import json
+import numpy as np
+import pandas as pd
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Iterator, Tuple
+
+# 파티클 센서 필드: (중심값, 변동폭) - 기존 generate_test_data 의 값 범위 기준
+PT1_FIELDS: Dict[str, Tuple[float, float]] = {
+    "pm10_standard": (3.0, 1.0),
+    "pm25_standard": (5.0, 1.0),
+    "pm100_standard": (5.0, 1.0),
+    "particles_03um": (750.0, 75.0),
+    "particles_05um": (200.0, 25.0),
+    "particles_10um": (35.0, 7.5),
+    "particles_25um": (2.5, 1.2),
+    "particles_50um": (1.0, 0.5),
+    "particles_100um": (0.5, 0.3),
+}
+PT2_FIELDS: Dict[str, Tuple[float, float]] = {
+    "pm10_standard": (3.0, 1.0),
+    "pm25_standard": (4.5, 0.8),
+    "pm100_standard": (4.5, 0.8),
+    "particles_03um": (650.0, 75.0),
+    "particles_05um": (175.0, 12.5),
+    "particles_10um": (25.0, 7.5),
+    "particles_25um": (2.0, 1.0),
+    "particles_50um": (0.5, 0.3),
+    "particles_100um": (0.5, 0.3),
+}
+
+# 시리얼 출력 시 최상위 필드 순서 (실제 장치 출력 순서와 동일)
+ENV_FIELDS = ["temperature", "hum", "pressure", "tvoc", "eco2", "rawh2", "rawethanol"]
+
+
+class LoadGenerator:
+    def __init__(self, devices: int = 1, rate_hz: float = 1.0, first_device_id: int = 817,
+                 drift_per_hour: float = 0.0, gap_probability: float = 0.0,
+                 gap_max_seconds: float = 30.0, corrupt_ratio: float = 0.0,
+                 new_column_after: Optional[int] = None, new_column_name: str = "extra_sensor",
+                 start_time: Optional[datetime] = None, seed: Optional[int] = None):
+        """
+        부하 생성기 초기화
+
+        Args:
+            devices: 장치 수 (id는 first_device_id부터 연속)
+            rate_hz: 장치당 샘플 속도 (초당)
+            first_device_id: 첫 장치 id
+            drift_per_hour: pt2 센서의 시간당 감도 드리프트 비율 (0.05 = 시간당 5%)
+            gap_probability: 샘플 사이에 수신 공백이 생길 확률
+            gap_max_seconds: 공백의 최대 길이(초)
+            corrupt_ratio: 시리얼 출력에서 손상된 라인의 비율
+            new_column_after: 이 샘플 번호부터 새 컬럼(new_column_name) 추가 (None이면 없음)
+            new_column_name: 새 컬럼 이름
+            start_time: 첫 샘플 시간 (None이면 생성 시점에서 거꾸로 계산)
+            seed: 난수 시드
+        """
+        self.devices = max(1, int(devices))
+        self.rate_hz = float(rate_hz)
+        self.first_device_id = first_device_id
+        self.drift_per_hour = drift_per_hour
+        self.gap_probability = gap_probability
+        self.gap_max_seconds = gap_max_seconds
+        self.corrupt_ratio = corrupt_ratio
+        self.new_column_after = new_column_after
+        self.new_column_name = new_column_name
+        self.start_time = start_time
+        self.rng = np.random.default_rng(seed)
+        self.reset()
+
+    def get_columns(self) -> List[str]:
+        """평탄화된 출력 컬럼 목록 반환"""
+        columns = ["type", "id", "sample_time"]
+        columns += [f"pt1_{name}" for name in PT1_FIELDS]
+        columns += [f"pt2_{name}" for name in PT2_FIELDS]
+        columns += ENV_FIELDS
+        if self.new_column_after is not None:
+            columns.append(self.new_column_name)
+        columns.append("timestamp")
+        return columns
+
+    def reset(self):
+        """생성 상태(장치별 시계, 샘플 번호) 초기화"""
+        self._produced = 0
+        self._clock = np.full(self.devices, -1.0 / self.rate_hz)
+
+    def generate_columns(self, num_samples: int) -> Dict[str, np.ndarray]:
+        """
+        컬럼별 배열 생성 (모든 출력 형식의 기반)
+
+        샘플은 장치를 번갈아 가며 배치되고 (i번째 샘플 = 장치 i % devices),
+        연속 호출 시 이전 호출에 이어서 시간이 흐른다.
+
+        Args:
+            num_samples: 생성할 샘플 수 (전체 장치 합계)
+
+        Returns:
+            Dict[str, np.ndarray]: 평탄화된 컬럼 이름별 배열
+        """
+        n = int(num_samples)
+        rng = self.rng
+        index = np.arange(self._produced, self._produced + n)
+        device = index % self.devices
+
+        # 장치별 경과 시간: 기본 간격 + 무작위 공백을 (샘플 × 장치) 행렬에서 장치 단위로 누적
+        steps = np.full(n, 1.0 / self.rate_hz)
+        if self.gap_probability > 0:
+            gap_mask = rng.random(n) < self.gap_probability
+            steps[gap_mask] += rng.uniform(1.0, self.gap_max_seconds, gap_mask.sum())
+        lead = self._produced % self.devices
+        rows = -(-(lead + n) // self.devices)
+        padded = np.zeros(rows * self.devices)
+        padded[lead:lead + n] = steps
+        matrix = np.cumsum(padded.reshape(rows, self.devices), axis=0) + self._clock
+        elapsed = matrix.ravel()[lead:lead + n]
+        self._clock = matrix[-1].copy()
+        self._produced += n
+
+        if self.start_time is None:
+            # 첫 호출 시 마지막 샘플이 현재 시간이 되도록 시작 시간 결정
+            self.start_time = datetime.now() - pd.Timedelta(seconds=float(elapsed.max(initial=0.0)))
+        timestamps = np.datetime64(self.start_time, "ns") + (elapsed * 1e9).astype("timedelta64[ns]")
+
+        # 공통 오염도: 장치별 위상의 완만한 주기 변화 + 노이즈 (두 센서가 같이 움직이도록)
+        phase = device * 1.7
+        level = 1.0 + 0.3 * np.sin(2 * np.pi * elapsed / 3600.0 + phase) + rng.normal(0, 0.05, n)
+        level = np.clip(level, 0.2, None)
+        drift = 1.0 + self.drift_per_hour * elapsed / 3600.0
+
+        out: Dict[str, np.ndarray] = {
+            "type": np.full(n, 2, dtype=np.int64),
+            "id": (self.first_device_id + device).astype(np.int64),
+            "sample_time": (795000 + np.rint(elapsed * 1000)).astype(np.int64),
+        }
+        for prefix, fields, scale in (("pt1", PT1_FIELDS, 1.0), ("pt2", PT2_FIELDS, drift)):
+            for name, (center, spread) in fields.items():
+                values = center * level * scale + rng.normal(0, spread, n)
+                out[f"{prefix}_{name}"] = np.clip(np.rint(values), 0, None).astype(np.int64)
+
+        out["temperature"] = np.round(27.7 + rng.uniform(-0.2, 0.2, n), 2)
+        out["hum"] = np.round(35.0 + rng.uniform(-1.0, 1.5, n), 2)
+        out["pressure"] = np.full(n, 402, dtype=np.int64)
+        out["tvoc"] = rng.integers(0, 81, n)
+        out["eco2"] = 400 + np.where(rng.random(n) > 0.8, rng.integers(0, 6, n) * 50, 0)
+        out["rawh2"] = rng.integers(12400, 12901, n)
+        out["rawethanol"] = rng.integers(940, 1201, n)
+        if self.new_column_after is not None:
+            extra = np.round(rng.normal(50.0, 5.0, n), 2)
+            extra[index < self.new_column_after] = np.nan
+            out[self.new_column_name] = extra
+        out["timestamp"] = timestamps
+        return out
+
+    def generate_frame(self, num_samples: int) -> pd.DataFrame:
+        """
+        평탄화된 데이터프레임 생성
+
+        Args:
+            num_samples: 생성할 샘플 수
+
+        Returns:
+            pd.DataFrame: pt1_X / pt2_X 형식의 데이터프레임
+        """
+        return pd.DataFrame(self.generate_columns(num_samples))
+
+    def generate_records(self, num_samples: int, timestamp_format: str = "iso") -> List[Dict[str, Any]]:
+        """
+        시리얼 콜백과 같은 중첩 형식(pt1/pt2 딕셔너리)의 레코드 생성
+
+        Args:
+            num_samples: 생성할 샘플 수
+            timestamp_format: "iso"(문자열), "datetime"(datetime 객체), "none"(타임스탬프 제외)
+
+        Returns:
+            List[Dict[str, Any]]: 샘플 딕셔너리 리스트
+        """
+        cols = self.generate_columns(num_samples)
+        n = len(cols["id"])
+        # 배열을 한 번에 파이썬 객체 리스트로 변환 (행마다 numpy 스칼라 변환 방지)
+        lists = {key: arr.tolist() for key, arr in cols.items() if key != "timestamp"}
+        if timestamp_format == "iso":
+            stamps = np.datetime_as_string(cols["timestamp"], unit="us").tolist()
+        elif timestamp_format == "datetime":
+            stamps = pd.DatetimeIndex(cols["timestamp"]).to_pydatetime().tolist()
+        else:
+            stamps = None
+        pt1_keys = [(name, lists[f"pt1_{name}"]) for name in PT1_FIELDS]
+        pt2_keys = [(name, lists[f"pt2_{name}"]) for name in PT2_FIELDS]
+        env_keys = [(name, lists[name]) for name in ENV_FIELDS]
+        extra = lists.get(self.new_column_name) if self.new_column_after is not None else None
+
+        records = []
+        for i in range(n):
+            sample = {
+                "type": lists["type"][i],
+                "id": lists["id"][i],
+                "sample_time": lists["sample_time"][i],
+                "pt1": {name: values[i] for name, values in pt1_keys},
+                "pt2": {name: values[i] for name, values in pt2_keys},
+            }
+            for name, values in env_keys:
+                sample[name] = values[i]
+            if extra is not None and extra[i] == extra[i]:
+                sample[self.new_column_name] = extra[i]
+            if stamps is not None:
+                sample["timestamp"] = stamps[i]
+            records.append(sample)
+        return records
+
+    def write_csv(self, file_path: str, num_samples: int, chunk_size: int = 100000) -> int:
+        """
+        평탄화된 샘플을 CSV 파일로 저장 (청크 단위)
+
+        Args:
+            file_path: 저장할 파일 경로
+            num_samples: 생성할 샘플 수
+            chunk_size: 한 번에 생성할 샘플 수
+
+        Returns:
+            int: 기록된 행 수
+        """
+        written = 0
+        with open(file_path, "w", newline="", encoding="utf-8") as f:
+            while written < num_samples:
+                count = min(chunk_size, num_samples - written)
+                frame = pd.DataFrame(self.generate_columns(count))
+                frame.to_csv(f, header=(written == 0), index=False, date_format="%Y-%m-%dT%H:%M:%S.%f")
+                written += count
+        return written
+
+    def iter_serial_chunks(self, num_samples: int, chunk_size: int = 10000,
+                           include_timestamp: bool = False) -> Iterator[bytes]:
+        """
+        시리얼 포트로 들어오는 것과 같은 JSON 라인 바이트를 청크 단위로 생성
+
+        corrupt_ratio 비율의 라인은 중간이 잘리거나 일부 바이트가 깨진 상태로 출력된다.
+
+        Args:
+            num_samples: 생성할 샘플 수
+            chunk_size: 청크당 샘플 수
+            include_timestamp: 타임스탬프 필드 포함 여부 (실제 장치는 보내지 않음)
+
+        Yields:
+            bytes: 줄바꿈으로 구분된 JSON 라인 묶음
+        """
+        produced = 0
+        timestamp_format = "iso" if include_timestamp else "none"
+        while produced < num_samples:
+            count = min(chunk_size, num_samples - produced)
+            records = self.generate_records(count, timestamp_format)
+            lines = [json.dumps(record, separators=(",", ":")) for record in records]
+            if self.corrupt_ratio > 0:
+                for i in np.flatnonzero(self.rng.random(count) < self.corrupt_ratio):
+                    lines[i] = self._corrupt_line(lines[i])
+            produced += count
+            yield ("\n".join(lines) + "\n").encode("utf-8")
+
+    def _corrupt_line(self, line: str) -> str:
+        """라인 손상 (잘림 / 중괄호 누락 / 잡음 문자 삽입 중 하나)"""
+        kind = self.rng.integers(0, 3)
+        if kind == 0:
+            return line[:self.rng.integers(1, len(line))]
+        if kind == 1:
+            return line[:-1]
+        pos = int(self.rng.integers(1, len(line)))
+        return line[:pos] + "\x00#" + line[pos:]
+
+    def write_serial_bytes(self, file_path: str, num_samples: int, chunk_size: int = 10000) -> int:
+        """
+        시리얼 원시 바이트를 파일로 저장 (재생용)
+
+        Args:
+            file_path: 저장할 파일 경로
+            num_samples: 생성할 샘플 수
+            chunk_size: 청크당 샘플 수
+
+        Returns:
+            int: 기록된 바이트 수
+        """
+        total = 0
+        with open(file_path, "wb") as f:
+            for chunk in self.iter_serial_chunks(num_samples, chunk_size):
+                f.write(chunk)
+                total += len(chunk)
+        return total
+
+    @staticmethod
+    def open_pty() -> Tuple[int, str]:
+        """
+        가상 시리얼 포트(pty) 생성 (POSIX 전용)
+
+        반환된 장치 경로는 SerialHandler.connect 에 그대로 사용할 수 있다.
+
+        Returns:
+            Tuple[int, str]: (쓰기용 master fd, slave 장치 경로)
+        """
+        import tty
+        master_fd, slave_fd = os.openpty()
+        tty.setraw(slave_fd)  # 줄바꿈 변환/에코 방지
+        return master_fd, os.ttyname(slave_fd)
+
+    def feed_pty(self, master_fd: int, num_samples: int, chunk_size: int = 100,
+                 rate_limit: bool = True, stop_event=None) -> int:
+        """
+        pty 에 샘플 바이트 쓰기
+
+        Args:
+            master_fd: open_pty 가 반환한 master fd
+            num_samples: 보낼 샘플 수
+            chunk_size: 한 번에 쓸 샘플 수
+            rate_limit: True면 rate_hz * devices 속도에 맞춰 전송
+            stop_event: 설정되면 중단하는 threading.Event (선택)
+
+        Returns:
+            int: 보낸 샘플 수
+        """
+        import time
+        interval = chunk_size / (self.rate_hz * self.devices)
+        next_time = time.perf_counter()
+        sent = 0
+        for chunk in self.iter_serial_chunks(num_samples, chunk_size):
+            if stop_event is not None and stop_event.is_set():
+                break
+            view = memoryview(chunk)
+            while view:
+                view = view[os.write(master_fd, view):]
+            sent += min(chunk_size, num_samples - sent)
+            if rate_limit:
+                next_time += interval
+                delay = next_time - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+        return sent
@@ -0,0 +1,119 @@
+"""
+스트리밍 스파이크/이상치 필터 모듈 (Hampel / MAD)
+
+컬럼마다 최근 window개의 이동 중앙값과 MAD(중앙값 절대 편차)를 유지하며,
+중앙값에서 n_sigmas * 1.4826 * MAD 보다 멀리 떨어진 샘플을 이상치로 판단한다.
+MAD는 각 샘플이 들어올 때의 중앙값 기준 절대 편차를 이동 중앙값으로 유지하는
+근사치를 사용하여 샘플당 O(log w)로 갱신한다. 작은 윈도우에서 MAD 추정이
+흔들려 오탐이 늘지 않도록 편차 윈도우는 판정 윈도우의 3배로 둔다.
+"""
+import fnmatch
+from typing import Dict, Any, List, Optional, Tuple
+from .rolling import RollingMedian
+
+# 정규분포에서 MAD를 표준편차로 환산하는 계수
+_MAD_SCALE = 1.4826
+
+
+class StreamingHampel:
+    """단일 컬럼용 스트리밍 Hampel 필터"""
+
+    def __init__(self, window: int, n_sigmas: float, min_sigma: float = 0.0):
+        self.window = window
+        self.n_sigmas = n_sigmas
+        self.min_sigma = min_sigma
+        self.median = RollingMedian(window)
+        self.deviation = RollingMedian(window * 3)
+        self.count = 0
+
+    def update(self, value: float) -> Tuple[float, bool]:
+        """
+        샘플 판정 후 윈도우 갱신
+
+        Args:
+            value: 새 샘플 값
+
+        Returns:
+            Tuple[float, bool]: (대체값 후보인 직전 중앙값, 이상치 여부)
+        """
+        is_outlier = False
+        center = value
+        if self.count > 0:
+            center = self.median.median()
+            # 윈도우 절반 이상 채워진 뒤부터 판정
+            if self.count >= max(3, self.window // 2):
+                sigma = max(_MAD_SCALE * self.deviation.median(), self.min_sigma)
+                is_outlier = abs(value - center) > self.n_sigmas * sigma
+            self.deviation.update(abs(value - center))
+        self.median.update(value)
+        self.count += 1
+        return center, is_outlier
+
+
+class OutlierFilter:
+    def __init__(self, patterns: List[str], window: int = 11, n_sigmas: float = 3.0,
+                 min_sigma: float = 1.0, mode: str = "replace"):
+        """
+        수신 단계 이상치 필터 초기화
+
+        Args:
+            patterns: 필터를 적용할 컬럼 fnmatch 패턴
+            window: 판정 윈도우 크기
+            n_sigmas: 이상치 판정 배수
+            min_sigma: 값이 일정할 때 과도한 판정을 막는 최소 표준편차
+            mode: "replace" (중앙값으로 대체, 원본은 {컬럼}_raw) 또는 "flag" ({컬럼}_outlier 표시)
+        """
+        self.patterns = patterns
+        self.window = window
+        self.n_sigmas = n_sigmas
+        self.min_sigma = min_sigma
+        self.mode = mode
+        self.counts: Dict[str, int] = {}
+        self._filters: Dict[str, Optional[StreamingHampel]] = {}
+
+    def _filter_for(self, column: str) -> Optional[StreamingHampel]:
+        if column not in self._filters:
+            name = column.lower()
+            matched = any(fnmatch.fnmatchcase(name, pattern) for pattern in self.patterns)
+            self._filters[column] = (
+                StreamingHampel(self.window, self.n_sigmas, self.min_sigma) if matched else None
+            )
+        return self._filters[column]
+
+    def apply(self, row: Dict[str, Any], columns: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        행에 필터 적용
+
+        Args:
+            row: 평탄화된 샘플 (제자리에서 수정됨)
+            columns: 검사할 컬럼 (None이면 행의 모든 컬럼)
+
+        Returns:
+            Dict[str, Any]: 필터가 적용된 행
+        """
+        for column in (list(row) if columns is None else columns):
+            value = row.get(column)
+            if not isinstance(value, (int, float)) or isinstance(value, bool) or value != value:
+                continue
+            hampel = self._filter_for(column)
+            if hampel is None:
+                continue
+            center, is_outlier = hampel.update(float(value))
+            if is_outlier:
+                self.counts[column] = self.counts.get(column, 0) + 1
+            if self.mode == "replace":
+                row[f"{column}_raw"] = value
+                if is_outlier:
+                    row[column] = center
+            else:
+                row[f"{column}_outlier"] = is_outlier
+        return row
+
+    def get_counts(self) -> Dict[str, int]:
+        """컬럼별 이상치 처리 횟수 반환"""
+        return dict(self.counts)
+
+    def reset(self):
+        """필터 상태 및 카운트 초기화"""
+        self._filters.clear()
+        self.counts.clear()
@@ -0,0 +1,328 @@
+"""
+Parquet 파일 핸들러 모듈
+
+CsvHandler 와 같은 인터페이스(initialize / append_data / append_batch / close)로
+수신 데이터를 Arrow 레코드 배치로 모아 Parquet 파일에 기록한다.
+시간 구간마다 행 그룹을 나누어 저장하므로 읽을 때 컬럼 선택과 시간 조건이
+파일 단위가 아닌 행 그룹 단위로 적용된다. (pyarrow 필요: pip install duet_monitor[parquet])
+"""
+import os
+import time
+import pandas as pd
+from typing import Dict, Any, Callable, Optional, List
+from ..config.settings import (
+    PARQUET_COMPRESSION, PARQUET_ROW_GROUP_SECONDS, PARQUET_MAX_BUFFER_ROWS
+)
+from .data_processor import flatten_dict
+from .journal import DurabilityWaiters
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    pa = None
+    pq = None
+    PYARROW_AVAILABLE = False
+
+
+class ParquetHandler:
+    FILE_EXTENSION = ".parquet"
+
+    def __init__(self, compression: str = PARQUET_COMPRESSION,
+                 row_group_seconds: int = PARQUET_ROW_GROUP_SECONDS,
+                 max_buffer_rows: int = PARQUET_MAX_BUFFER_ROWS):
+        """
+        Parquet 핸들러 초기화
+
+        Args:
+            compression: 압축 방식 ("zstd", "snappy", "gzip", "none")
+            row_group_seconds: 행 그룹 하나가 담는 시간 구간(초, 데이터 타임스탬프 기준)
+            max_buffer_rows: 메모리에 모아둘 최대 행 수 (넘으면 구간이 끝나지 않아도 기록)
+        """
+        self.compression = compression
+        self.row_group_seconds = row_group_seconds
+        self.max_buffer_rows = max_buffer_rows
+
+        self.file_path: Optional[str] = None
+        self.writer = None
+        self.schema = None
+        self.segment_paths: List[str] = []
+        self._rows: List[Dict[str, Any]] = []
+        self._last_write = 0.0
+        self.rows_written = 0
+        self.row_groups_written = 0
+        self._durable = DurabilityWaiters()  # 디스크 동기화 후 호출할 콜백
+
+    def initialize(self, file_path: str) -> bool:
+        """
+        Parquet 파일 초기화 (스키마는 첫 행 그룹을 기록할 때 결정)
+
+        Args:
+            file_path: Parquet 파일 경로
+
+        Returns:
+            bool: 성공 여부
+        """
+        if not PYARROW_AVAILABLE:
+            print("pyarrow가 설치되어 있지 않아 Parquet 저장을 사용할 수 없습니다.")
+            return False
+        try:
+            self.close()
+            os.makedirs(os.path.dirname(file_path), exist_ok=True)
+            self.file_path = file_path
+            self.schema = None
+            self.segment_paths = [file_path]
+            self._rows = []
+            self._last_write = time.monotonic()
+            self.rows_written = 0
+            self.row_groups_written = 0
+            print(f"Parquet 파일 초기화됨: {file_path}")
+            return True
+
+        except Exception as e:
+            print(f"Parquet 파일 초기화 실패: {e}")
+            return False
+
+    def close(self) -> bool:
+        """
+        남은 행을 기록하고 파일 닫기
+
+        Returns:
+            bool: 성공 여부
+        """
+        try:
+            if self._rows:
+                self._write_buffer(final=True)
+            if self.writer is not None:
+                self.writer.close()
+                if len(self._durable):
+                    # 파일 끝 메타데이터를 쓴 뒤에야 읽을 수 있으므로 닫은 뒤 동기화
+                    fd = os.open(self.file_path, os.O_RDONLY)
+                    try:
+                        os.fsync(fd)
+                    finally:
+                        os.close(fd)
+            self.writer = None
+            self.file_path = None
+            self._durable.notify()
+            return True
+
+        except Exception as e:
+            print(f"Parquet 파일 닫기 실패: {e}")
+            self.writer = None
+            self._durable.discard()
+            return False
+
+    def when_durable(self, callback: Callable[[], Any]) -> bool:
+        """
+        지금까지 추가한 행이 디스크에 동기화되면 callback 호출 (Parquet 는 닫을 때 파일이 완성되므로 닫고 fsync 한 뒤)
+
+        Args:
+            callback: 동기화 후 호출할 함수
+
+        Returns:
+            bool: 등록 여부 (파일이 열려 있지 않으면이면 False)
+        """
+        if self.file_path is None:
+            return False
+        self._durable.add(callback)
+        return True
+
+    def append_data(self, data: Dict[str, Any]) -> bool:
+        """
+        Parquet 파일에 데이터 추가
+
+        Args:
+            data: 추가할 데이터 (pt1/pt2 중첩 딕셔너리는 평탄화됨)
+
+        Returns:
+            bool: 성공 여부
+        """
+        return self.append_batch([data])
+
+    def append_batch(self, data_list: List[Dict[str, Any]]) -> bool:
+        """
+        Parquet 파일에 데이터 배치 추가
+
+        Args:
+            data_list: 추가할 데이터 리스트
+
+        Returns:
+            bool: 성공 여부
+        """
+        if not data_list:
+            return True
+        if self.file_path is None:
+            print("Parquet 파일이 초기화되지 않았습니다.")
+            return False
+        try:
+            self._rows.extend(flatten_dict(data) for data in data_list)
+            if (len(self._rows) >= self.max_buffer_rows or
+                    time.monotonic() - self._last_write >= self.row_group_seconds):
+                self._write_buffer()
+            return True
+
+        except Exception as e:
+            print(f"Parquet 데이터 추가 실패: {e}")
+            return False
+
+    def _to_frame(self, rows: List[Dict[str, Any]]) -> pd.DataFrame:
+        df = pd.DataFrame.from_records(rows)
+        if "timestamp" in df.columns:
+            df["timestamp"] = pd.to_datetime(df["timestamp"], errors="coerce", format="ISO8601")
+        return df
+
+    def _make_schema(self, df: pd.DataFrame):
+        """
+        첫 배치로 스키마 결정
+
+        센서 값은 같은 컬럼에 정수와 실수가 섞여 들어오므로 숫자 컬럼은 모두 float64로 저장한다.
+        """
+        fields = []
+        for column in df.columns:
+            series = df[column]
+            if column == "timestamp":
+                fields.append(pa.field(column, pa.timestamp("us")))
+            elif pd.api.types.is_bool_dtype(series):
+                fields.append(pa.field(column, pa.bool_()))
+            elif pd.api.types.is_numeric_dtype(series):
+                fields.append(pa.field(column, pa.float64()))
+            else:
+                fields.append(pa.field(column, pa.string()))
+        return pa.schema(fields)
+
+    def _open_writer(self, df: pd.DataFrame):
+        """스키마를 정하고 쓰기 시작 (새 컬럼이 생기면 다음 세그먼트 파일로 전환)"""
+        if self.writer is not None:
+            self.writer.close()
+            stem, ext = os.path.splitext(self.segment_paths[0])
+            path = f"{stem}_part{len(self.segment_paths):03d}{ext}"
+            self.segment_paths.append(path)
+            print(f"새 컬럼 발견, Parquet 세그먼트 전환: {path}")
+            columns = list(self.schema.names) + [c for c in df.columns if c not in self.schema.names]
+            self.schema = self._make_schema(df.reindex(columns=columns))
+        else:
+            self.schema = self._make_schema(df)
+        compression = None if self.compression == "none" else self.compression
+        self.writer = pq.ParquetWriter(self.segment_paths[-1], self.schema, compression=compression)
+
+    def _write_table(self, df: pd.DataFrame):
+        """데이터프레임을 행 그룹 하나로 기록"""
+        if self.writer is None or not set(df.columns) <= set(self.schema.names):
+            self._open_writer(df)
+        df = df.reindex(columns=self.schema.names)
+        for field in self.schema:
+            if pa.types.is_floating(field.type):
+                df[field.name] = pd.to_numeric(df[field.name], errors="coerce")
+            elif pa.types.is_string(field.type):
+                df[field.name] = df[field.name].map(lambda v: v if v is None or isinstance(v, str) else str(v))
+        table = pa.Table.from_pandas(df, schema=self.schema, preserve_index=False, safe=False)
+        self.writer.write_table(table, row_group_size=max(1, len(df)))
+        self.rows_written += len(df)
+        self.row_groups_written += 1
+
+    def _write_buffer(self, final: bool = False):
+        """
+        버퍼를 시간 구간별 행 그룹으로 기록
+
+        Args:
+            final: True면 마지막(진행 중인) 구간까지 모두 기록
+        """
+        df = self._to_frame(self._rows)
+        self._rows = []
+        self._last_write = time.monotonic()
+        if "timestamp" not in df.columns or df["timestamp"].isna().all():
+            self._write_table(df)
+            return
+
+        slice_key = df["timestamp"].dt.floor(f"{self.row_group_seconds}s")
+        keys = slice_key.dropna().unique()
+        last_key = keys.max()
+        for key in sorted(keys):
+            part = df[slice_key == key]
+            if key == last_key and not final and len(df) < self.max_buffer_rows:
+                # 진행 중인 구간은 다음 기록 때까지 버퍼에 유지
+                self._rows = part.to_dict("records")
+                continue
+            self._write_table(part)
+        untimed = df[slice_key.isna()]
+        if not untimed.empty:
+            self._write_table(untimed)
+
+    def get_segment_paths(self) -> List[str]:
+        """현재 세션에서 생성된 세그먼트 파일 경로 목록 반환"""
+        return list(self.segment_paths)
+
+    @staticmethod
+    def read(file_path: str, columns: Optional[List[str]] = None,
+             start_time=None, end_time=None) -> Optional[pd.DataFrame]:
+        """
+        Parquet 파일 읽기 (필요한 컬럼과 시간 범위의 행 그룹만 읽음)
+
+        Args:
+            file_path: 읽을 파일 경로
+            columns: 읽을 컬럼 (None이면 전체, timestamp는 항상 포함)
+            start_time: 시작 시간 (None이면 처음부터)
+            end_time: 종료 시간 (None이면 끝까지)
+
+        Returns:
+            Optional[pd.DataFrame]: 읽은 데이터 (실패 시 None)
+        """
+        if not PYARROW_AVAILABLE:
+            print("pyarrow가 설치되어 있지 않아 Parquet 파일을 읽을 수 없습니다.")
+            return None
+        try:
+            filters = []
+            if start_time is not None:
+                filters.append(("timestamp", ">=", pd.Timestamp(start_time)))
+            if end_time is not None:
+                filters.append(("timestamp", "<=", pd.Timestamp(end_time)))
+            if columns is not None and "timestamp" not in columns:
+                columns = ["timestamp"] + list(columns)
+            table = pq.read_table(file_path, columns=columns, filters=filters or None)
+            return table.to_pandas()
+
+        except Exception as e:
+            print(f"Parquet 파일 읽기 실패: {e}")
+            return None
+
+    def save_dataframe(self, df: pd.DataFrame, file_path: str) -> bool:
+        """
+        데이터프레임을 Parquet 파일로 저장 (.csv 경로면 CSV로 저장)
+
+        Args:
+            df: 저장할 데이터프레임
+            file_path: 저장할 파일 경로
+
+        Returns:
+            bool: 성공 여부
+        """
+        try:
+            os.makedirs(os.path.dirname(file_path), exist_ok=True)
+            if file_path.endswith(".csv"):
+                df.to_csv(file_path, index=False, encoding='utf-8')
+            else:
+                compression = None if self.compression == "none" else self.compression
+                df.to_parquet(file_path, index=False, compression=compression)
+            print(f"데이터프레임 저장됨: {file_path}")
+            return True
+
+        except Exception as e:
+            print(f"데이터프레임 저장 실패: {e}")
+            return False
+
+    def load_csv(self, file_path: str) -> Optional[pd.DataFrame]:
+        """
+        파일을 데이터프레임으로 로드 (확장자에 따라 Parquet 또는 CSV)
+
+        Args:
+            file_path: 로드할 파일 경로
+
+        Returns:
+            Optional[pd.DataFrame]: 로드된 데이터프레임 (실패 시 None)
+        """
+        if file_path.endswith(self.FILE_EXTENSION):
+            return self.read(file_path)
+        from .csv_handler import CsvHandler
+        return CsvHandler().load_csv(file_path)
@@ -0,0 +1,219 @@
+"""
+여러 세션 파일 시간 범위 조회 모듈
+
+세션 카탈로그 메타데이터로 시간 범위/장치가 겹치는 파일만 고른 뒤, 파일마다 필요한 컬럼과
+시간 범위만 스레드 풀에서 병렬로 읽는다. 결과는 파일 시작 시간 순 청크 반복자로 받거나
+하나의 데이터프레임으로 합칠 수 있다. 읽지 못한 파일은 건너뛰고 result.errors 에 남긴다.
+
+    result = query_sessions(start_time="2025-05-13", end_time="2025-05-20",
+                            columns=["pt1_pm25_standard"], device_id=817)
+    df = result.to_dataframe(max_rows=1_000_000)
+    if result.errors:
+        print(result.errors)
+"""
+import sqlite3
+import pandas as pd
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional, Iterator, Tuple
+from ..config.settings import DEFAULT_DATA_DIR, QUERY_MAX_WORKERS, LOAD_CACHE_ENABLED
+from .session_catalog import SessionCatalog
+from .csv_loader import StreamingCsvLoader
+from .load_cache import LoadCache
+
+
+def _filter_frame(df: pd.DataFrame, columns: Optional[List[str]], start, end,
+                  device_id) -> pd.DataFrame:
+    """시간/장치 조건으로 행을 거르고 요청한 컬럼만 남김 (없는 컬럼은 결측값)"""
+    mask = pd.Series(True, index=df.index)
+    if "timestamp" in df.columns and (start is not None or end is not None):
+        times = df["timestamp"]
+        if start is not None:
+            mask &= times >= start
+        if end is not None:
+            mask &= times <= end
+    if device_id is not None and "id" in df.columns:
+        mask &= df["id"].astype(str).str.replace(r"\.0$", "", regex=True) == str(device_id)
+    df = df[mask]
+    if columns is not None:
+        df = df.reindex(columns=["timestamp"] + [c for c in columns if c != "timestamp"])
+    return df.reset_index(drop=True)
+
+
+def read_session_file(file_path: str, columns: Optional[List[str]] = None, start_time=None,
+                      end_time=None, device_id=None, available: Optional[List[str]] = None,
+                      cache: Optional[LoadCache] = None) -> pd.DataFrame:
+    """
+    세션 파일 하나에서 필요한 컬럼/행만 읽기 (형식은 확장자로 결정)
+
+    Args:
+        file_path: 세션 파일 경로
+        columns: 읽을 컬럼 (None이면 전체, timestamp는 항상 포함)
+        start_time: 시작 시간 (포함)
+        end_time: 종료 시간 (포함)
+        device_id: 장치 id
+        available: 파일에 있는 컬럼 목록 (카탈로그 메타데이터, 없는 컬럼은 읽지 않음)
+        cache: CSV 로드 캐시
+
+    Returns:
+        pd.DataFrame: 조건에 맞는 행
+    """
+    start = pd.Timestamp(start_time) if start_time is not None else None
+    end = pd.Timestamp(end_time) if end_time is not None else None
+    needed = None
+    if columns is not None:
+        needed = ["timestamp", "id"] + [c for c in columns if c not in ("timestamp", "id")]
+        if available:
+            needed = [c for c in needed if c in available]
+
+    if file_path.endswith(".parquet"):
+        from .parquet_handler import ParquetHandler
+        df = ParquetHandler.read(file_path, needed, start, end)
+        if df is None:
+            raise IOError(f"Parquet 파일을 읽을 수 없습니다: {file_path}")
+    elif file_path.endswith(".dlog"):
+        from .binary_log import BinaryLogReader
+        reader = BinaryLogReader(file_path)
+        names = None if needed is None else [c for c in needed if c in reader.columns]
+        df = reader.to_dataframe(start, end, names)
+    elif file_path.endswith(".db"):
+        from .sqlite_handler import query_database
+        conn = sqlite3.connect(f"file:{file_path}?mode=ro", uri=True)
+        try:
+            names = None if needed is None else [c for c in needed if c not in ("id",)]
+            df = query_database(conn, start, end, device_id, names)
+        finally:
+            conn.close()
+        df = df.rename(columns={"device_id": "id"}) if "id" not in df.columns else df
+    else:
+        frames = [_filter_frame(chunk, None, start, end, device_id)
+                  for chunk in StreamingCsvLoader(file_path, usecols=needed, cache=cache).iter_chunks()]
+        df = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+    return _filter_frame(df, columns, start, end, device_id)
+
+
+class QueryResult:
+    def __init__(self, files: List[Dict[str, Any]], columns: Optional[List[str]], start_time,
+                 end_time, device_id, max_workers: int, cache: Optional[LoadCache]):
+        """
+        조회 결과 (파일 읽기는 iter_chunks / to_dataframe 을 호출할 때 시작)
+
+        Args:
+            files: 읽을 파일의 카탈로그 메타데이터 목록 (시작 시간 순)
+            columns: 읽을 컬럼
+            start_time: 시작 시간
+            end_time: 종료 시간
+            device_id: 장치 id
+            max_workers: 동시에 읽을 파일 수
+            cache: CSV 로드 캐시
+        """
+        self.files = files
+        self.columns = columns
+        self.start_time = start_time
+        self.end_time = end_time
+        self.device_id = device_id
+        self.max_workers = max(1, max_workers)
+        self.cache = cache
+        self.errors: List[Tuple[str, str]] = []  # 읽지 못한 (파일 경로, 오류 메시지)
+        self.truncated = False  # to_dataframe 이 max_rows 에서 잘랐는지 여부
+
+    def get_paths(self) -> List[str]:
+        """읽을 파일 경로 목록 반환"""
+        return [meta["path"] for meta in self.files]
+
+    def _read(self, meta: Dict[str, Any]) -> pd.DataFrame:
+        return read_session_file(meta["path"], self.columns, self.start_time, self.end_time,
+                                 self.device_id, meta.get("columns"), self.cache)
+
+    def iter_chunks(self) -> Iterator[pd.DataFrame]:
+        """
+        파일별 결과를 시작 시간 순으로 반환 (최대 max_workers 개 파일을 미리 읽음)
+
+        읽지 못한 파일은 건너뛰고 (경로, 오류 메시지)를 errors 에 추가한다 (호출할 때마다 초기화).
+
+        Yields:
+            pd.DataFrame: 파일 하나의 조건에 맞는 행 (빈 결과는 건너뜀)
+        """
+        self.errors = []
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            pending = deque()
+            files = iter(self.files)
+            for meta in files:
+                pending.append((meta, executor.submit(self._read, meta)))
+                if len(pending) >= self.max_workers:
+                    break
+            while pending:
+                meta, future = pending.popleft()
+                next_meta = next(files, None)
+                if next_meta is not None:
+                    pending.append((next_meta, executor.submit(self._read, next_meta)))
+                try:
+                    df = future.result()
+                except Exception as e:
+                    print(f"세션 파일 읽기 실패: {meta['path']} - {e}")
+                    self.errors.append((meta["path"], str(e)))
+                    continue
+                if not df.empty:
+                    yield df
+
+    def to_dataframe(self, max_rows: Optional[int] = None) -> pd.DataFrame:
+        """
+        모든 결과를 하나의 데이터프레임으로 합침
+
+        결과 전체를 메모리에 올리므로 긴 기간을 조회할 때는 max_rows 를 주거나 iter_chunks 를 사용한다.
+
+        Args:
+            max_rows: 최대 행 수 (넘으면 앞선 파일부터 이만큼만 담고 truncated 를 True로 설정, None이면 제한 없음)
+
+        Returns:
+            pd.DataFrame: 시간 순으로 정렬된 결과
+        """
+        self.truncated = False
+        frames = []
+        rows = 0
+        for df in self.iter_chunks():
+            if max_rows is not None and rows + len(df) > max_rows:
+                frames.append(df.iloc[:max_rows - rows])
+                self.truncated = True
+                break
+            frames.append(df)
+            rows += len(df)
+        if not frames:
+            return pd.DataFrame(columns=["timestamp"] + [c for c in self.columns or [] if c != "timestamp"])
+        df = pd.concat(frames, ignore_index=True)
+        if "timestamp" in df.columns:
+            df = df.sort_values("timestamp", kind="stable").reset_index(drop=True)
+        return df
+
+
+def query_sessions(start_time=None, end_time=None, columns: Optional[List[str]] = None,
+                   device_id=None, data_dir: str = DEFAULT_DATA_DIR,
+                   catalog: Optional[SessionCatalog] = None, index_missing: bool = False,
+                   max_workers: int = QUERY_MAX_WORKERS) -> QueryResult:
+    """
+    저장된 세션 파일들에서 시간 범위/컬럼/장치 조건으로 조회
+
+    Args:
+        start_time: 시작 시간 (None이면 처음부터)
+        end_time: 종료 시간 (None이면 끝까지, 포함)
+        columns: 읽을 컬럼 (None이면 전체, timestamp는 항상 포함)
+        device_id: 장치 id (None이면 전체)
+        data_dir: 세션 파일 디렉토리
+        catalog: 사용할 세션 카탈로그 (None이면 data_dir 로 새로 읽음)
+        index_missing: True면 메타데이터가 없는 파일을 먼저 색인 (느림)
+        max_workers: 동시에 읽을 파일 수
+
+    Returns:
+        QueryResult: 조회 결과 (읽기는 결과를 꺼낼 때 시작)
+    """
+    if catalog is None:
+        catalog = SessionCatalog(data_dir)
+        catalog.refresh(build_missing=index_missing)
+    files = catalog.find(device_id=device_id, start_time=start_time, end_time=end_time)
+    if columns is not None:
+        # 요청한 컬럼이 하나도 없는 파일은 제외
+        wanted = set(columns) - {"timestamp", "id"}
+        files = [meta for meta in files
+                 if not wanted or not meta.get("columns") or wanted & set(meta["columns"])]
+    cache = LoadCache() if LOAD_CACHE_ENABLED else None
+    return QueryResult(files, columns, start_time, end_time, device_id, max_workers, cache)
@@ -0,0 +1,204 @@
+"""
+증분 이동 집계 모듈
+
+샘플이 추가될 때마다 상태만 갱신하는 이동 평균(SMA), 지수 이동 평균(EWMA),
+이동 중앙값(두 개의 힙 + 지연 삭제)을 제공한다.
+"""
+import math
+import heapq
+import fnmatch
+from collections import deque, defaultdict
+from typing import Dict, Any, List, Optional
+
+
+class RollingMean:
+    """이동 평균 (샘플당 O(1))"""
+
+    def __init__(self, window: int):
+        self.window = window
+        self.values = deque()
+        self.total = 0.0
+
+    def update(self, value: float) -> float:
+        self.values.append(value)
+        self.total += value
+        if len(self.values) > self.window:
+            self.total -= self.values.popleft()
+        return self.total / len(self.values)
+
+    def reset(self):
+        self.values.clear()
+        self.total = 0.0
+
+
+class Ewma:
+    """지수 이동 평균 (샘플당 O(1))"""
+
+    def __init__(self, alpha: float):
+        self.alpha = alpha
+        self.value: Optional[float] = None
+
+    def update(self, value: float) -> float:
+        if self.value is None:
+            self.value = value
+        else:
+            self.value += self.alpha * (value - self.value)
+        return self.value
+
+    def reset(self):
+        self.value = None
+
+
+class RollingMedian:
+    """이동 중앙값 (두 개의 힙 + 지연 삭제, 샘플당 O(log w))"""
+
+    def __init__(self, window: int):
+        self.window = window
+        self.values = deque()
+        self.low: List[float] = []   # 작은 절반 (부호를 바꾼 최대 힙)
+        self.high: List[float] = []  # 큰 절반 (최소 힙)
+        self.low_size = 0
+        self.high_size = 0
+        self.delayed: Dict[float, int] = defaultdict(int)
+
+    def _prune(self, heap: List[float], sign: int):
+        """힙 top에 있는 삭제 예정 값 제거"""
+        while heap:
+            value = sign * heap[0]
+            if self.delayed.get(value, 0) == 0:
+                break
+            self.delayed[value] -= 1
+            if self.delayed[value] == 0:
+                del self.delayed[value]
+            heapq.heappop(heap)
+
+    def _balance(self):
+        """low가 high와 같거나 하나 더 많도록 유지"""
+        if self.low_size > self.high_size + 1:
+            heapq.heappush(self.high, -heapq.heappop(self.low))
+            self.low_size -= 1
+            self.high_size += 1
+            self._prune(self.low, -1)
+        elif self.low_size < self.high_size:
+            heapq.heappush(self.low, -heapq.heappop(self.high))
+            self.high_size -= 1
+            self.low_size += 1
+            self._prune(self.high, 1)
+
+    def _insert(self, value: float):
+        if not self.low or value <= -self.low[0]:
+            heapq.heappush(self.low, -value)
+            self.low_size += 1
+        else:
+            heapq.heappush(self.high, value)
+            self.high_size += 1
+        self._balance()
+
+    def _remove(self, value: float):
+        self.delayed[value] += 1
+        if value <= -self.low[0]:
+            self.low_size -= 1
+            if value == -self.low[0]:
+                self._prune(self.low, -1)
+        else:
+            self.high_size -= 1
+            if self.high and value == self.high[0]:
+                self._prune(self.high, 1)
+        self._balance()
+
+    def _compact(self):
+        """지연 삭제된 값이 힙에 너무 많이 쌓이면 현재 윈도우로 힙을 다시 구성 (분할 상환 O(1))"""
+        ordered = sorted(self.values)
+        half = (len(ordered) + 1) // 2
+        self.low = [-v for v in ordered[:half]]
+        self.high = ordered[half:]
+        heapq.heapify(self.low)
+        heapq.heapify(self.high)
+        self.low_size, self.high_size = len(self.low), len(self.high)
+        self.delayed.clear()
+
+    def median(self) -> float:
+        if self.low_size == 0:
+            return math.nan
+        if self.low_size > self.high_size:
+            return -self.low[0]
+        return (-self.low[0] + self.high[0]) / 2.0
+
+    def update(self, value: float) -> float:
+        self.values.append(value)
+        self._insert(value)
+        if len(self.values) > self.window:
+            self._remove(self.values.popleft())
+            if len(self.low) + len(self.high) > 2 * self.window + 16:
+                self._compact()
+        return self.median()
+
+    def reset(self):
+        self.__init__(self.window)
+
+
+def _create_aggregate(spec: Dict[str, Any]):
+    """설정 항목으로 집계 객체와 가상 컬럼 접미사 생성"""
+    kind = spec["type"]
+    if kind == "sma":
+        return RollingMean(int(spec["window"])), f"sma{spec['window']}"
+    if kind == "ewma":
+        return Ewma(float(spec["alpha"])), "ewma"
+    if kind == "median":
+        return RollingMedian(int(spec["window"])), f"med{spec['window']}"
+    raise ValueError(f"알 수 없는 집계 유형: {kind}")
+
+
+class RollingAggregator:
+    def __init__(self, config: List[Dict[str, Any]]):
+        """
+        컬럼별 이동 집계기 초기화
+
+        Args:
+            config: [{"patterns": [...], "aggregates": [{"type": "sma", "window": 10}, ...]}, ...]
+        """
+        self.config = config
+        self._states: Dict[str, list] = {}  # 컬럼 -> [(접미사, 집계 객체), ...]
+
+    def _states_for(self, column: str) -> list:
+        states = self._states.get(column)
+        if states is None:
+            states = []
+            name = column.lower()
+            for entry in self.config:
+                if any(fnmatch.fnmatchcase(name, pattern) for pattern in entry["patterns"]):
+                    states = [(suffix, agg) for agg, suffix in map(_create_aggregate, entry["aggregates"])]
+                    break
+            self._states[column] = states
+        return states
+
+    def update(self, row: Dict[str, Any], columns: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        행의 값으로 집계 상태를 갱신하고 가상 컬럼을 행에 추가
+
+        Args:
+            row: 평탄화된 샘플 딕셔너리 (제자리에서 수정됨)
+            columns: 집계 대상 컬럼 (None이면 행의 모든 컬럼)
+
+        Returns:
+            Dict[str, Any]: 가상 컬럼이 추가된 행
+        """
+        if not self.config:
+            return row
+        for column in (list(row) if columns is None else columns):
+            value = row.get(column)
+            if not isinstance(value, (int, float)) or isinstance(value, bool):
+                continue
+            if value != value:  # NaN은 상태에 반영하지 않음
+                continue
+            for suffix, aggregate in self._states_for(column):
+                row[f"{column}_{suffix}"] = aggregate.update(float(value))
+        return row
+
+    def get_virtual_columns(self) -> List[str]:
+        """지금까지 만들어진 가상 컬럼 이름 목록 반환"""
+        return [f"{column}_{suffix}" for column, states in self._states.items() for suffix, _ in states]
+
+    def reset(self):
+        """모든 집계 상태 초기화"""
+        self._states.clear()
@@ -0,0 +1,172 @@
+"""
+닫힌 세그먼트 파일 백그라운드 압축 모듈
+
+수집 중에 회전된 CSV 세그먼트를 낮은 우선순위 스레드에서 gzip 또는 zstd로 압축한다.
+압축은 임시 파일에 쓰고 디스크에 동기화한 뒤 이름을 바꾸므로 중간에 종료되어도 원본이 남는다.
+"""
+import os
+import gzip
+import queue
+import shutil
+import threading
+from typing import Callable, Optional
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    zstandard = None
+    ZSTD_AVAILABLE = False
+
+_CHUNK_SIZE = 1024 * 1024
+
+
+class SegmentCompressor:
+    def __init__(self, method: str = "gzip", level: Optional[int] = None,
+                 done_callback: Optional[Callable[[str, str], None]] = None, nice: int = 19):
+        """
+        세그먼트 압축기 초기화
+
+        Args:
+            method: "gzip" 또는 "zstd" (zstandard 패키지가 없으면 gzip 사용)
+            level: 압축 레벨 (None이면 방식별 기본값)
+            done_callback: 압축이 끝나면 (원본 경로, 압축 파일 경로)로 호출
+            nice: 압축 스레드의 nice 값 (Linux에서만 적용)
+        """
+        if method == "zstd" and not ZSTD_AVAILABLE:
+            print("zstandard 패키지가 없어 gzip으로 압축합니다.")
+            method = "gzip"
+        self.method = method
+        self.level = level
+        self.done_callback = done_callback
+        self.nice = nice
+        self._queue: "queue.Queue[Optional[str]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._pending = set()  # 대기 중이거나 압축 중인 파일 경로
+        self.compressed_count = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+
+    def get_extension(self) -> str:
+        """압축 파일 확장자 반환"""
+        return ".zst" if self.method == "zstd" else ".gz"
+
+    def submit(self, file_path: str) -> bool:
+        """
+        압축할 파일 추가 (스레드가 없으면 시작)
+
+        Args:
+            file_path: 닫힌 세그먼트 파일 경로
+
+        Returns:
+            bool: 추가 여부 (이미 대기 중이면 False)
+        """
+        with self._lock:
+            if file_path in self._pending:
+                return False
+            self._pending.add(file_path)
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+        self._queue.put(file_path)
+        return True
+
+    def is_pending(self, file_path: str) -> bool:
+        """파일이 압축 대기 중이거나 압축 중인지 확인"""
+        with self._lock:
+            return file_path in self._pending
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        대기 중인 압축이 모두 끝날 때까지 대기
+
+        Args:
+            timeout: 최대 대기 시간(초, None이면 무제한)
+
+        Returns:
+            bool: 모두 끝났으면 True
+        """
+        with self._lock:
+            thread = self._thread
+        if thread is None:
+            return True
+        self._queue.put(None)
+        thread.join(timeout)
+        return not thread.is_alive()
+
+    def get_pending_count(self) -> int:
+        """압축 대기 중인 파일 수 반환"""
+        return self._queue.qsize()
+
+    def _lower_priority(self):
+        """현재 스레드의 CPU/IO 우선순위를 낮춤 (지원하지 않는 OS에서는 무시)"""
+        try:
+            os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), self.nice)
+        except (AttributeError, OSError):
+            pass
+
+    def _run(self):
+        """압축 스레드"""
+        self._lower_priority()
+        while True:
+            file_path = self._queue.get()
+            if file_path is None:
+                break
+            try:
+                # 이미 압축되어 원본이 없으면 건너뜀
+                if os.path.exists(file_path):
+                    target = self.compress_file(file_path)
+                    if self.done_callback:
+                        self.done_callback(file_path, target)
+            except Exception as e:
+                print(f"세그먼트 압축 실패: {file_path} - {e}")
+            finally:
+                with self._lock:
+                    self._pending.discard(file_path)
+
+    def compress_file(self, file_path: str) -> str:
+        """
+        파일 하나 압축 후 원본 삭제
+
+        Args:
+            file_path: 압축할 파일 경로
+
+        Returns:
+            str: 압축된 파일 경로
+        """
+        target = file_path + self.get_extension()
+        temp = target + ".tmp"
+        with open(file_path, "rb") as src, open(temp, "wb") as raw:
+            if self.method == "zstd":
+                params = {} if self.level is None else {"level": self.level}
+                with zstandard.ZstdCompressor(**params).stream_writer(raw, closefd=False) as dst:
+                    shutil.copyfileobj(src, dst, _CHUNK_SIZE)
+            else:
+                with gzip.GzipFile(fileobj=raw, mode="wb",
+                                   compresslevel=6 if self.level is None else self.level) as dst:
+                    shutil.copyfileobj(src, dst, _CHUNK_SIZE)
+            # 압축 파일이 디스크에 기록된 뒤에만 이름을 바꾸고 원본을 삭제
+            raw.flush()
+            os.fsync(raw.fileno())
+        os.replace(temp, target)
+        _fsync_dir(os.path.dirname(target))
+        self.bytes_in += os.path.getsize(file_path)
+        self.bytes_out += os.path.getsize(target)
+        os.remove(file_path)
+        self.compressed_count += 1
+        return target
+
+
+def _fsync_dir(directory: str):
+    """디렉토리 항목(이름 변경)을 디스크에 동기화 (지원하지 않는 OS에서는 무시)"""
+    try:
+        fd = os.open(directory or ".", os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
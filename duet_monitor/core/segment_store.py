@@ -0,0 +1,272 @@
+"""
+메모리 매핑 세그먼트 저장소 모듈
+
+무제한 기록 모드에서 메모리(핫 윈도우) 밖으로 밀려난 오래된 행을
+고정 크기 컬럼형 세그먼트 파일에 기록하고, 필요할 때 시간 범위로 다시 읽는다.
+"""
+import os
+import json
+import shutil
+import numpy as np
+import pandas as pd
+from typing import Dict, Any, List, Optional, Tuple
+
+# 타임스탬프가 없는 행에 사용하는 값 (NaT와 동일한 int64 표현)
+_NAT_INT = np.iinfo(np.int64).min
+
+
+class _Segment:
+    """단일 세그먼트 (컬럼별 memmap 파일 묶음)"""
+
+    def __init__(self, path: str, columns: List[str], capacity: int,
+                 rows: int = 0, t_min: Optional[int] = None, t_max: Optional[int] = None):
+        self.path = path
+        self.columns = list(columns)
+        self.capacity = capacity
+        self.rows = rows
+        self.t_min = t_min
+        self.t_max = t_max
+        self._maps: Dict[str, np.memmap] = {}
+
+    def _column_file(self, index: int) -> str:
+        return os.path.join(self.path, f"c{index:04d}.f8")
+
+    def _timestamp_file(self) -> str:
+        return os.path.join(self.path, "timestamp.i8")
+
+    def open_for_write(self):
+        """쓰기용 memmap 생성 (파일은 capacity 크기로 미리 할당)"""
+        os.makedirs(self.path, exist_ok=True)
+        self._maps["timestamp"] = np.memmap(self._timestamp_file(), dtype=np.int64,
+                                            mode="w+", shape=(self.capacity,))
+        for i, col in enumerate(self.columns):
+            self._maps[col] = np.memmap(self._column_file(i), dtype=np.float64,
+                                        mode="w+", shape=(self.capacity,))
+        self.write_meta()
+
+    def write(self, timestamps: np.ndarray, values: Dict[str, np.ndarray]) -> int:
+        """
+        세그먼트에 행 기록
+
+        Args:
+            timestamps: int64 나노초 타임스탬프 배열
+            values: 컬럼별 float64 배열
+
+        Returns:
+            int: 실제로 기록된 행 수
+        """
+        count = min(len(timestamps), self.capacity - self.rows)
+        if count <= 0:
+            return 0
+        start, end = self.rows, self.rows + count
+        self._maps["timestamp"][start:end] = timestamps[:count]
+        for col in self.columns:
+            column_values = values.get(col)
+            if column_values is None:
+                self._maps[col][start:end] = np.nan
+            else:
+                self._maps[col][start:end] = column_values[:count]
+        valid = timestamps[:count][timestamps[:count] != _NAT_INT]
+        if len(valid):
+            t_min, t_max = int(valid.min()), int(valid.max())
+            self.t_min = t_min if self.t_min is None else min(self.t_min, t_min)
+            self.t_max = t_max if self.t_max is None else max(self.t_max, t_max)
+        self.rows = end
+        return count
+
+    def is_full(self) -> bool:
+        return self.rows >= self.capacity
+
+    def seal(self):
+        """쓰기 종료: memmap을 디스크에 반영하고 매핑 해제"""
+        for mm in self._maps.values():
+            mm.flush()
+        self._maps.clear()
+        self.write_meta()
+
+    def write_meta(self):
+        meta = {
+            "columns": self.columns,
+            "capacity": self.capacity,
+            "rows": self.rows,
+            "t_min": self.t_min,
+            "t_max": self.t_max,
+        }
+        with open(os.path.join(self.path, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump(meta, f, ensure_ascii=False)
+
+    def overlaps(self, start_ns: Optional[int], end_ns: Optional[int]) -> bool:
+        """시간 범위와 겹치는지 확인 (타임스탬프가 없는 세그먼트는 항상 포함)"""
+        if self.t_min is None or self.t_max is None:
+            return True
+        if start_ns is not None and self.t_max < start_ns:
+            return False
+        if end_ns is not None and self.t_min > end_ns:
+            return False
+        return True
+
+    def read(self, columns: Optional[List[str]] = None, rows: Optional[int] = None) -> pd.DataFrame:
+        """
+        세그먼트 내용을 데이터프레임으로 읽기
+
+        Args:
+            columns: 읽을 컬럼 (None이면 전체)
+            rows: 앞에서부터 읽을 행 수 (None이면 전체, 쓰는 중인 세그먼트의 스냅샷에 사용)
+
+        Returns:
+            pd.DataFrame: 읽은 데이터 (timestamp 컬럼 포함)
+        """
+        wanted = self.columns if columns is None else [c for c in columns if c in self.columns]
+        count = self.rows if rows is None else min(rows, self.rows)
+        out: Dict[str, Any] = {}
+        ts = self._maps.get("timestamp")
+        if ts is None:
+            ts = np.memmap(self._timestamp_file(), dtype=np.int64, mode="r", shape=(self.capacity,))
+        out["timestamp"] = np.array(ts[:count]).view("datetime64[ns]")
+        for col in wanted:
+            mm = self._maps.get(col)
+            if mm is None:
+                mm = np.memmap(self._column_file(self.columns.index(col)), dtype=np.float64,
+                               mode="r", shape=(self.capacity,))
+            out[col] = np.array(mm[:count])
+        return pd.DataFrame(out)
+
+
+class SegmentStore:
+    def __init__(self, base_dir: str, segment_rows: int = 65536):
+        """
+        세그먼트 저장소 초기화
+
+        Args:
+            base_dir: 세그먼트 파일을 저장할 디렉토리
+            segment_rows: 세그먼트당 행 수
+        """
+        self.base_dir = base_dir
+        self.segment_rows = segment_rows
+        self.segments: List[_Segment] = []
+        self.active: Optional[_Segment] = None
+        os.makedirs(base_dir, exist_ok=True)
+
+    def get_row_count(self) -> int:
+        """저장된 전체 행 수 반환"""
+        return sum(seg.rows for seg in self.segments)
+
+    def _new_segment(self, columns: List[str]) -> _Segment:
+        path = os.path.join(self.base_dir, f"seg_{len(self.segments):06d}")
+        segment = _Segment(path, columns, self.segment_rows)
+        segment.open_for_write()
+        self.segments.append(segment)
+        return segment
+
+    def _seal_active(self):
+        if self.active is not None:
+            self.active.seal()
+            self.active = None
+
+    @staticmethod
+    def _to_columns(df: pd.DataFrame):
+        """데이터프레임을 (int64 타임스탬프, 숫자 컬럼 배열) 형태로 변환"""
+        if "timestamp" in df.columns:
+            ts = pd.to_datetime(df["timestamp"], errors="coerce", format="ISO8601")
+            timestamps = ts.to_numpy(dtype="datetime64[ns]").view(np.int64)
+        else:
+            timestamps = np.full(len(df), _NAT_INT, dtype=np.int64)
+        values: Dict[str, np.ndarray] = {}
+        for col in df.columns:
+            if col == "timestamp":
+                continue
+            series = df[col]
+            if pd.api.types.is_bool_dtype(series) or pd.api.types.is_numeric_dtype(series):
+                values[col] = series.to_numpy(dtype=np.float64, na_value=np.nan)
+        return timestamps, values
+
+    def append_frame(self, df: pd.DataFrame) -> bool:
+        """
+        데이터프레임 행을 세그먼트에 추가 (숫자 컬럼만 저장)
+
+        Args:
+            df: 추가할 데이터프레임
+
+        Returns:
+            bool: 성공 여부
+        """
+        if df is None or df.empty:
+            return True
+        try:
+            timestamps, values = self._to_columns(df)
+            columns = list(values.keys())
+            offset = 0
+            while offset < len(timestamps):
+                # 새 컬럼이 나타나면 현재 세그먼트를 닫고 확장된 스키마로 새로 시작
+                if self.active is not None and not set(columns) <= set(self.active.columns):
+                    merged = self.active.columns + [c for c in columns if c not in self.active.columns]
+                    self._seal_active()
+                    self.active = self._new_segment(merged)
+                if self.active is None:
+                    self.active = self._new_segment(columns)
+                written = self.active.write(
+                    timestamps[offset:],
+                    {col: arr[offset:] for col, arr in values.items()}
+                )
+                offset += written
+                if self.active.is_full():
+                    self._seal_active()
+            return True
+        except Exception as e:
+            print(f"세그먼트 저장 실패: {e}")
+            return False
+
+    def read_range(self, start_time=None, end_time=None,
+                   columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        시간 범위에 해당하는 행 읽기
+
+        Args:
+            start_time: 시작 시간 (None이면 처음부터)
+            end_time: 종료 시간 (None이면 끝까지)
+            columns: 읽을 컬럼 (None이면 전체)
+
+        Returns:
+            pd.DataFrame: 범위 내 데이터
+        """
+        start_ns = pd.Timestamp(start_time).value if start_time is not None else None
+        end_ns = pd.Timestamp(end_time).value if end_time is not None else None
+        frames = []
+        for segment in self.segments:
+            if segment.rows == 0 or not segment.overlaps(start_ns, end_ns):
+                continue
+            frame = segment.read(columns)
+            if start_time is not None:
+                frame = frame[frame["timestamp"] >= pd.Timestamp(start_time)]
+            if end_time is not None:
+                frame = frame[frame["timestamp"] <= pd.Timestamp(end_time)]
+            frames.append(frame)
+        if not frames:
+            return pd.DataFrame()
+        return pd.concat(frames, ignore_index=True)
+
+    def snapshot(self) -> List[Tuple[_Segment, int]]:
+        """
+        현재 세그먼트와 행 수 목록 반환 (이후 추가되는 행은 포함하지 않음)
+
+        Returns:
+            List[Tuple[_Segment, int]]: (세그먼트, 행 수) 목록 (시간 순)
+        """
+        return [(segment, segment.rows) for segment in self.segments if segment.rows]
+
+    def close(self):
+        """활성 세그먼트 닫기"""
+        self._seal_active()
+
+    def clear(self):
+        """저장소 비우기 (세그먼트 파일 삭제)"""
+        self._seal_active()
+        self.segments = []
+        shutil.rmtree(self.base_dir, ignore_errors=True)
+        os.makedirs(self.base_dir, exist_ok=True)
+
+    def destroy(self):
+        """저장소 삭제 (세그먼트 디렉토리까지 삭제, 이후 사용 불가)"""
+        self._seal_active()
+        self.segments = []
+        shutil.rmtree(self.base_dir, ignore_errors=True)
@@ -0,0 +1,376 @@
+"""
+세션 카탈로그 모듈
+
+수집 파일마다 옆에 메타데이터 파일(<파일명>.meta.json)을 두고 시간 범위, 행 수, 장치 id,
+컬럼, 컬럼별 최소/최대/평균을 기록한다. CsvHandler 는 기록하면서 통계를 모아 세그먼트를
+닫을 때 메타데이터를 쓰고, SessionCatalog 는 메타데이터만 읽어 "장치 X의 T1~T2 구간을
+담은 파일"을 데이터 파일을 열지 않고 찾는다.
+"""
+import os
+import json
+import glob
+import numpy as np
+import pandas as pd
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Iterable
+from ..config.settings import DEFAULT_DATA_DIR
+
+META_SUFFIX = ".meta.json"
+# 세그먼트 압축 후 바뀌는 확장자
+_COMPRESSED_SUFFIXES = (".gz", ".zst")
+# 메타데이터가 없을 때 색인할 수 있는 데이터 파일 형식
+_DATA_PATTERNS = ("*.csv", "*.csv.gz", "*.csv.zst", "*.parquet", "*.dlog", "*.db")
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float, np.number)) and not isinstance(value, bool) and value == value
+
+
+def _isoformat(value: Any) -> Optional[str]:
+    """시간 값을 ISO 문자열로 변환 (변환할 수 없으면 None)"""
+    if value is None:
+        return None
+    try:
+        value = pd.Timestamp(value)
+    except (ValueError, TypeError):
+        return None
+    return None if pd.isna(value) else value.isoformat()
+
+
+def get_meta_path(file_path: str) -> str:
+    """데이터 파일의 메타데이터 파일 경로 (압축 확장자는 떼고 원래 이름 기준)"""
+    for suffix in _COMPRESSED_SUFFIXES:
+        if file_path.endswith(suffix):
+            file_path = file_path[:-len(suffix)]
+            break
+    return file_path + META_SUFFIX
+
+
+class SessionStats:
+    def __init__(self):
+        """기록 중인 파일의 요약 통계 누적기"""
+        self.rows = 0
+        # 시간 범위 (기록된 값 그대로 보관하고 저장할 때 변환)
+        self.start: Any = None
+        self.end: Any = None
+        self.device_ids = set()
+        self.columns: List[str] = []
+        # 컬럼 → [개수, 합, 최소, 최대]
+        self.column_stats: Dict[str, List[float]] = {}
+
+    def _add_columns(self, columns: Iterable[str]):
+        for column in columns:
+            if column not in self.column_stats and column not in self.columns:
+                self.columns.append(column)
+
+    def _add_times(self, times: pd.Series):
+        times = times.dropna()
+        if times.empty:
+            return
+        self._add_time_range(times.min(), times.max())
+
+    def _add_time_range(self, first: Any, last: Any):
+        """형식이 같은 값끼리 비교 (형식이 섞이면 Timestamp 로 변환해 비교)"""
+        try:
+            self.start = first if self.start is None else min(self.start, first)
+            self.end = last if self.end is None else max(self.end, last)
+        except TypeError:
+            self.start = min(pd.Timestamp(self.start), pd.Timestamp(first))
+            self.end = max(pd.Timestamp(self.end), pd.Timestamp(last))
+
+    def _add_numbers(self, column: str, count: int, total: float, low: float, high: float):
+        if not count:
+            return
+        stats = self.column_stats.get(column)
+        if stats is None:
+            self.column_stats[column] = [count, total, low, high]
+        else:
+            stats[0] += count
+            stats[1] += total
+            stats[2] = min(stats[2], low)
+            stats[3] = max(stats[3], high)
+
+    def update_rows(self, rows: List[List[Any]], columns: List[str]):
+        """
+        같은 스키마의 행 묶음 반영 (CsvHandler 가 기록하는 행 목록 그대로)
+
+        Args:
+            rows: 컬럼 순서에 맞춘 값 리스트의 리스트
+            columns: 컬럼 목록
+        """
+        if not rows:
+            return
+        self.rows += len(rows)
+        self._add_columns(columns)
+        for column, values in zip(columns, zip(*rows)):
+            if column == "timestamp":
+                # 같은 형식(datetime 또는 ISO 문자열)이면 변환 없이 비교하고 양 끝만 보관
+                times = [v for v in values if v != "" and v is not None]
+                if not times:
+                    continue
+                try:
+                    self._add_time_range(min(times), max(times))
+                except TypeError:
+                    self._add_times(pd.to_datetime(pd.Series(times, dtype=object), errors="coerce"))
+            elif column == "id":
+                self.device_ids.update(values)
+                self.device_ids.discard("")
+                self.device_ids.discard(None)
+            else:
+                try:
+                    # 대부분은 모두 숫자인 컬럼이므로 먼저 바로 계산
+                    total = sum(values)
+                    numbers = values
+                    if total != total or isinstance(total, bool):
+                        raise TypeError
+                except TypeError:
+                    numbers = [v for v in values if _is_number(v)]
+                    if not numbers:
+                        continue
+                    total = sum(numbers)
+                self._add_numbers(column, len(numbers), float(total),
+                                  float(min(numbers)), float(max(numbers)))
+
+    def update_frame(self, df: pd.DataFrame):
+        """
+        데이터프레임 반영 (기존 파일 색인용)
+
+        Args:
+            df: 읽은 청크
+        """
+        if df.empty:
+            return
+        self.rows += len(df)
+        self._add_columns(df.columns)
+        for column in df.columns:
+            values = df[column]
+            if column == "timestamp":
+                self._add_times(pd.to_datetime(values, errors="coerce"))
+            elif column == "id":
+                self.device_ids.update(values.dropna().tolist())
+            elif pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(values):
+                values = values.dropna()
+                if len(values):
+                    self._add_numbers(column, len(values), float(values.sum()),
+                                      float(values.min()), float(values.max()))
+
+    def to_dict(self, file_path: str) -> Dict[str, Any]:
+        """
+        메타데이터 딕셔너리 생성
+
+        Args:
+            file_path: 데이터 파일 경로
+
+        Returns:
+            Dict[str, Any]: 메타데이터
+        """
+        device_ids = []
+        for value in self.device_ids:
+            try:
+                device_ids.append(int(value))
+            except (ValueError, TypeError):
+                device_ids.append(str(value))
+        return {
+            "file": os.path.basename(file_path),
+            "rows": self.rows,
+            "start": _isoformat(self.start),
+            "end": _isoformat(self.end),
+            "device_ids": sorted(set(device_ids), key=str),
+            "columns": list(self.columns),
+            "stats": {
+                column: {"count": int(c), "min": low, "max": high, "mean": total / c}
+                for column, (c, total, low, high) in self.column_stats.items()
+            },
+            "updated": datetime.now().isoformat(),
+        }
+
+
+def write_meta(file_path: str, stats: SessionStats) -> Optional[str]:
+    """
+    메타데이터 파일 저장 (임시 파일에 쓴 뒤 교체)
+
+    Args:
+        file_path: 데이터 파일 경로
+        stats: 누적된 통계
+
+    Returns:
+        Optional[str]: 메타데이터 파일 경로 (실패 시 None)
+    """
+    meta_path = get_meta_path(file_path)
+    try:
+        temp = meta_path + ".tmp"
+        with open(temp, "w", encoding="utf-8") as f:
+            json.dump(stats.to_dict(file_path), f, ensure_ascii=False, indent=2)
+        os.replace(temp, meta_path)
+        return meta_path
+    except Exception as e:
+        print(f"메타데이터 저장 실패: {e}")
+        return None
+
+
+def read_meta(file_path: str) -> Optional[Dict[str, Any]]:
+    """
+    데이터 파일의 메타데이터 읽기
+
+    Args:
+        file_path: 데이터 파일 경로
+
+    Returns:
+        Optional[Dict[str, Any]]: 메타데이터 (없거나 읽을 수 없으면 None)
+    """
+    meta_path = get_meta_path(file_path)
+    if not os.path.exists(meta_path):
+        return None
+    try:
+        with open(meta_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except Exception as e:
+        print(f"메타데이터 읽기 실패: {meta_path} - {e}")
+        return None
+
+
+def _iter_frames(file_path: str):
+    """색인용으로 데이터 파일을 청크 단위로 읽기 (형식별)"""
+    if file_path.endswith(".parquet"):
+        from .parquet_handler import ParquetHandler
+        df = ParquetHandler.read(file_path)
+        if df is not None:
+            yield df
+    elif file_path.endswith(".dlog"):
+        from .binary_log import BinaryLogReader
+        yield BinaryLogReader(file_path).to_dataframe()
+    elif file_path.endswith(".db"):
+        from .sqlite_handler import SqliteHandler
+        df = SqliteHandler().load_csv(file_path)
+        if df is not None:
+            yield df.rename(columns={"device_id": "id"}) if "id" not in df.columns else df
+    else:
+        from .csv_loader import StreamingCsvLoader
+        yield from StreamingCsvLoader(file_path).iter_chunks()
+
+
+def index_file(file_path: str) -> Optional[Dict[str, Any]]:
+    """
+    메타데이터가 없는 파일을 한 번 읽어 메타데이터 생성
+
+    Args:
+        file_path: 데이터 파일 경로
+
+    Returns:
+        Optional[Dict[str, Any]]: 생성된 메타데이터 (실패 시 None)
+    """
+    try:
+        stats = SessionStats()
+        for chunk in _iter_frames(file_path):
+            stats.update_frame(chunk)
+        if write_meta(file_path, stats) is None:
+            return None
+        return read_meta(file_path)
+    except Exception as e:
+        print(f"파일 색인 실패: {file_path} - {e}")
+        return None
+
+
+class SessionCatalog:
+    def __init__(self, data_dir: str = DEFAULT_DATA_DIR):
+        """
+        세션 카탈로그 초기화
+
+        Args:
+            data_dir: 수집 파일 디렉토리
+        """
+        self.data_dir = data_dir
+        self.entries: Dict[str, Dict[str, Any]] = {}
+
+    def _resolve(self, meta_path: str) -> Optional[str]:
+        """메타데이터에 해당하는 실제 데이터 파일 경로 (압축되었으면 압축 파일)"""
+        path = meta_path[:-len(META_SUFFIX)]
+        if os.path.exists(path):
+            return path
+        for suffix in _COMPRESSED_SUFFIXES:
+            if os.path.exists(path + suffix):
+                return path + suffix
+        return None
+
+    def refresh(self, build_missing: bool = False) -> int:
+        """
+        메타데이터 파일 다시 읽기
+
+        Args:
+            build_missing: True면 메타데이터가 없는 데이터 파일을 읽어 새로 만듦 (느림)
+
+        Returns:
+            int: 카탈로그 항목 수
+        """
+        self.entries = {}
+        if build_missing:
+            for pattern in _DATA_PATTERNS:
+                for path in glob.glob(os.path.join(self.data_dir, pattern)):
+                    if not os.path.exists(get_meta_path(path)):
+                        index_file(path)
+        for meta_path in glob.glob(os.path.join(self.data_dir, "*" + META_SUFFIX)):
+            path = self._resolve(meta_path)
+            if path is None:
+                continue
+            try:
+                with open(meta_path, "r", encoding="utf-8") as f:
+                    meta = json.load(f)
+            except Exception as e:
+                print(f"메타데이터 읽기 실패: {meta_path} - {e}")
+                continue
+            meta["path"] = path
+            self.entries[path] = meta
+        return len(self.entries)
+
+    def get(self, file_path: str) -> Optional[Dict[str, Any]]:
+        """
+        파일 하나의 메타데이터 반환
+
+        Args:
+            file_path: 데이터 파일 경로
+
+        Returns:
+            Optional[Dict[str, Any]]: 메타데이터 (없으면 None)
+        """
+        if file_path in self.entries:
+            return self.entries[file_path]
+        meta = read_meta(file_path)
+        if meta is not None:
+            meta["path"] = file_path
+        return meta
+
+    def find(self, device_id: Optional[Any] = None, start_time=None, end_time=None,
+             columns: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """
+        조건에 맞는 파일 찾기 (메타데이터만 사용)
+
+        Args:
+            device_id: 장치 id (None이면 전체)
+            start_time: 구간 시작 (None이면 처음부터)
+            end_time: 구간 끝 (None이면 끝까지)
+            columns: 모두 포함해야 하는 컬럼
+
+        Returns:
+            List[Dict[str, Any]]: 시작 시간 순 메타데이터 목록 ("path"에 파일 경로)
+        """
+        if not self.entries:
+            self.refresh()
+        start = pd.Timestamp(start_time) if start_time is not None else None
+        end = pd.Timestamp(end_time) if end_time is not None else None
+        matches = []
+        for meta in self.entries.values():
+            if not meta.get("rows"):
+                continue
+            if device_id is not None and meta.get("device_ids") and \
+                    str(device_id) not in {str(d) for d in meta["device_ids"]}:
+                continue
+            if columns and not set(columns) <= set(meta.get("columns", [])):
+                continue
+            if meta.get("start") and meta.get("end"):
+                if end is not None and pd.Timestamp(meta["start"]) > end:
+                    continue
+                if start is not None and pd.Timestamp(meta["end"]) < start:
+                    continue
+            matches.append(meta)
+        matches.sort(key=lambda m: m.get("start") or "")
+        return matches
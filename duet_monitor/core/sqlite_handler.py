@@ -0,0 +1,378 @@
+"""
+SQLite 저장 모듈
+
+CsvHandler 와 같은 인터페이스로 수신 데이터를 내장 SQLite 데이터베이스에 저장한다.
+WAL 모드, 커밋 구간별 executemany 일괄 삽입, (device_id, timestamp) 색인을 사용하며
+새 컬럼이 나타나면 ALTER TABLE 로 스키마를 확장한다. 시간 범위 조회는 색인을 타므로
+파일 전체를 읽지 않는다.
+"""
+import os
+import time
+import numbers
+import sqlite3
+import threading
+import pandas as pd
+from datetime import datetime
+from typing import Dict, Any, Callable, List, Optional
+from ..config.settings import SQLITE_COMMIT_ROWS, SQLITE_COMMIT_INTERVAL_MS
+from .data_processor import flatten_dict
+from .journal import DurabilityWaiters
+
+TABLE_NAME = "samples"
+# 타임스탬프 저장 형식 (고정 길이라 문자열 비교 = 시간 비교)
+TIMESTAMP_FORMAT = "%Y-%m-%dT%H:%M:%S.%f"
+
+
+def _quote(name: str) -> str:
+    """SQL 식별자 인용"""
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _format_timestamp(value: Any) -> Optional[str]:
+    """타임스탬프 값을 고정 형식 문자열로 변환"""
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value.strftime(TIMESTAMP_FORMAT)
+    try:
+        return pd.Timestamp(value).strftime(TIMESTAMP_FORMAT)
+    except (ValueError, TypeError):
+        return str(value)
+
+
+class SqliteHandler:
+    FILE_EXTENSION = ".db"
+
+    def __init__(self, commit_rows: int = SQLITE_COMMIT_ROWS,
+                 commit_interval_ms: int = SQLITE_COMMIT_INTERVAL_MS):
+        """
+        SQLite 핸들러 초기화
+
+        Args:
+            commit_rows: 이 행 수가 쌓이면 커밋
+            commit_interval_ms: 마지막 커밋 후 이 시간이 지나면 커밋
+        """
+        self.commit_rows = max(1, commit_rows)
+        self.commit_interval = commit_interval_ms / 1000.0
+        self.file_path: Optional[str] = None
+        self.conn: Optional[sqlite3.Connection] = None
+        self.columns: List[str] = []
+        self._insert_sql = ""
+        self._rows: List[Dict[str, Any]] = []
+        self._last_commit = 0.0
+        self._lock = threading.Lock()
+        self.rows_written = 0
+        self.commit_count = 0
+        self.dropped_rows = 0  # 닫을 때까지 커밋하지 못한 행 수
+        self._durable = DurabilityWaiters()  # 디스크 동기화 후 호출할 콜백
+        self._sync_full = False  # 동기화 콜백을 쓰면 커밋마다 WAL 을 fsync (synchronous=FULL)
+
+    def initialize(self, file_path: str) -> bool:
+        """
+        데이터베이스 열기 (없으면 생성, 있으면 이어서 기록)
+
+        Args:
+            file_path: 데이터베이스 파일 경로
+
+        Returns:
+            bool: 성공 여부
+        """
+        try:
+            self.close()
+            os.makedirs(os.path.dirname(file_path), exist_ok=True)
+            self.file_path = file_path
+            self.conn = sqlite3.connect(file_path, check_same_thread=False)
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("PRAGMA synchronous=NORMAL")
+            self.conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {TABLE_NAME} "
+                "(device_id INTEGER, timestamp TEXT)")
+            self.conn.execute(
+                f"CREATE INDEX IF NOT EXISTS idx_{TABLE_NAME}_device_time "
+                f"ON {TABLE_NAME} (device_id, timestamp)")
+            self.conn.execute(
+                f"CREATE INDEX IF NOT EXISTS idx_{TABLE_NAME}_time ON {TABLE_NAME} (timestamp)")
+            self.conn.commit()
+            self.columns = self._read_columns()
+            self._prepare_insert()
+            self._rows = []
+            self._sync_full = False
+            self._last_commit = time.monotonic()
+            print(f"SQLite 데이터베이스 초기화됨: {file_path}")
+            return True
+
+        except Exception as e:
+            print(f"SQLite 데이터베이스 초기화 실패: {e}")
+            self.conn = None
+            return False
+
+    def _read_columns(self) -> List[str]:
+        return [row[1] for row in self.conn.execute(f"PRAGMA table_info({TABLE_NAME})")]
+
+    def _prepare_insert(self):
+        """현재 컬럼 목록으로 INSERT 문 준비 (executemany 에서 재사용)"""
+        names = ", ".join(_quote(c) for c in self.columns)
+        marks = ", ".join("?" for _ in self.columns)
+        self._insert_sql = f"INSERT INTO {TABLE_NAME} ({names}) VALUES ({marks})"
+
+    def _migrate(self, rows: List[Dict[str, Any]]):
+        """새 컬럼이 있으면 ALTER TABLE 로 추가 (None이 아닌 첫 값이 숫자면 REAL, 그 외는 TEXT, 값이 없으면 REAL)"""
+        known = set(self.columns)
+        added: Dict[str, Optional[str]] = {}
+        for row in rows:
+            for key, value in row.items():
+                if key in known or added.get(key) is not None:
+                    continue
+                if value is None:
+                    added.setdefault(key, None)
+                else:
+                    # numpy 스칼라도 숫자로 취급 (bool 은 제외)
+                    is_number = isinstance(value, numbers.Real) and not isinstance(value, bool)
+                    added[key] = "REAL" if is_number else "TEXT"
+        added = {column: sql_type or "REAL" for column, sql_type in added.items()}
+        for column, sql_type in added.items():
+            self.conn.execute(f"ALTER TABLE {TABLE_NAME} ADD COLUMN {_quote(column)} {sql_type}")
+            self.columns.append(column)
+        if added:
+            self._prepare_insert()
+            print(f"SQLite 컬럼 추가: {list(added)}")
+
+    def close(self) -> bool:
+        """
+        남은 행을 커밋하고 데이터베이스 닫기
+
+        Returns:
+            bool: 성공 여부
+        """
+        if self.conn is None:
+            return True
+        try:
+            self.flush()
+            with self._lock:
+                dropped = len(self._rows)
+                if dropped:
+                    print(f"SQLite 커밋하지 못한 행 {dropped}개를 버립니다.")
+                    self.dropped_rows += dropped
+                    self._rows = []
+            self.conn.close()
+            self.conn = None
+            # 마지막 연결을 닫으면 WAL 이 데이터베이스에 반영되고 동기화됨
+            if not dropped:
+                self._durable.notify()
+            return True
+
+        except Exception as e:
+            print(f"SQLite 데이터베이스 닫기 실패: {e}")
+            self._durable.discard()
+            return False
+
+    def get_segment_paths(self) -> List[str]:
+        """
+        기록 중인 파일 목록 반환 (SQLite 는 파일 하나에 이어서 기록)
+
+        Returns:
+            List[str]: 데이터베이스 파일 경로 목록
+        """
+        return [self.file_path] if self.file_path else []
+
+    def append_data(self, data: Dict[str, Any]) -> bool:
+        """
+        데이터베이스에 데이터 추가
+
+        Args:
+            data: 추가할 데이터 (pt1/pt2 중첩 딕셔너리는 평탄화됨)
+
+        Returns:
+            bool: 성공 여부
+        """
+        return self.append_batch([data])
+
+    def append_batch(self, data_list: List[Dict[str, Any]]) -> bool:
+        """
+        데이터베이스에 데이터 배치 추가 (커밋 구간 단위로 일괄 삽입)
+
+        Args:
+            data_list: 추가할 데이터 리스트
+
+        Returns:
+            bool: 성공 여부
+        """
+        if not data_list:
+            return True
+        if self.conn is None:
+            print("SQLite 데이터베이스가 초기화되지 않았습니다.")
+            return False
+        try:
+            rows = []
+            for data in data_list:
+                row = flatten_dict(data)
+                row["device_id"] = row.get("id")
+                row["timestamp"] = _format_timestamp(row.get("timestamp"))
+                rows.append(row)
+            # flush() 가 목록을 교체하는 것과 겹치지 않도록 잠금 안에서 추가
+            with self._lock:
+                self._rows.extend(rows)
+                due = (len(self._rows) >= self.commit_rows or
+                       time.monotonic() - self._last_commit >= self.commit_interval)
+            if due:
+                return self.flush()
+            return True
+
+        except Exception as e:
+            print(f"SQLite 데이터 추가 실패: {e}")
+            return False
+
+    def when_durable(self, callback: Callable[[], Any]) -> bool:
+        """
+        지금까지 추가한 행이 디스크에 동기화되면 callback 호출 (모아둔 행이 synchronous=FULL 로 커밋된 뒤)
+
+        Args:
+            callback: 동기화 후 호출할 함수
+
+        Returns:
+            bool: 등록 여부 (데이터베이스가 열려 있지 않으면이면 False)
+        """
+        if self.conn is None:
+            return False
+        with self._lock:
+            if not self._sync_full:
+                # 이후 커밋은 WAL 을 fsync 하므로 이전에 NORMAL 로 커밋한 행도 함께 동기화됨
+                self.conn.execute("PRAGMA synchronous=FULL")
+                self._sync_full = True
+            self._durable.add(callback)
+        return True
+
+    def flush(self) -> bool:
+        """
+        모아둔 행을 한 트랜잭션으로 삽입 후 커밋
+
+        Returns:
+            bool: 성공 여부
+        """
+        if self.conn is None:
+            return False
+        with self._lock:
+            rows, self._rows = self._rows, []
+            self._last_commit = time.monotonic()
+            if not rows:
+                return True
+            try:
+                self._migrate(rows)
+                columns = self.columns
+                values = [tuple(_sql_value(row.get(c)) for c in columns) for row in rows]
+                with self.conn:
+                    self.conn.executemany(self._insert_sql, values)
+                self.rows_written += len(rows)
+                self.commit_count += 1
+                self._durable.notify()
+                return True
+
+            except Exception as e:
+                # 트랜잭션은 롤백되므로 행을 되돌려 다음 커밋에서 다시 시도
+                print(f"SQLite 커밋 실패 (다음 커밋에서 재시도): {e}")
+                self._rows[:0] = rows
+                return False
+
+    def query(self, start_time=None, end_time=None, device_id: Optional[int] = None,
+              columns: Optional[List[str]] = None) -> Optional[pd.DataFrame]:
+        """
+        시간 범위 조회 (아직 커밋되지 않은 행은 먼저 커밋, 색인 사용)
+
+        Args:
+            start_time: 시작 시간 (None이면 처음부터)
+            end_time: 종료 시간 (None이면 끝까지, 포함)
+            device_id: 장치 id (None이면 전체)
+            columns: 조회할 컬럼 (None이면 전체, timestamp/device_id는 항상 포함)
+
+        Returns:
+            Optional[pd.DataFrame]: 조회 결과 (실패 시 None)
+        """
+        if self.conn is None:
+            return None
+        self.flush()
+        return query_database(self.conn, start_time, end_time, device_id, columns)
+
+    def save_dataframe(self, df: pd.DataFrame, file_path: str) -> bool:
+        """
+        데이터프레임을 CSV 파일로 저장
+
+        Args:
+            df: 저장할 데이터프레임
+            file_path: 저장할 파일 경로
+
+        Returns:
+            bool: 성공 여부
+        """
+        from .csv_handler import CsvHandler
+        return CsvHandler().save_dataframe(df, file_path)
+
+    def load_csv(self, file_path: str) -> Optional[pd.DataFrame]:
+        """
+        파일을 데이터프레임으로 로드 (.db 면 전체 조회, 그 외는 CSV)
+
+        Args:
+            file_path: 로드할 파일 경로
+
+        Returns:
+            Optional[pd.DataFrame]: 로드된 데이터프레임 (실패 시 None)
+        """
+        if not file_path.endswith(self.FILE_EXTENSION):
+            from .csv_handler import CsvHandler
+            return CsvHandler().load_csv(file_path)
+        try:
+            conn = sqlite3.connect(f"file:{file_path}?mode=ro", uri=True)
+            try:
+                return query_database(conn)
+            finally:
+                conn.close()
+        except Exception as e:
+            print(f"SQLite 데이터베이스 로드 실패: {e}")
+            return None
+
+
+def _sql_value(value: Any) -> Any:
+    """SQLite 가 저장할 수 있는 값으로 변환"""
+    if value is None or isinstance(value, (int, float, str, bytes)):
+        return value
+    return str(value)
+
+
+def query_database(conn: sqlite3.Connection, start_time=None, end_time=None,
+                   device_id: Optional[int] = None,
+                   columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    샘플 테이블 시간 범위 조회
+
+    Args:
+        conn: SQLite 연결
+        start_time: 시작 시간
+        end_time: 종료 시간 (포함)
+        device_id: 장치 id
+        columns: 조회할 컬럼
+
+    Returns:
+        pd.DataFrame: 조회 결과 (timestamp는 datetime으로 변환)
+    """
+    if columns is None:
+        select = "*"
+    else:
+        wanted = ["device_id", "timestamp"] + [c for c in columns if c not in ("device_id", "timestamp")]
+        select = ", ".join(_quote(c) for c in wanted)
+    conditions, params = [], []
+    if device_id is not None:
+        conditions.append("device_id = ?")
+        params.append(device_id)
+    if start_time is not None:
+        conditions.append("timestamp >= ?")
+        params.append(_format_timestamp(start_time))
+    if end_time is not None:
+        conditions.append("timestamp <= ?")
+        params.append(_format_timestamp(end_time))
+    sql = f"SELECT {select} FROM {TABLE_NAME}"
+    if conditions:
+        sql += " WHERE " + " AND ".join(conditions)
+    sql += " ORDER BY timestamp"
+    df = pd.read_sql_query(sql, conn, params=params)
+    if "timestamp" in df.columns:
+        df["timestamp"] = pd.to_datetime(df["timestamp"], format=TIMESTAMP_FORMAT, errors="coerce")
+    return df
@@ -0,0 +1,163 @@
+"""
+센서 상태 판정 모듈
+
+설정의 규칙 표(SENSOR_STATE_RULES)를 스키마(컬럼 목록)마다 한 번 구간 경계로
+컴파일해 두고, 현재 값 전체를 np.digitize 한 번으로 분류한다.
+경계값이 위 구간에 속하는 경계("inclusive": "upper")는 정규화한 경계를 한 ulp 낮춰 둔다.
+"""
+import fnmatch
+import numpy as np
+from typing import Dict, Any, List, Optional, Sequence, Tuple
+from ..config.settings import (
+    SENSOR_STATE_RULES, SENSOR_STATE_DEFAULT, SENSOR_STATE_COLORS, SENSOR_ALARM_LEVELS
+)
+
+# 상태 코드 (0은 값이 없거나 숫자가 아님)
+STATE_LEVELS: List[str] = ["unknown", "low", "normal", "warning", "critical"]
+
+
+class _CompiledSchema:
+    """컬럼 목록 하나에 대해 컴파일된 구간 표"""
+
+    def __init__(self, columns: Tuple[str, ...], rules: List[Dict[str, Any]], default_level: str):
+        self.columns = columns
+        n = len(columns)
+        self.offsets = np.zeros(n, dtype=np.float64)   # 컬럼별 정규화 하한
+        self.scales = np.ones(n, dtype=np.float64)     # 컬럼별 정규화 폭
+        self.lows = np.zeros(n, dtype=np.float64)
+        self.highs = np.zeros(n, dtype=np.float64)
+        all_edges: List[float] = []
+        codes: List[int] = []
+        default_code = STATE_LEVELS.index(default_level)
+
+        for i, column in enumerate(columns):
+            rule = _match_rule(column, rules)
+            edges = [float(e) for e in rule["edges"]] if rule else []
+            levels = [STATE_LEVELS.index(l) for l in rule["levels"]] if rule else [default_code]
+            inclusive = rule.get("inclusive", ["lower"] * len(edges)) if rule else []
+            if len(inclusive) != len(edges):
+                raise ValueError(f"{column}: inclusive 개수가 edges 와 다릅니다")
+            lo = (min(edges) if edges else 0.0) - 1.0
+            hi = (max(edges) if edges else 0.0) + 1.0
+            self.lows[i], self.highs[i] = lo, hi
+            self.offsets[i], self.scales[i] = lo, hi - lo
+            # 컬럼 i의 값과 경계를 [2i, 2i+1] 구간으로 옮겨 하나의 경계 배열로 합침
+            # (classify 와 같은 순서로 계산해야 경계값이 정확히 같은 위치로 옮겨짐)
+            mapped = float(2 * i) + (np.array(edges, dtype=np.float64) - lo) / (hi - lo)
+            upper = np.array([side == "upper" for side in inclusive], dtype=bool)
+            mapped[upper] = np.nextafter(mapped[upper], -np.inf)
+            all_edges.extend(mapped)
+            # 다음 컬럼과 구간 번호가 겹치지 않도록 구분 경계 추가
+            all_edges.append(2 * i + 1.5)
+            codes.extend(levels)
+
+        self.edges = np.array(all_edges, dtype=np.float64)
+        self.codes = np.array(codes, dtype=np.int8)
+        self.positions = 2.0 * np.arange(n)
+
+    def classify(self, values: np.ndarray) -> np.ndarray:
+        """
+        값 배열 분류
+
+        Args:
+            values: 컬럼 순서의 float 배열 (NaN은 unknown)
+
+        Returns:
+            np.ndarray: 상태 코드 배열
+        """
+        missing = np.isnan(values)
+        clipped = np.clip(np.where(missing, self.lows, values), self.lows, self.highs)
+        mapped = self.positions + (clipped - self.offsets) / self.scales
+        result = self.codes[np.digitize(mapped, self.edges, right=True)]
+        result[missing] = 0
+        return result
+
+
+def _match_rule(column: str, rules: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """컬럼 이름에 해당하는 첫 번째 규칙 반환"""
+    name = column.lower()
+    for rule in rules:
+        if any(fnmatch.fnmatchcase(name, pattern) for pattern in rule["patterns"]):
+            return rule
+    return None
+
+
+class SensorStateClassifier:
+    def __init__(self, rules: Optional[List[Dict[str, Any]]] = None,
+                 default_level: str = SENSOR_STATE_DEFAULT):
+        """
+        센서 상태 분류기 초기화
+
+        Args:
+            rules: 판정 규칙 표 (None이면 설정값 사용)
+            default_level: 규칙이 없는 숫자 센서의 상태
+        """
+        self.rules = SENSOR_STATE_RULES if rules is None else rules
+        self.default_level = default_level
+        self._compiled: Dict[Tuple[str, ...], _CompiledSchema] = {}
+
+    def compile(self, columns: Sequence[str]) -> _CompiledSchema:
+        """
+        컬럼 목록에 대한 구간 표 반환 (스키마마다 한 번만 컴파일)
+
+        Args:
+            columns: 컬럼 이름 목록
+
+        Returns:
+            _CompiledSchema: 컴파일된 구간 표
+        """
+        key = tuple(columns)
+        schema = self._compiled.get(key)
+        if schema is None:
+            schema = _CompiledSchema(key, self.rules, self.default_level)
+            self._compiled[key] = schema
+        return schema
+
+    def classify_array(self, columns: Sequence[str], values: np.ndarray) -> np.ndarray:
+        """
+        컬럼 순서의 값 배열을 상태 코드 배열로 분류
+
+        Args:
+            columns: 컬럼 이름 목록
+            values: 값 배열
+
+        Returns:
+            np.ndarray: 상태 코드 배열 (STATE_LEVELS 인덱스)
+        """
+        return self.compile(columns).classify(np.asarray(values, dtype=np.float64))
+
+    def classify(self, values: Dict[str, Any]) -> Dict[str, str]:
+        """
+        현재 값 딕셔너리의 숫자 센서 상태 판정
+
+        Args:
+            values: 센서 값 딕셔너리
+
+        Returns:
+            Dict[str, str]: 센서별 상태 이름
+        """
+        columns = [
+            k for k, v in values.items()
+            if isinstance(v, (int, float, np.number)) and not isinstance(v, (bool, np.bool_))
+        ]
+        if not columns:
+            return {}
+        codes = self.classify_array(columns, [values[c] for c in columns])
+        return {column: STATE_LEVELS[code] for column, code in zip(columns, codes)}
+
+    def get_alarms(self, states: Dict[str, str]) -> List[str]:
+        """
+        경보 상태인 센서 목록 반환
+
+        Args:
+            states: classify() 결과
+
+        Returns:
+            List[str]: 경보 센서 이름 목록
+        """
+        return [column for column, state in states.items() if state in SENSOR_ALARM_LEVELS]
+
+    @staticmethod
+    def get_color(state: str) -> str:
+        """상태에 해당하는 LED 색상 반환"""
+        return SENSOR_STATE_COLORS.get(state, SENSOR_STATE_COLORS["unknown"])
@@ -0,0 +1,35 @@
+"""
+수집 파일 저장 핸들러 선택 모듈
+"""
+from typing import Optional
+from ..config.settings import CSV_ASYNC_WRITE, STORAGE_FORMAT
+from .csv_handler import CsvHandler
+from .parquet_handler import ParquetHandler, PYARROW_AVAILABLE
+from .binary_log import BinaryLogHandler
+from .sqlite_handler import SqliteHandler
+
+
+def create_storage_handler(storage_format: Optional[str] = None):
+    """
+    저장 형식에 맞는 수집 파일 핸들러 생성
+
+    사용할 수 없는 형식(pyarrow 없는 parquet, 알 수 없는 형식)이면 경고를 출력하고 CSV로 저장한다.
+
+    Args:
+        storage_format: "csv", "parquet", "binary", "sqlite" (None이면 STORAGE_FORMAT 설정값)
+
+    Returns:
+        CsvHandler 와 같은 인터페이스의 핸들러
+    """
+    storage_format = STORAGE_FORMAT if storage_format is None else storage_format
+    if storage_format == "parquet":
+        if PYARROW_AVAILABLE:
+            return ParquetHandler()
+        print("경고: pyarrow가 설치되어 있지 않아 Parquet 대신 CSV로 저장합니다.")
+    elif storage_format == "binary":
+        return BinaryLogHandler()
+    elif storage_format == "sqlite":
+        return SqliteHandler()
+    elif storage_format != "csv":
+        print(f"경고: 알 수 없는 저장 형식 '{storage_format}', CSV로 저장합니다.")
+    return CsvHandler(async_mode=CSV_ASYNC_WRITE)
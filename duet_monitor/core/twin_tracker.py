@@ -0,0 +1,143 @@
+"""
+트윈 센서 일치도 추적 모듈
+
+DUET 보드의 두 파티클 센서(pt1_X / pt2_X)에 대해 슬라이딩 윈도우 합계를
+유지하여 공분산, 상관계수, 평균 비율, 편차(bias)를 샘플당 O(1)로 갱신한다.
+update 는 수신 스레드에서, get_stats 는 Tk 스레드에서 호출되므로 잠금으로 보호한다.
+"""
+import math
+import threading
+from collections import deque
+from typing import Dict, Any, List, Optional
+
+
+class _PairWindow:
+    """한 쌍의 컬럼에 대한 슬라이딩 윈도우 합계"""
+
+    def __init__(self, window: int):
+        self.window = window
+        self.pairs = deque()
+        self.sx = self.sy = self.sxx = self.syy = self.sxy = 0.0
+        self.updates = 0
+
+    def update(self, x: float, y: float):
+        self.pairs.append((x, y))
+        self.sx += x
+        self.sy += y
+        self.sxx += x * x
+        self.syy += y * y
+        self.sxy += x * y
+        if len(self.pairs) > self.window:
+            ox, oy = self.pairs.popleft()
+            self.sx -= ox
+            self.sy -= oy
+            self.sxx -= ox * ox
+            self.syy -= oy * oy
+            self.sxy -= ox * oy
+        self.updates += 1
+        # 부동소수점 누적 오차를 막기 위해 주기적으로 합계 재계산 (분할 상환 O(1))
+        if self.updates % (self.window * 64) == 0:
+            self._resync()
+
+    def _resync(self):
+        self.sx = sum(x for x, _ in self.pairs)
+        self.sy = sum(y for _, y in self.pairs)
+        self.sxx = sum(x * x for x, _ in self.pairs)
+        self.syy = sum(y * y for _, y in self.pairs)
+        self.sxy = sum(x * y for x, y in self.pairs)
+
+    def stats(self) -> Dict[str, float]:
+        n = len(self.pairs)
+        mean_x, mean_y = self.sx / n, self.sy / n
+        cov = self.sxy / n - mean_x * mean_y
+        var_x = max(self.sxx / n - mean_x * mean_x, 0.0)
+        var_y = max(self.syy / n - mean_y * mean_y, 0.0)
+        denom = math.sqrt(var_x * var_y)
+        return {
+            "count": n,
+            "mean_1": mean_x,
+            "mean_2": mean_y,
+            "covariance": cov,
+            "correlation": cov / denom if denom > 1e-12 else math.nan,
+            "ratio": mean_x / mean_y if mean_y != 0 else math.nan,
+            "bias": mean_x - mean_y,
+        }
+
+
+class TwinSensorTracker:
+    def __init__(self, window: int = 60, min_correlation: float = 0.8,
+                 max_ratio_deviation: float = 0.3, prefixes=("pt1_", "pt2_")):
+        """
+        트윈 센서 추적기 초기화
+
+        Args:
+            window: 슬라이딩 윈도우 샘플 수
+            min_correlation: 이보다 상관계수가 낮으면 드리프트로 판단
+            max_ratio_deviation: 평균 비율이 1에서 이만큼 벗어나면 드리프트로 판단
+            prefixes: (센서1 접두사, 센서2 접두사)
+        """
+        self.window = window
+        self.min_correlation = min_correlation
+        self.max_ratio_deviation = max_ratio_deviation
+        self.prefix_1, self.prefix_2 = prefixes
+        self._pairs: Dict[str, _PairWindow] = {}
+        self._lock = threading.Lock()
+
+    def update(self, row: Dict[str, Any], columns: Optional[List[str]] = None):
+        """
+        행의 pt1_X / pt2_X 값으로 통계 갱신
+
+        Args:
+            row: 평탄화된 샘플
+            columns: 검사할 컬럼 (None이면 행의 모든 컬럼)
+        """
+        values = []
+        for column in (list(row) if columns is None else columns):
+            if not column.startswith(self.prefix_1):
+                continue
+            suffix = column[len(self.prefix_1):]
+            x = row.get(column)
+            y = row.get(self.prefix_2 + suffix)
+            if _is_number(x) and _is_number(y):
+                values.append((suffix, float(x), float(y)))
+        if not values:
+            return
+        with self._lock:
+            for suffix, x, y in values:
+                pair = self._pairs.get(suffix)
+                if pair is None:
+                    pair = _PairWindow(self.window)
+                    self._pairs[suffix] = pair
+                pair.update(x, y)
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        센서 쌍별 통계 반환
+
+        Returns:
+            Dict[str, Dict[str, Any]]: 접미사(X)별 통계와 드리프트 여부
+        """
+        with self._lock:
+            snapshot = [(suffix, pair.stats()) for suffix, pair in self._pairs.items()]
+        result = {}
+        for suffix, stats in snapshot:
+            drift = False
+            # 윈도우 절반 이상 모인 뒤부터 판정 (값이 일정해 상관계수가 없으면 비율만 사용)
+            if stats["count"] >= max(2, self.window // 2):
+                corr, ratio = stats["correlation"], stats["ratio"]
+                if not math.isnan(corr) and corr < self.min_correlation:
+                    drift = True
+                if not math.isnan(ratio) and abs(ratio - 1.0) > self.max_ratio_deviation:
+                    drift = True
+            stats["drift"] = drift
+            result[suffix] = stats
+        return result
+
+    def reset(self):
+        """모든 통계 초기화"""
+        with self._lock:
+            self._pairs.clear()
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool) and value == value
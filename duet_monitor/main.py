@@ -13,13 +13,18 @@ import http.cookies
 from duet_monitor.ui.main_window import MainWindow
 from duet_monitor.ui.mode_selector import ModeSelector, debug_print
 from duet_monitor.core.serial_handler import SerialHandler
-from duet_monitor.core.csv_handler import CsvHandler
-from duet_monitor.core.data_processor import DataProcessor
+from duet_monitor.core.storage import create_storage_handler
+from duet_monitor.core.data_processor import DataProcessor, flatten_dict
 from duet_monitor.ui.login_dialog import LoginDialog
-from duet_monitor.mqtt.mqtt_client import mqtt_publish_only, last_mqtt_response, last_mqtt_status_code
+from duet_monitor.mqtt.mqtt_client import mqtt_publish, close_session
+from duet_monitor.mqtt.upload_pipeline import UploadPipeline
+from duet_monitor.mqtt.mqtt_transport import MqttTransport, PAHO_AVAILABLE
+from duet_monitor.mqtt.outbox import Outbox
+from duet_monitor.mqtt.publish_policy import PublishPolicyRouter
 from duet_monitor.mqtt.mqtt_config import BROKER, TOPIC
 from duet_monitor.utils.debug import debug_print_main
-from duet_monitor.config.api_config import LOGIN_URL, SIGNUP_URL, REISSUE_URL
+from duet_monitor.config.api_config import LOGIN_URL, SIGNUP_URL, REISSUE_URL, UPLOAD_TRANSPORT
+from duet_monitor.config.settings import UPLOAD_ALARM_FLAGS, OUTBOX_ENABLED, PUBLISH_FLUSH_INTERVAL_MS
 
 # 디버깅 상수
 DEBUG = True
@@ -224,16 +229,104 @@ def main():
             except Exception as e:
                 debug_print_main(f"[reissue_token] 예외 발생: {e}")
             return None, None
+        # 업로드 전송 계층 선택 (REST 또는 브로커 직접 발행)
+        mqtt_transport = None
+        if UPLOAD_TRANSPORT == "mqtt":
+            if PAHO_AVAILABLE:
+                mqtt_transport = MqttTransport(token=token)
+                mqtt_transport.connect()
+            else:
+                print("paho-mqtt 패키지가 없어 REST 업로드를 사용합니다.")
+        def publish_upload(topic, payload, upload_token):
+            """업로드 전송 (--test401 이면 토큰 재발급 전까지 401 강제)"""
+            if test_401:
+                return 401, '테스트용 401 강제 발생'
+            return mqtt_publish(topic, payload, upload_token)
+        def publish_upload_async(topic, payload, upload_token, callback):
+            """브로커 직접 발행 (PUBACK은 기다리지 않음, --test401 처리는 publish_upload 와 같음)"""
+            if test_401:
+                callback(401, '테스트용 401 강제 발생')
+                return
+            mqtt_transport.publish_async(topic, payload, upload_token, callback)
+        def refresh_upload_token():
+            """401 응답 시 토큰 재발급 (업로드 작업 스레드에서 호출)"""
+            nonlocal token, refresh_token, test_401
+            debug_print_main(f"[upload] 401 발생, refresh_token: {str(refresh_token)[:10]}...")
+            if not refresh_token:
+                return None
+            new_token, new_refresh_token = reissue_token(refresh_token)
+            if new_token and new_refresh_token:
+                token = new_token
+                refresh_token = new_refresh_token
+                test_401 = False
+                debug_print_main("토큰 재발급 성공. MQTT 재전송 시도.")
+                return new_token
+            return None
+        auth_state = {'handling': False}
+        def handle_auth_failure(token_refreshed):
+            """재발급 후에도 401이거나 재발급에 실패한 경우 처리 (메인 스레드에서 실행)"""
+            nonlocal token, refresh_token
+            if token_refreshed:
+                debug_print_main("[upload] 토큰 재발급 후에도 401. 프로그램 종료.")
+                messagebox.showerror("인증 오류", "토큰 재발급 후에도 인증에 실패했습니다. 프로그램을 종료합니다.")
+                root.quit()
+                return
+            # 토큰 재발급 실패, 로그인 다이얼로그 표시
+            debug_print_main("토큰 재발급 실패. 로그인 다이얼로그로 전환.")
+            messagebox.showwarning("인증 만료", "토큰 재발급에 실패했습니다. 다시 로그인 해주세요.")
+            login_dialog = LoginDialog(root)
+            token = login_dialog.get_token()
+            if hasattr(login_dialog, 'get_refresh_token'):
+                refresh_token = login_dialog.get_refresh_token()
+                debug_print_main(f"[재로그인] refresh_token: {str(refresh_token)[:10]}...")
+            else:
+                refresh_token = None
+                debug_print_main("[재로그인] LoginDialog에서 refresh_token을 반환하지 않음.")
+            if not token:
+                debug_print_main("[재로그인] 재로그인 실패. 프로그램 종료.")
+                messagebox.showerror("인증 오류", "재로그인에 실패했습니다. 프로그램을 종료합니다.")
+                root.quit()
+                return
+            upload_pipeline.set_token(token)
+            auth_state['handling'] = False
+        def on_upload_result(result):
+            """업로드 결과 처리 (업로드 작업 스레드에서 호출)"""
+            debug_print_main(f"[upload] {result.topic} 응답 코드: {result.code}, 메시지: {result.message}")
+            if result.code == 401 and not auth_state['handling']:
+                # 대화상자는 메인 스레드에서 표시
+                auth_state['handling'] = True
+                root.after(0, handle_auth_failure, result.token_refreshed)
+        # 업로드 아웃박스 (전송 실패 샘플을 디스크에 보관했다가 다시 보냄)
+        outbox = None
+        if OUTBOX_ENABLED:
+            outbox = Outbox()
+            if not outbox.open():
+                outbox = None
+        upload_pipeline = UploadPipeline(publish_func=publish_upload, token=token,
+                                         refresh_callback=refresh_upload_token,
+                                         result_callback=on_upload_result,
+                                         publish_async_func=publish_upload_async if mqtt_transport else None,
+                                         outbox=outbox)
+        upload_pipeline.start()
+        # 발행 정책 (로컬에는 모든 샘플을 저장하고 서버로는 장치/토픽별 정책에 따라 줄여서 발행)
+        publish_router = PublishPolicyRouter()
+        def flush_publish_policies():
+            """끝난 집계 구간 발행 (샘플이 끊겨도 구간이 밀리지 않도록 주기적으로 호출)"""
+            try:
+                for topic, device_id, payload in publish_router.flush():
+                    upload_pipeline.submit(topic, payload, device_id)
+            except Exception as e:
+                print(f"발행 정책 flush 오류: {e}")
+            root.after(PUBLISH_FLUSH_INTERVAL_MS, flush_publish_policies)
+        root.after(PUBLISH_FLUSH_INTERVAL_MS, flush_publish_policies)
         def on_serial_data(data):
             """시리얼 데이터 수신 및 MQTT/스냅샷 처리"""
             try:
                 debug_print_main(f"[main.py:on_serial_data] 콜백 진입: {data}")
-                debug_print_main(f"[on_serial_data] last_mqtt_status_code: {last_mqtt_status_code}, last_mqtt_response: {last_mqtt_response}")
+                debug_print_main(f"[on_serial_data] 업로드 대기 샘플 수: {upload_pipeline.get_pending_count()}")
             except Exception as e:
                 print(f"[main.py:on_serial_data] 콜백 진입 debug_print_main 예외: {e}")
             
-            nonlocal token, refresh_token, test_401
-            
             if not token:
                 debug_print_main("[MQTT 전송 오류] 토큰이 없습니다. 데이터 전송 불가.")
                 print("[MQTT 전송 오류] 토큰이 없습니다. 데이터 전송 불가.")
@@ -249,6 +342,14 @@ def main():
                 # UI 업데이트를 위한 data_received_callback 호출
                 if hasattr(root, 'data_received_callback'):
                     root.data_received_callback(data_copy)
+                    
+                # LED/경보와 같은 판정기로 업로드용 경보 플래그 추가
+                # (위에서 넘긴 딕셔너리는 수집 스레드가 사용하므로 업로드용 사본에만 추가)
+                if UPLOAD_ALARM_FLAGS:
+                    classifier = data_processor.state_classifier
+                    states = classifier.classify(flatten_dict(data_copy))
+                    data_copy = dict(data_copy)
+                    data_copy['alarms'] = classifier.get_alarms(states)
             except Exception as e:
                 debug_print_main(f"[on_serial_data] data 복사/타입 변환 예외: {e}")
                 print(f"[on_serial_data] data 복사/타입 변환 예외: {e}")
@@ -258,7 +359,7 @@ def main():
                 # 디바이스 ID 추출 및 MQTT 토픽 구성
                 device_id = data_copy.get('id', 1)
                 topic_dynamic = f"smartair/{device_id}/airquality"
-                debug_print_main(f"[on_serial_data] mqtt_publish_only 호출 전: {data_copy}")
+                debug_print_main(f"[on_serial_data] 업로드 요청 추가 전: {data_copy}")
                 
                 # 스냅샷 핸들러 초기화 (처음 데이터를 받았을 때)
                 if not hasattr(on_serial_data, 'snapshot_initialized'):
@@ -267,69 +368,9 @@ def main():
                     on_serial_data.snapshot_initialized = True
                     debug_print_main(f"[on_serial_data] 스냅샷 핸들러 초기화 완료 (device_id: {device_id})")
                 
-                # MQTT 메시지 발행
-                if test_401:
-                    globals()['last_mqtt_status_code'] = 401
-                    globals()['last_mqtt_response'] = '테스트용 401 강제 발생'
-                    code = globals()['last_mqtt_status_code']
-                    msg = globals()['last_mqtt_response']
-                else:
-                    from duet_monitor.mqtt.mqtt_client import mqtt_publish_only
-                    mqtt_publish_only(topic_dynamic, data_copy, token)
-                    from duet_monitor.mqtt.mqtt_client import last_mqtt_status_code, last_mqtt_response
-                    code = last_mqtt_status_code
-                    msg = last_mqtt_response
-                
-                debug_print_main(f"[on_serial_data] MQTT 응답 코드: {code}, 메시지: {msg}")
-                
-                # 토큰 관련 오류 처리
-                if code == 401:  # Unauthorized
-                    debug_print_main(f"[on_serial_data] 401 발생, refresh_token: {str(refresh_token)[:10]}...")
-                    
-                    if refresh_token:
-                        # 토큰 재발급 시도
-                        new_token, new_refresh_token = reissue_token(refresh_token)
-                        if new_token and new_refresh_token:
-                            token = new_token
-                            refresh_token = new_refresh_token
-                            debug_print_main("토큰 재발급 성공. MQTT 재전송 시도.")
-                            test_401 = False
-                            
-                            # 재전송
-                            if test_401:
-                                globals()['last_mqtt_status_code'] = 401
-                                globals()['last_mqtt_response'] = '테스트용 401 강제 발생'
-                                code = globals()['last_mqtt_status_code']
-                                msg = globals()['last_mqtt_response']
-                            else:
-                                mqtt_publish_only(topic_dynamic, data_copy, token)
-                                from duet_monitor.mqtt.mqtt_client import last_mqtt_status_code, last_mqtt_response
-                                code = last_mqtt_status_code
-                                msg = last_mqtt_response
-                                
-                            debug_print_main(f"[on_serial_data] 재시도 후 MQTT 응답 코드: {code}, 메시지: {msg}")
-                            if code == 401:
-                                debug_print_main("[on_serial_data] 토큰 재발급 후에도 401. 프로그램 종료.")
-                                messagebox.showerror("인증 오류", "토큰 재발급 후에도 인증에 실패했습니다. 프로그램을 종료합니다.")
-                                root.quit()
-                                return
-                        else:
-                            # 토큰 재발급 실패, 로그인 다이얼로그 표시
-                            debug_print_main("토큰 재발급 실패. 로그인 다이얼로그로 전환.")
-                            messagebox.showwarning("인증 만료", "토큰 재발급에 실패했습니다. 다시 로그인 해주세요.")
-                            login_dialog = LoginDialog(root)
-                            token = login_dialog.get_token()
-                            if hasattr(login_dialog, 'get_refresh_token'):
-                                refresh_token = login_dialog.get_refresh_token()
-                                debug_print_main(f"[재로그인] refresh_token: {str(refresh_token)[:10]}...")
-                            else:
-                                refresh_token = None
-                                debug_print_main("[재로그인] LoginDialog에서 refresh_token을 반환하지 않음.")
-                            if not token:
-                                debug_print_main("[재로그인] 재로그인 실패. 프로그램 종료.")
-                                messagebox.showerror("인증 오류", "재로그인에 실패했습니다. 프로그램을 종료합니다.")
-                                root.quit()
-                                return
+                # 발행 정책을 거쳐 업로드 대기열에 추가 (전송은 업로드 작업 스레드에서 하므로 시리얼 수신은 네트워크 지연과 무관)
+                for payload in publish_router.route(topic_dynamic, data_copy, device_id):
+                    upload_pipeline.submit(topic_dynamic, payload, device_id)
         
             except Exception as e:
                 import traceback
@@ -345,7 +386,7 @@ def main():
         data_processor = DataProcessor()
         serial_handler = SerialHandler()
         serial_handler.add_data_callback(on_serial_data)
-        csv_handler = CsvHandler()
+        csv_handler = create_storage_handler()
         debug_print_main("핸들러 초기화 완료")
         # 초기 경량 모드 설정
         is_lightweight = args.lightweight
@@ -421,7 +462,17 @@ def main():
         # 애플리케이션 실행
         debug_print_main("메인 루프 시작")
         app.run()
-        debug_print_main("애플리케이션 종료")
+        # 끝나지 않은 집계 구간도 보내고 종료
+        for topic, device_id, payload in publish_router.flush(force=True):
+            upload_pipeline.submit(topic, payload, device_id)
+        upload_pipeline.stop()
+        if mqtt_transport:
+            mqtt_transport.close()
+        if outbox:
+            outbox.close()
+        close_session()
+        debug_print_main(f"애플리케이션 종료 (업로드 통계: {upload_pipeline.get_stats()}, "
+                         f"발행 정책: {publish_router.get_stats()})")
     except Exception as e:
         debug_print_main(f"메인 함수 오류: {e}")
         debug_print_main(traceback.format_exc())
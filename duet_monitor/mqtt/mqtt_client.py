@@ -1,20 +1,62 @@
 """
 MQTT 클라이언트 모듈
+
+업로드는 모듈 전역 requests.Session 을 재사용하므로 같은 서버로의 요청은
+keep-alive 연결 풀을 공유하고 매번 TCP/TLS 연결을 새로 맺지 않는다.
 """
 import json
+import threading
 import requests
-from typing import Optional, Any
+from requests.adapters import HTTPAdapter
+from typing import Optional, Any, Tuple
 from duet_monitor.utils.debug import debug_print_main
-from duet_monitor.mqtt.mqtt_snapshot_handler import MQTTSnapshotHandler
+from duet_monitor.config.api_config import (
+    MQTT_RECEIVE_URL, UPLOAD_CONNECT_TIMEOUT, UPLOAD_READ_TIMEOUT, UPLOAD_POOL_SIZE
+)
+
+try:
+    from duet_monitor.mqtt.mqtt_snapshot_handler import MQTTSnapshotHandler
+except ImportError:
+    MQTTSnapshotHandler = None
 
 last_mqtt_response: Optional[str] = None
 last_mqtt_status_code: Optional[int] = None
-_snapshot_handler: Optional[MQTTSnapshotHandler] = None
-_snapshot_handler: Optional[MQTTSnapshotHandler] = None
+_snapshot_handler = None
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+def get_session() -> requests.Session:
+    """
+    업로드용 공유 세션 반환 (처음 호출할 때 생성)
+    
+    Returns:
+        requests.Session: keep-alive 연결 풀을 가진 세션
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=UPLOAD_POOL_SIZE, max_retries=0)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            session.headers.update({"Content-Type": "application/json", "Accept": "*/*"})
+            _session = session
+        return _session
+
+def close_session():
+    """공유 세션 닫기 (다음 요청 때 새로 생성)"""
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
 
 def init_snapshot_handler(token: str, serial_number: str, snapshot_interval: int = 3600):
-    """스냅샷 핸들러 초기화"""
+    """스냅샷 핸들러 초기화 (스냅샷 모듈이 없으면 건너뜀)"""
     global _snapshot_handler
+    if MQTTSnapshotHandler is None:
+        debug_print_main("[MQTT] 스냅샷 모듈이 없어 스냅샷 수집을 사용하지 않음")
+        return
     if _snapshot_handler is None:
         _snapshot_handler = MQTTSnapshotHandler(token, serial_number, snapshot_interval)
         debug_print_main("[MQTT] 스냅샷 핸들러 초기화됨")
@@ -26,13 +68,20 @@ def cleanup_snapshot_handler():
         _snapshot_handler = None
         debug_print_main("[MQTT] 스냅샷 핸들러 정리됨")
 
-def mqtt_publish_only(topic: str, payload: Any, token: Optional[str] = None):
-    """MQTT 메시지 발행 및 스냅샷 데이터 수집"""
-    global last_mqtt_response, last_mqtt_status_code, _snapshot_handler
+def mqtt_publish(topic: str, payload: Any, token: Optional[str] = None,
+                 url: str = MQTT_RECEIVE_URL) -> Tuple[int, str]:
+    """
+    MQTT 메시지 발행 및 스냅샷 데이터 수집 (공유 세션 사용, 전역 상태를 바꾸지 않음)
     
-    last_mqtt_status_code = None
-    last_mqtt_response = None
+    Args:
+        topic: MQTT 토픽
+        payload: 보낼 데이터 (딕셔너리 또는 JSON 문자열)
+        token: 액세스 토큰
+        url: 수신 엔드포인트
     
+    Returns:
+        Tuple[int, str]: (응답 코드, 응답 본문), 시간 초과는 598, 연결 실패는 599, 그 외 예외는 500
+    """
     try:
         # 페이로드 처리
         payload_data = payload
@@ -48,39 +97,43 @@ def mqtt_publish_only(topic: str, payload: Any, token: Optional[str] = None):
             debug_print_main("[MQTT] 스냅샷용 데이터 포인트 추가됨")
         
         # MQTT 메시지 전송
-        url = "https://smartair.site/mqtt/receive"
-        headers = {
-            "Authorization": f"Bearer {token}",
-            "Content-Type": "application/json",
-            "Accept": "*/*"
-        }
+        headers = {"Authorization": f"Bearer {token}"}
         data = {"topic": topic, "payload": payload}
         
         debug_print_main(f"[MQTT-REST] POST 요청 시작: {url}")
         
-        response = requests.post(url, headers=headers, json=data, timeout=5)
-        last_mqtt_status_code = response.status_code
-        last_mqtt_response = response.text
+        response = get_session().post(url, headers=headers, json=data,
+                                      timeout=(UPLOAD_CONNECT_TIMEOUT, UPLOAD_READ_TIMEOUT))
         
-        debug_print_main(f"[MQTT-REST] 응답 코드: {last_mqtt_status_code}")
-        debug_print_main(f"[MQTT-REST] 응답 본문: {last_mqtt_response}")
+        debug_print_main(f"[MQTT-REST] 응답 코드: {response.status_code}")
+        debug_print_main(f"[MQTT-REST] 응답 본문: {response.text}")
         
-        return response.status_code == 200
+        return response.status_code, response.text
         
     except requests.exceptions.Timeout:
-        last_mqtt_status_code = 598
-        last_mqtt_response = "MQTT 서버 응답 시간 초과"
-        debug_print_main(f"[MQTT-REST 예외] {last_mqtt_response}")
-        return False
+        message = "MQTT 서버 응답 시간 초과"
+        debug_print_main(f"[MQTT-REST 예외] {message}")
+        return 598, message
         
     except requests.exceptions.ConnectionError:
-        last_mqtt_status_code = 599
-        last_mqtt_response = "MQTT 서버 연결 실패"
-        debug_print_main(f"[MQTT-REST 예외] {last_mqtt_response}")
-        return False
+        message = "MQTT 서버 연결 실패"
+        debug_print_main(f"[MQTT-REST 예외] {message}")
+        return 599, message
         
     except Exception as e:
-        last_mqtt_status_code = 500
-        last_mqtt_response = f"예외 발생: {str(e)}"
-        debug_print_main(f"[MQTT-REST 예외] {last_mqtt_response}")
-        return False
\ No newline at end of file
+        message = f"예외 발생: {str(e)}"
+        debug_print_main(f"[MQTT-REST 예외] {message}")
+        return 500, message
+
+def mqtt_publish_only(topic: str, payload: Any, token: Optional[str] = None,
+                      url: str = MQTT_RECEIVE_URL):
+    """
+    MQTT 메시지 발행 (결과를 last_mqtt_status_code / last_mqtt_response 전역에 기록)
+    
+    여러 스레드에서 동시에 호출하면 전역 결과가 섞이므로, 동시 업로드는
+    mqtt_publish 의 반환값이나 UploadPipeline 의 UploadResult 를 사용한다.
+    """
+    global last_mqtt_response, last_mqtt_status_code
+    
+    last_mqtt_status_code, last_mqtt_response = mqtt_publish(topic, payload, token, url)
+    return last_mqtt_status_code == 200
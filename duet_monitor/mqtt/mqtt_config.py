@@ -3,4 +3,17 @@ from duet_monitor.config.api_config import API_BASE
 # MQTT 환경설정 상수
 
 BROKER = "smartair.site"
-TOPIC = "smartair/{device_id}/airquality"  # 실제 사용 시 device_id로 동적으로 조립 
\ No newline at end of file
+TOPIC = "smartair/{device_id}/airquality"  # 실제 사용 시 device_id로 동적으로 조립 
+
+# 브로커 직접 발행 설정 (api_config.UPLOAD_TRANSPORT = "mqtt" 일 때 사용)
+PORT = 1883
+USE_TLS = False  # True이면 TLS 연결 (보통 포트 8883)
+AUTH_USERNAME = "smartair"  # 사용자 이름, 비밀번호로 액세스 토큰 사용
+QOS = 1
+MAX_INFLIGHT = 64  # PUBACK을 기다리는 동시 전송 메시지 수 (QoS1 창 크기)
+MAX_QUEUED = 1000  # 연결이 끊긴 동안 클라이언트에 쌓아 둘 최대 메시지 수
+KEEPALIVE = 60  # 초
+CONNECT_TIMEOUT = 5  # connect() 에서 연결을 기다리는 시간(초)
+PUBLISH_TIMEOUT = 10  # PUBACK 대기 시간(초)
+RECONNECT_MIN_DELAY = 1  # 재연결 대기 시간(초), 실패할 때마다 두 배
+RECONNECT_MAX_DELAY = 30
@@ -0,0 +1,334 @@
+"""
+MQTT 브로커 직접 발행 모듈
+
+REST(/mqtt/receive)를 거치지 않고 브로커와 연결 하나를 유지하며 QoS1로 발행한다.
+연결이 끊기면 paho 네트워크 스레드가 자동으로 재연결하고, PUBACK을 기다리는 메시지를
+최대 max_inflight 개까지 동시에 보낸다 (한 연결 안에서는 보낸 순서대로 전달됨).
+인증은 사용자 이름 + 액세스 토큰(비밀번호)으로 하며, 연결이 거부되면 401로 보고한다.
+
+publish() 는 REST 의 mqtt_publish 와 같은 (응답 코드, 메시지) 를 반환하므로 UploadPipeline 의
+publish_func 로 그대로 쓸 수 있고, publish_async() 는 PUBACK을 기다리지 않고 바로 반환한다.
+"""
+import json
+import time
+import uuid
+import threading
+from typing import Dict, Any, Callable, Optional, Tuple
+from duet_monitor.utils.debug import debug_print_main
+from duet_monitor.mqtt.mqtt_config import (
+    BROKER, PORT, USE_TLS, AUTH_USERNAME, QOS, MAX_INFLIGHT, MAX_QUEUED, KEEPALIVE,
+    CONNECT_TIMEOUT, PUBLISH_TIMEOUT, RECONNECT_MIN_DELAY, RECONNECT_MAX_DELAY
+)
+
+try:
+    import paho.mqtt.client as mqtt
+    PAHO_AVAILABLE = True
+except ImportError:
+    mqtt = None
+    PAHO_AVAILABLE = False
+
+# CONNACK 거부 코드 중 인증 실패 (4: 잘못된 사용자 이름/비밀번호, 5: 권한 없음)
+_AUTH_REFUSED = (4, 5)
+
+
+class MqttTransport:
+    def __init__(self, host: str = BROKER, port: int = PORT, token: Optional[str] = None,
+                 username: str = AUTH_USERNAME, client_id: Optional[str] = None, qos: int = QOS,
+                 max_inflight: int = MAX_INFLIGHT, max_queued: int = MAX_QUEUED,
+                 keepalive: int = KEEPALIVE, publish_timeout: float = PUBLISH_TIMEOUT,
+                 use_tls: bool = USE_TLS):
+        """
+        MQTT 전송 초기화 (연결은 connect() 또는 첫 발행 때)
+
+        Args:
+            host: 브로커 주소
+            port: 브로커 포트
+            token: 액세스 토큰 (비밀번호로 사용)
+            username: 사용자 이름
+            client_id: 클라이언트 id (None이면 임의 생성)
+            qos: 발행 QoS (0이면 PUBACK 없이 전송 즉시 완료)
+            max_inflight: PUBACK을 기다리는 최대 메시지 수 (가득 차면 발행이 대기)
+            max_queued: 연결이 끊긴 동안 쌓아 둘 최대 메시지 수
+            keepalive: keepalive 주기(초)
+            publish_timeout: PUBACK 대기 시간(초)
+            use_tls: TLS 사용 여부
+        """
+        if not PAHO_AVAILABLE:
+            raise ImportError("MQTT 직접 발행에는 paho-mqtt 패키지가 필요합니다.")
+        self.host = host
+        self.port = port
+        self.token = token
+        self.username = username
+        self.client_id = client_id or f"duet-monitor-{uuid.uuid4().hex[:8]}"
+        self.qos = qos
+        self.max_inflight = max(1, max_inflight)
+        self.max_queued = max_queued
+        self.keepalive = keepalive
+        self.publish_timeout = publish_timeout
+        self.use_tls = use_tls
+
+        self.client = None
+        self._lock = threading.Lock()
+        self._pending: Dict[int, list] = {}  # mid -> [콜백, 마감 시간]
+        self._early_acks = set()  # publish() 가 반환되기 전에 도착한 PUBACK
+        self._expired = set()  # 시간 초과로 포기한 mid (늦게 온 PUBACK 무시)
+        self._window = threading.BoundedSemaphore(self.max_inflight)
+        self._connected = threading.Event()
+        self._stop_event = threading.Event()
+        self._watchdog: Optional[threading.Thread] = None
+        self._rejected_token: Optional[str] = None
+        self.last_rc: Optional[int] = None
+
+        # 통계
+        self.published_count = 0
+        self.acked_count = 0
+        self.failed_count = 0
+        self.connect_count = 0
+
+    def connect(self, token: Optional[str] = None, timeout: float = CONNECT_TIMEOUT) -> bool:
+        """
+        브로커 연결 시작 (이후 끊기면 자동 재연결)
+
+        Args:
+            token: 액세스 토큰 (None이면 기존 토큰)
+            timeout: 연결을 기다리는 시간(초)
+
+        Returns:
+            bool: timeout 안에 연결되었으면 True (False여도 백그라운드에서 계속 재시도)
+        """
+        with self._lock:
+            if token is not None:
+                self.token = token
+            if self.client is None:
+                try:
+                    self._start_client()
+                except Exception as e:
+                    print(f"MQTT 브로커 연결 시작 실패: {e}")
+                    self.client = None
+                    return False
+        return self._connected.wait(timeout)
+
+    def _start_client(self):
+        client = mqtt.Client(client_id=self.client_id, clean_session=True)
+        client.username_pw_set(self.username, self.token)
+        client.max_inflight_messages_set(self.max_inflight)
+        client.max_queued_messages_set(self.max_queued)
+        client.reconnect_delay_set(RECONNECT_MIN_DELAY, RECONNECT_MAX_DELAY)
+        if self.use_tls:
+            client.tls_set()
+        client.on_connect = self._on_connect
+        client.on_disconnect = self._on_disconnect
+        client.on_publish = self._on_publish
+        client.connect_async(self.host, self.port, self.keepalive)
+        client.loop_start()
+        self.client = client
+        self._stop_event.clear()
+        self._watchdog = threading.Thread(target=self._watch, daemon=True)
+        self._watchdog.start()
+        debug_print_main(f"[MQTT] 브로커 연결 시작: {self.host}:{self.port}")
+
+    def close(self, timeout: float = 2.0):
+        """
+        연결 종료 (PUBACK을 기다리는 메시지는 timeout 동안 기다린 뒤 실패 처리)
+
+        Args:
+            timeout: 남은 PUBACK을 기다리는 시간(초)
+        """
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline and self.get_pending_count() and self.is_connected():
+            time.sleep(0.01)
+        with self._lock:
+            client = self.client
+            self.client = None
+        if client is None:
+            return
+        self._stop_event.set()
+        client.disconnect()
+        client.loop_stop()
+        self._connected.clear()
+        self._fail_all(599, "MQTT 연결 종료로 취소됨")
+
+    def is_connected(self) -> bool:
+        """브로커에 연결되어 있는지 여부 반환"""
+        return self._connected.is_set()
+
+    def set_token(self, token: Optional[str]):
+        """
+        액세스 토큰 교체 (다음 연결/재연결부터 사용)
+
+        Args:
+            token: 새 액세스 토큰
+        """
+        with self._lock:
+            if token == self.token:
+                return
+            self.token = token
+            if self.client is not None:
+                self.client.username_pw_set(self.username, token)
+
+    def publish_async(self, topic: str, payload: Any, token: Optional[str] = None,
+                      callback: Optional[Callable[[int, str], None]] = None) -> bool:
+        """
+        메시지 발행 (창이 가득 차면 자리가 날 때까지 대기, PUBACK은 기다리지 않음)
+
+        Args:
+            topic: MQTT 토픽
+            payload: 보낼 데이터 (딕셔너리는 JSON으로 변환)
+            token: 액세스 토큰 (기존과 다르면 교체)
+            callback: 완료 시 (응답 코드, 메시지)로 호출 (200: PUBACK 수신, 401: 인증 거부,
+                      598: PUBACK 시간 초과, 599: 연결 실패), 네트워크 스레드에서 호출될 수 있음
+
+        Returns:
+            bool: 클라이언트에 넘겼으면 True (False면 callback 이 이미 호출됨)
+        """
+        if token is not None and token != self.token:
+            self.set_token(token)
+        if self._rejected_token is not None and self._rejected_token == self.token:
+            return self._finish(callback, 401, "MQTT 브로커 인증 거부")
+        if self.client is None:
+            self.connect(timeout=0)  # 연결은 백그라운드에서, 그동안 보낸 QoS1 메시지는 보관됨
+            if self.client is None:
+                return self._finish(callback, 599, "MQTT 브로커 연결 실패")
+        if not self._window.acquire(timeout=self.publish_timeout):
+            return self._finish(callback, 598 if self.is_connected() else 599,
+                                "MQTT 전송 창 대기 시간 초과")
+        try:
+            if not isinstance(payload, (str, bytes)):
+                payload = json.dumps(payload, ensure_ascii=False, default=str)
+            info = self.client.publish(topic, payload, qos=self.qos)
+        except Exception as e:
+            self._window.release()
+            return self._finish(callback, 500, f"예외 발생: {str(e)}")
+        # QoS1 은 연결이 끊겨 있어도 클라이언트가 보관했다가 연결되면 보냄 (QoS0 은 버려짐)
+        queued = info.rc == mqtt.MQTT_ERR_SUCCESS or (info.rc == mqtt.MQTT_ERR_NO_CONN and self.qos > 0)
+        if not queued:
+            self._window.release()
+            return self._finish(callback, 599, f"MQTT 발행 실패: {mqtt.error_string(info.rc)}")
+        with self._lock:
+            self.published_count += 1
+            if self.qos == 0 or info.mid in self._early_acks:
+                self._early_acks.discard(info.mid)
+                acked = True
+            else:
+                self._pending[info.mid] = [callback, time.monotonic() + self.publish_timeout]
+                acked = False
+        if acked:
+            self._window.release()
+            with self._lock:
+                self.acked_count += 1
+            self._finish(callback, 200, "PUBACK")
+        return True
+
+    def publish(self, topic: str, payload: Any, token: Optional[str] = None) -> Tuple[int, str]:
+        """
+        메시지 발행 후 PUBACK 대기 (REST mqtt_publish 와 같은 반환 형식)
+
+        Args:
+            topic: MQTT 토픽
+            payload: 보낼 데이터
+            token: 액세스 토큰
+
+        Returns:
+            Tuple[int, str]: (응답 코드, 메시지)
+        """
+        done = threading.Event()
+        outcome = [598, "MQTT PUBACK 대기 시간 초과"]
+
+        def on_done(code, message):
+            outcome[0], outcome[1] = code, message
+            done.set()
+
+        self.publish_async(topic, payload, token, on_done)
+        done.wait(self.publish_timeout * 2 + 1)
+        return outcome[0], outcome[1]
+
+    def get_pending_count(self) -> int:
+        """PUBACK을 기다리는 메시지 수 반환"""
+        with self._lock:
+            return len(self._pending)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """전송 통계 반환 (연결 여부, 발행/PUBACK/실패 수, 대기 수, 연결 횟수)"""
+        with self._lock:
+            return {
+                "connected": self.is_connected(),
+                "published": self.published_count,
+                "acked": self.acked_count,
+                "failed": self.failed_count,
+                "pending": len(self._pending),
+                "connects": self.connect_count,
+                "last_rc": self.last_rc,
+            }
+
+    def _finish(self, callback, code: int, message: str) -> bool:
+        if code != 200:
+            with self._lock:
+                self.failed_count += 1
+        if callback is not None:
+            try:
+                callback(code, message)
+            except Exception as e:
+                print(f"MQTT 발행 콜백 오류: {e}")
+        return False
+
+    def _complete(self, mid: int, code: int, message: str):
+        with self._lock:
+            entry = self._pending.pop(mid, None)
+            if entry is None:
+                return
+            if code == 200:
+                self.acked_count += 1
+            elif code == 598:
+                self._expired.add(mid)
+        self._window.release()
+        self._finish(entry[0], code, message)
+
+    def _fail_all(self, code: int, message: str):
+        with self._lock:
+            mids = list(self._pending)
+        for mid in mids:
+            self._complete(mid, code, message)
+
+    def _on_connect(self, client, userdata, flags, rc):
+        self.last_rc = rc
+        if rc == 0:
+            self.connect_count += 1
+            self._rejected_token = None
+            self._connected.set()
+            debug_print_main(f"[MQTT] 브로커 연결됨: {self.host}:{self.port}")
+        elif rc in _AUTH_REFUSED:
+            # 같은 토큰으로는 다시 보내지 않음 (set_token 으로 교체하면 재개)
+            self._rejected_token = self.token
+            print(f"MQTT 브로커 인증 거부 (rc={rc})")
+            self._fail_all(401, "MQTT 브로커 인증 거부")
+        else:
+            print(f"MQTT 브로커 연결 거부 (rc={rc})")
+
+    def _on_disconnect(self, client, userdata, rc):
+        self._connected.clear()
+        if rc != 0:
+            debug_print_main(f"[MQTT] 브로커 연결 끊김 (rc={rc}), 재연결 대기")
+
+    def _on_publish(self, client, userdata, mid):
+        if self.qos == 0:
+            return  # QoS0 은 publish_async 에서 바로 완료 처리
+        with self._lock:
+            if mid in self._expired:
+                self._expired.discard(mid)
+                return
+            if mid not in self._pending:
+                self._early_acks.add(mid)
+                return
+        self._complete(mid, 200, "PUBACK")
+
+    def _watch(self):
+        """PUBACK 시간 초과 검사 루프"""
+        while not self._stop_event.wait(0.2):
+            now = time.monotonic()
+            with self._lock:
+                expired = [mid for mid, entry in self._pending.items() if entry[1] <= now]
+            for mid in expired:
+                if self.is_connected():
+                    self._complete(mid, 598, "MQTT PUBACK 대기 시간 초과")
+                else:
+                    self._complete(mid, 599, "MQTT 브로커 연결 실패")
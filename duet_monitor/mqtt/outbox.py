@@ -0,0 +1,237 @@
+"""
+업로드 아웃박스 모듈
+
+보낼 메시지를 전송 전에 SQLite 파일에 먼저 저장하고, 전송이 끝나면 지운다 (store-and-forward).
+네트워크가 끊겨 전송에 실패한 메시지는 파일에 남아 프로그램을 다시 시작해도 유지되며,
+UploadPipeline 의 재전송 스레드가 연결이 돌아오면 저장 순서대로 일정 속도로 다시 보낸다.
+메시지 수 상한과 보관 기간을 넘은 메시지는 오래된 것부터 지운다.
+
+    outbox = Outbox()
+    outbox.open()
+    seq = outbox.put("smartair/817/airquality", data, device_id=817)
+    outbox.ack(seq)
+"""
+import os
+import json
+import time
+import sqlite3
+import threading
+from typing import Dict, Any, List, Optional, Tuple
+from duet_monitor.config.settings import (
+    OUTBOX_PATH, OUTBOX_MAX_MESSAGES, OUTBOX_MAX_AGE_S, OUTBOX_REPLAY_RATE,
+    OUTBOX_REPLAY_BATCH, OUTBOX_RETRY_INTERVAL_S, OUTBOX_ACK_INTERVAL_MS
+)
+
+
+class Outbox:
+    def __init__(self, path: str = OUTBOX_PATH, max_messages: int = OUTBOX_MAX_MESSAGES,
+                 max_age_s: float = OUTBOX_MAX_AGE_S, replay_rate: float = OUTBOX_REPLAY_RATE,
+                 replay_batch: int = OUTBOX_REPLAY_BATCH,
+                 retry_interval_s: float = OUTBOX_RETRY_INTERVAL_S,
+                 ack_interval_ms: int = OUTBOX_ACK_INTERVAL_MS):
+        """
+        아웃박스 초기화
+
+        Args:
+            path: 데이터베이스 파일 경로
+            max_messages: 보관할 최대 메시지 수 (넘으면 가장 오래된 메시지부터 삭제)
+            max_age_s: 최대 보관 기간(초)
+            replay_rate: 밀린 메시지 재전송 속도 (메시지/초, 0이면 제한 없음)
+            replay_batch: 재전송 시 한 번에 읽는 메시지 수
+            retry_interval_s: 재전송 실패 후 다시 시도할 때까지 대기 시간(초)
+            ack_interval_ms: 전송 완료 표시를 모아서 삭제하는 주기
+        """
+        self.path = path
+        self.max_messages = max(1, max_messages)
+        self.max_age = max_age_s
+        self.replay_rate = replay_rate
+        self.replay_batch = max(1, replay_batch)
+        self.retry_interval = retry_interval_s
+        self.ack_interval = ack_interval_ms / 1000.0
+        self.conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._acks: List[int] = []
+        self._last_ack_flush = 0.0
+        self._count = 0
+
+        # 통계
+        self.put_count = 0
+        self.acked_count = 0
+        self.dropped_count = 0  # 상한 초과로 삭제
+        self.expired_count = 0  # 보관 기간 초과로 삭제
+
+    def open(self) -> bool:
+        """
+        데이터베이스 열기 (없으면 생성, 남은 메시지는 그대로 유지)
+
+        Returns:
+            bool: 성공 여부
+        """
+        try:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self.conn = sqlite3.connect(self.path, check_same_thread=False)
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("PRAGMA synchronous=NORMAL")
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS outbox ("
+                "seq INTEGER PRIMARY KEY AUTOINCREMENT, topic TEXT NOT NULL, device_id, "
+                "payload TEXT NOT NULL, created REAL NOT NULL)")
+            self.conn.commit()
+            self._count = self.conn.execute("SELECT COUNT(*) FROM outbox").fetchone()[0]
+            self._last_ack_flush = time.monotonic()
+            if self._count:
+                print(f"아웃박스에 보내지 못한 메시지 {self._count}개: {self.path}")
+            return True
+        except Exception as e:
+            print(f"아웃박스 열기 실패: {e}")
+            self.conn = None
+            return False
+
+    def put(self, topic: str, payload: Any, device_id=None) -> Optional[int]:
+        """
+        메시지 저장 (보내기 전에 호출)
+
+        Args:
+            topic: MQTT 토픽
+            payload: 보낼 데이터 (JSON으로 저장)
+            device_id: 장치 id
+
+        Returns:
+            Optional[int]: 메시지 순번 (실패 시 None)
+        """
+        if self.conn is None:
+            return None
+        try:
+            text = payload if isinstance(payload, str) else json.dumps(payload, ensure_ascii=False, default=str)
+            with self._lock:
+                cursor = self.conn.execute(
+                    "INSERT INTO outbox (topic, device_id, payload, created) VALUES (?, ?, ?, ?)",
+                    (topic, device_id, text, time.time()))
+                self._count += 1
+                self.put_count += 1
+                if self._count > self.max_messages:
+                    self._drop_oldest(self._count - self.max_messages)
+                self.conn.commit()
+                return cursor.lastrowid
+        except Exception as e:
+            print(f"아웃박스 저장 실패: {e}")
+            return None
+
+    def _drop_oldest(self, count: int):
+        cursor = self.conn.execute(
+            "DELETE FROM outbox WHERE seq IN (SELECT seq FROM outbox ORDER BY seq LIMIT ?)", (count,))
+        self._count -= cursor.rowcount
+        self.dropped_count += cursor.rowcount
+
+    def ack(self, seq: int):
+        """
+        전송 완료 표시 (삭제는 모아서 반영, 반영 전에 끊기면 다시 보낼 수 있음)
+
+        Args:
+            seq: 메시지 순번
+        """
+        with self._lock:
+            self._acks.append(seq)
+            due = time.monotonic() - self._last_ack_flush >= self.ack_interval
+        if due:
+            self.flush_acks()
+
+    def flush_acks(self) -> int:
+        """
+        모아 둔 전송 완료 표시 반영
+
+        Returns:
+            int: 삭제한 메시지 수
+        """
+        with self._lock:
+            acks, self._acks = self._acks, []
+            self._last_ack_flush = time.monotonic()
+            if not acks or self.conn is None:
+                return 0
+            try:
+                cursor = self.conn.executemany("DELETE FROM outbox WHERE seq = ?", [(seq,) for seq in acks])
+                self.conn.commit()
+                self._count -= cursor.rowcount
+                self.acked_count += cursor.rowcount
+                return cursor.rowcount
+            except Exception as e:
+                print(f"아웃박스 삭제 실패: {e}")
+                return 0
+
+    def peek(self, limit: int, after: int = 0) -> List[Tuple[int, str, Any, Any]]:
+        """
+        가장 오래된 메시지부터 읽기 (지우지 않음)
+
+        Args:
+            limit: 최대 메시지 수
+            after: 이 순번 다음부터 읽음
+
+        Returns:
+            List[Tuple[int, str, Any, Any]]: (순번, 토픽, 데이터, 장치 id) 목록 (순번 순)
+        """
+        if self.conn is None:
+            return []
+        self.flush_acks()
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT seq, topic, payload, device_id FROM outbox WHERE seq > ? ORDER BY seq LIMIT ?",
+                (after, limit)).fetchall()
+        messages = []
+        for seq, topic, text, device_id in rows:
+            try:
+                payload = json.loads(text)
+            except ValueError:
+                payload = text
+            messages.append((seq, topic, payload, device_id))
+        return messages
+
+    def expire(self) -> int:
+        """
+        보관 기간이 지난 메시지 삭제
+
+        Returns:
+            int: 삭제한 메시지 수
+        """
+        if self.conn is None or not self.max_age:
+            return 0
+        cutoff = time.time() - self.max_age
+        with self._lock:
+            try:
+                # 가장 오래된 메시지만 먼저 확인 (대부분 지울 것이 없음)
+                oldest = self.conn.execute("SELECT created FROM outbox ORDER BY seq LIMIT 1").fetchone()
+                if oldest is None or oldest[0] >= cutoff:
+                    return 0
+                cursor = self.conn.execute("DELETE FROM outbox WHERE created < ?", (cutoff,))
+                self.conn.commit()
+                self._count -= cursor.rowcount
+                self.expired_count += cursor.rowcount
+                return cursor.rowcount
+            except Exception as e:
+                print(f"아웃박스 정리 실패: {e}")
+                return 0
+
+    def get_count(self) -> int:
+        """보관 중인 메시지 수 반환 (반영 전인 전송 완료 표시 제외)"""
+        with self._lock:
+            return self._count - len(self._acks)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """아웃박스 통계 반환 (보관/저장/완료/상한 삭제/기간 삭제 수)"""
+        with self._lock:
+            return {
+                "count": self._count - len(self._acks),
+                "put": self.put_count,
+                "acked": self.acked_count + len(self._acks),
+                "dropped": self.dropped_count,
+                "expired": self.expired_count,
+            }
+
+    def close(self):
+        """전송 완료 표시를 반영하고 닫기"""
+        self.flush_acks()
+        with self._lock:
+            if self.conn is not None:
+                self.conn.close()
+                self.conn = None
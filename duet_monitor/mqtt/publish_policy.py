@@ -0,0 +1,349 @@
+"""
+업로드 발행 정책 모듈
+
+수신한 샘플은 로컬에 모두 저장하고, 서버로는 장치/토픽별 정책에 따라 줄여서 발행한다.
+수신 처리(on_serial_data)와 UploadPipeline.submit 사이에서 사용한다.
+
+- raw: 모든 샘플 발행
+- every_nth: n개마다 하나 발행
+- window: 시각 기준 window_s 초 구간마다 숫자 필드를 평균/최소/최대로 집계해 하나 발행
+- deadband: 숫자 필드가 마지막으로 발행한 값에서 임계값보다 크게 바뀌었을 때만 발행
+  (바뀌지 않아도 heartbeat_s 초마다 발행)
+
+    router = PublishPolicyRouter()
+    for payload in router.route("smartair/817/airquality", data, device_id=817):
+        pipeline.submit("smartair/817/airquality", payload, device_id=817)
+"""
+import math
+import time
+import fnmatch
+import threading
+from datetime import datetime
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+from duet_monitor.config.settings import PUBLISH_POLICIES, PUBLISH_EXCLUDE_FIELDS
+
+
+def _leaves(payload: Dict[str, Any]) -> Iterator[Tuple[str, tuple, Any]]:
+    """페이로드의 말단 값을 (평탄화 이름, 경로, 값)으로 반환 (pt1/pt2 같은 한 단계 중첩까지)"""
+    for key, value in payload.items():
+        if isinstance(value, dict):
+            for sub_key, sub_value in value.items():
+                yield f"{key}_{sub_key}", (key, sub_key), sub_value
+        else:
+            yield key, (key,), value
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool) and value == value
+
+
+def _matches(name: str, patterns: List[str]) -> bool:
+    return any(fnmatch.fnmatchcase(name, pattern) for pattern in patterns)
+
+
+def _copy_payload(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """한 단계 중첩까지 복사"""
+    return {key: dict(value) if isinstance(value, dict) else value for key, value in payload.items()}
+
+
+def _set_path(target: Dict[str, Any], path: tuple, value: Any):
+    if len(path) == 1:
+        target[path[0]] = value
+    else:
+        target.setdefault(path[0], {})[path[1]] = value
+
+
+class RawPolicy:
+    """모든 샘플 발행"""
+
+    def offer(self, payload: Dict[str, Any], now: float) -> List[Dict[str, Any]]:
+        return [payload]
+
+    def flush(self, now: float, force: bool = False) -> List[Dict[str, Any]]:
+        return []
+
+
+class EveryNthPolicy:
+    """n개마다 하나 발행 (첫 샘플 포함)"""
+
+    def __init__(self, n: int):
+        self.n = max(1, n)
+        self.count = 0
+
+    def offer(self, payload: Dict[str, Any], now: float) -> List[Dict[str, Any]]:
+        publish = self.count % self.n == 0
+        self.count += 1
+        return [payload] if publish else []
+
+    def flush(self, now: float, force: bool = False) -> List[Dict[str, Any]]:
+        return []
+
+
+class WindowPolicy:
+    """시각 기준 구간 집계 (구간이 바뀌거나 flush 때 발행)"""
+
+    STATS = ("mean", "min", "max")
+
+    def __init__(self, window_s: float, stat: str = "mean", stats: Optional[List[str]] = None,
+                 exclude: Optional[List[str]] = None):
+        """
+        Args:
+            window_s: 구간 길이(초), 구간은 시각의 배수로 정렬됨 (예: 10초면 :00, :10, ...)
+            stat: 숫자 필드에 넣을 통계 ("mean", "min", "max")
+            stats: "window" 필드에 따로 넣을 통계 목록
+            exclude: 집계하지 않고 마지막 값을 그대로 쓸 필드 패턴
+        """
+        for name in [stat] + list(stats or []):
+            if name not in self.STATS:
+                raise ValueError(f"알 수 없는 집계 통계: {name}")
+        self.window = float(window_s)
+        if self.window <= 0:
+            raise ValueError("window_s 는 0보다 커야 합니다.")
+        self.stat = stat
+        self.stats = list(stats or [])
+        self.exclude = list(exclude if exclude is not None else PUBLISH_EXCLUDE_FIELDS)
+        self._excluded: Dict[str, bool] = {}  # 필드 이름 -> 제외 여부
+        self._start: Optional[float] = None
+        self._count = 0
+        self._last: Optional[Dict[str, Any]] = None
+        self._sums: Dict[tuple, float] = {}
+        self._counts: Dict[tuple, int] = {}
+        self._mins: Dict[tuple, float] = {}
+        self._maxs: Dict[tuple, float] = {}
+
+    def offer(self, payload: Dict[str, Any], now: float) -> List[Dict[str, Any]]:
+        start = math.floor(now / self.window) * self.window
+        out = self._emit() if self._start is not None and start != self._start else []
+        if self._start is None:
+            self._start = start
+        for name, path, value in _leaves(payload):
+            if not _is_number(value):
+                continue
+            excluded = self._excluded.get(name)
+            if excluded is None:
+                excluded = self._excluded[name] = _matches(name, self.exclude)
+            if excluded:
+                continue
+            if path in self._sums:
+                self._sums[path] += value
+                self._counts[path] += 1
+                if value < self._mins[path]:
+                    self._mins[path] = value
+                if value > self._maxs[path]:
+                    self._maxs[path] = value
+            else:
+                self._sums[path] = value
+                self._counts[path] = 1
+                self._mins[path] = self._maxs[path] = value
+        self._last = payload
+        self._count += 1
+        return out
+
+    def flush(self, now: float, force: bool = False) -> List[Dict[str, Any]]:
+        if self._count and (force or now >= self._start + self.window):
+            return self._emit()
+        return []
+
+    def _value(self, stat: str, path: tuple) -> float:
+        if stat == "min":
+            return self._mins[path]
+        if stat == "max":
+            return self._maxs[path]
+        return self._sums[path] / self._counts[path]
+
+    def _emit(self) -> List[Dict[str, Any]]:
+        """현재 구간 집계를 발행용 페이로드로 만들고 상태 초기화"""
+        result = _copy_payload(self._last)  # 집계하지 않는 필드는 마지막 샘플 값
+        for path in self._sums:
+            _set_path(result, path, self._value(self.stat, path))
+        window = {
+            "start": datetime.fromtimestamp(self._start).isoformat(),
+            "end": datetime.fromtimestamp(self._start + self.window).isoformat(),
+            "count": self._count,
+        }
+        for stat in self.stats:
+            values: Dict[str, Any] = {}
+            for path in self._sums:
+                _set_path(values, path, self._value(stat, path))
+            window[stat] = values
+        result["window"] = window
+        self._start = None
+        self._count = 0
+        self._last = None
+        self._sums, self._counts, self._mins, self._maxs = {}, {}, {}, {}
+        return [result]
+
+
+class DeadbandPolicy:
+    """값이 임계값보다 크게 바뀌었거나 heartbeat 주기가 지났을 때만 발행"""
+
+    def __init__(self, threshold: float = 0.0, thresholds: Optional[Dict[str, float]] = None,
+                 heartbeat_s: float = 0.0, exclude: Optional[List[str]] = None):
+        """
+        Args:
+            threshold: 기본 임계값 (마지막 발행값과의 차이가 이보다 크면 발행)
+            thresholds: 필드 패턴별 임계값 (평탄화 이름과 비교, 처음 일치한 패턴 적용)
+            heartbeat_s: 바뀌지 않아도 발행하는 주기(초, 0이면 사용 안 함)
+            exclude: 변화 판단에서 제외할 필드 패턴
+        """
+        self.threshold = threshold
+        self.thresholds = dict(thresholds or {})
+        self.heartbeat = heartbeat_s
+        self.exclude = list(exclude if exclude is not None else PUBLISH_EXCLUDE_FIELDS)
+        self._published: Dict[str, float] = {}
+        self._last_time: Optional[float] = None
+        self._threshold_cache: Dict[str, Optional[float]] = {}
+
+    def _threshold_for(self, name: str) -> Optional[float]:
+        """필드 임계값 (제외 필드는 None)"""
+        value = self._threshold_cache.get(name, False)
+        if value is False:
+            value = None if _matches(name, self.exclude) else self.threshold
+            if value is not None:
+                for pattern, threshold in self.thresholds.items():
+                    if fnmatch.fnmatchcase(name, pattern):
+                        value = threshold
+                        break
+            self._threshold_cache[name] = value
+        return value
+
+    def offer(self, payload: Dict[str, Any], now: float) -> List[Dict[str, Any]]:
+        values = {}
+        changed = self._last_time is None or (self.heartbeat and now - self._last_time >= self.heartbeat)
+        for name, _, value in _leaves(payload):
+            if not _is_number(value):
+                continue
+            threshold = self._threshold_for(name)
+            if threshold is None:
+                continue
+            values[name] = value
+            if not changed:
+                previous = self._published.get(name)
+                changed = previous is None or abs(value - previous) > threshold
+        if not changed:
+            return []
+        self._published = values
+        self._last_time = now
+        return [payload]
+
+    def flush(self, now: float, force: bool = False) -> List[Dict[str, Any]]:
+        return []
+
+
+def create_policy(spec: Dict[str, Any], exclude: Optional[List[str]] = None):
+    """
+    설정 항목으로 발행 정책 객체 생성
+
+    Args:
+        spec: {"type": "raw" | "every_nth" | "window" | "deadband", ...}
+        exclude: 집계/변화 판단에서 제외할 필드 패턴 (None이면 PUBLISH_EXCLUDE_FIELDS)
+
+    Returns:
+        발행 정책 객체 (offer / flush 메서드)
+    """
+    kind = spec.get("type", "raw")
+    if kind == "raw":
+        return RawPolicy()
+    if kind == "every_nth":
+        return EveryNthPolicy(int(spec["n"]))
+    if kind == "window":
+        return WindowPolicy(float(spec["window_s"]), spec.get("stat", "mean"), spec.get("stats"),
+                            spec.get("exclude", exclude))
+    if kind == "deadband":
+        return DeadbandPolicy(float(spec.get("threshold", 0.0)), spec.get("thresholds"),
+                              float(spec.get("heartbeat_s", 0.0)), spec.get("exclude", exclude))
+    raise ValueError(f"알 수 없는 발행 정책: {kind}")
+
+
+class PublishPolicyRouter:
+    def __init__(self, config: List[Dict[str, Any]] = PUBLISH_POLICIES,
+                 exclude: Optional[List[str]] = None):
+        """
+        장치/토픽별 발행 정책 라우터 초기화
+
+        Args:
+            config: [{"devices": [...], "topics": [...], "policy": {...}}, ...] (처음 일치한 규칙 적용,
+                    일치하는 규칙이 없으면 raw)
+            exclude: 집계/변화 판단에서 제외할 필드 패턴 (None이면 PUBLISH_EXCLUDE_FIELDS)
+        """
+        self.config = config
+        self.exclude = exclude
+        self._policies: Dict[Tuple[str, str], Any] = {}  # (장치 id, 토픽) -> 정책 객체
+        self._devices: Dict[Tuple[str, str], Any] = {}  # (장치 id, 토픽) -> 원래 장치 id
+        self._lock = threading.Lock()
+        self.received_count = 0
+        self.published_count = 0
+
+    def _policy_for(self, device_id, topic: str):
+        key = (str(device_id), topic)
+        policy = self._policies.get(key)
+        if policy is None:
+            spec = {"type": "raw"}
+            for entry in self.config:
+                if (_matches(key[0], entry.get("devices", ["*"])) and
+                        _matches(topic, entry.get("topics", ["*"]))):
+                    spec = entry.get("policy", spec)
+                    break
+            policy = self._policies[key] = create_policy(spec, self.exclude)
+            self._devices[key] = device_id
+        return policy
+
+    def route(self, topic: str, payload: Dict[str, Any], device_id=None,
+              now: Optional[float] = None) -> List[Dict[str, Any]]:
+        """
+        샘플 하나를 정책에 넣고 지금 발행할 페이로드 반환
+
+        Args:
+            topic: MQTT 토픽
+            payload: 샘플 (raw/every_nth/deadband 는 그대로 반환하므로 이후 변경하면 안 됨)
+            device_id: 장치 id
+            now: 현재 시각 (time.time() 기준, None이면 지금)
+
+        Returns:
+            List[Dict[str, Any]]: 발행할 페이로드 (없으면 빈 리스트)
+        """
+        now = time.time() if now is None else now
+        with self._lock:
+            self.received_count += 1
+            try:
+                out = self._policy_for(device_id, topic).offer(payload, now)
+            except Exception as e:
+                print(f"발행 정책 처리 오류 (원본 발행): {e}")
+                out = [payload]
+            self.published_count += len(out)
+            return out
+
+    def flush(self, now: Optional[float] = None, force: bool = False) -> List[Tuple[str, Any, Dict[str, Any]]]:
+        """
+        끝난 집계 구간 발행 (샘플이 끊겨도 주기적으로 호출, 종료 시 force=True)
+
+        Args:
+            now: 현재 시각 (time.time() 기준, None이면 지금)
+            force: True면 끝나지 않은 구간도 발행
+
+        Returns:
+            List[Tuple[str, Any, Dict[str, Any]]]: (토픽, 장치 id, 페이로드) 목록
+        """
+        now = time.time() if now is None else now
+        out = []
+        with self._lock:
+            for key, policy in self._policies.items():
+                for payload in policy.flush(now, force):
+                    out.append((key[1], self._devices[key], payload))
+            self.published_count += len(out)
+        return out
+
+    def get_stats(self) -> Dict[str, Any]:
+        """수신/발행 샘플 수와 발행 비율 반환"""
+        with self._lock:
+            return {
+                "received": self.received_count,
+                "published": self.published_count,
+                "ratio": self.published_count / self.received_count if self.received_count else 0.0,
+            }
+
+    def reset(self):
+        """모든 정책 상태 초기화"""
+        with self._lock:
+            self._policies.clear()
+            self._devices.clear()
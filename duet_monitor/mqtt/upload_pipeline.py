@@ -0,0 +1,545 @@
+"""
+비동기 업로드 파이프라인 모듈
+
+시리얼 콜백은 submit() 으로 메모리 대기열에 넣기만 하고, 작업 스레드 N개가 실제 전송을 맡는다.
+대기열은 장치별 레인으로 나뉘며 한 레인에서는 한 번에 요청 하나만 보내므로 장치별 전송 순서가
+유지되고, 서로 다른 장치는 동시에 전송된다. 네트워크가 느려 레인이 한도를 넘으면 가장 오래된
+대기 샘플을 버리고 최신 샘플을 유지한다. 요청마다 UploadResult 로 결과를 돌려주므로
+mqtt_client 의 전역 결과 변수에 의존하지 않는다.
+
+publish_async_func(MqttTransport.publish_async 등)를 주면 응답을 기다리지 않고 전송 계층에
+넘기자마자 레인을 풀어 준다. 연결 하나에서 보낸 순서대로 전달되는 전송 계층에서만 사용한다.
+
+아웃박스(Outbox)를 주면 제출한 샘플을 먼저 디스크에 저장하고 전송에 성공하면 지운다.
+실패하거나 대기열 초과로 대체된 샘플은 아웃박스에 남고, 재전송 스레드가 저장 순서대로
+outbox.replay_rate 속도를 넘지 않게 다시 보낸다.
+
+    pipeline = UploadPipeline(token=token, refresh_callback=refresh)
+    pipeline.start()
+    result = pipeline.submit("smartair/817/airquality", data, device_id=817)
+"""
+import time
+import threading
+from collections import deque
+from typing import Dict, Any, Callable, List, Optional, Tuple
+from duet_monitor.mqtt.mqtt_client import mqtt_publish
+from duet_monitor.config.api_config import UPLOAD_WORKERS, UPLOAD_LANE_MAX_PENDING
+
+
+class UploadResult:
+    def __init__(self, topic: str, payload: Any, device_id=None):
+        """
+        업로드 요청 하나의 결과
+
+        Args:
+            topic: MQTT 토픽
+            payload: 보낼 데이터
+            device_id: 장치 id (레인 구분)
+        """
+        self.topic = topic
+        self.payload = payload
+        self.device_id = device_id
+        self.status = "pending"  # pending, sent, failed, coalesced, cancelled
+        self.code: Optional[int] = None
+        self.message: Optional[str] = None
+        self.attempts = 0
+        self.token_refreshed = False  # 401 후 토큰을 재발급받아 다시 보냈는지 여부
+        self.submitted_at = time.monotonic()
+        self.completed_at: Optional[float] = None
+        self._done = threading.Event()
+        self._failed_token: Optional[str] = None  # 401 을 받아 재발급 후 다시 보낼 요청 표시
+        self.outbox_seq: Optional[int] = None  # 아웃박스 순번 (아웃박스를 쓰지 않으면 None)
+
+    def is_success(self) -> bool:
+        """전송 성공(응답 코드 200) 여부 반환"""
+        return self.code == 200
+
+    def is_done(self) -> bool:
+        """처리가 끝났는지 여부 반환 (성공/실패/대체/취소)"""
+        return self._done.is_set()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        처리가 끝날 때까지 대기
+
+        Args:
+            timeout: 최대 대기 시간(초)
+
+        Returns:
+            bool: 끝났으면 True
+        """
+        return self._done.wait(timeout)
+
+    def get_latency(self) -> Optional[float]:
+        """제출부터 완료까지 걸린 시간(초) 반환 (끝나지 않았으면 None)"""
+        if self.completed_at is None:
+            return None
+        return self.completed_at - self.submitted_at
+
+    def _finish(self, status: str, code: Optional[int], message: Optional[str]):
+        self.status = status
+        self.code = code
+        self.message = message
+        self.completed_at = time.monotonic()
+        self._done.set()
+
+
+class UploadPipeline:
+    def __init__(self, publish_func: Callable[[str, Any, Optional[str]], Tuple[int, str]] = mqtt_publish,
+                 token: Optional[str] = None,
+                 refresh_callback: Optional[Callable[[], Optional[str]]] = None,
+                 result_callback: Optional[Callable[[UploadResult], None]] = None,
+                 workers: int = UPLOAD_WORKERS, max_pending: int = UPLOAD_LANE_MAX_PENDING,
+                 publish_async_func: Optional[Callable[[str, Any, Optional[str],
+                                                       Callable[[int, str], None]], Any]] = None,
+                 outbox=None):
+        """
+        업로드 파이프라인 초기화
+
+        Args:
+            publish_func: (토픽, 데이터, 토큰)을 받아 (응답 코드, 응답 본문)을 반환하는 전송 함수
+            token: 액세스 토큰
+            refresh_callback: 401 응답 시 호출해 새 토큰을 받는 함수 (실패 시 None 반환, 작업 스레드에서 호출)
+            result_callback: 요청 처리가 끝날 때마다 UploadResult 로 호출 (작업 스레드에서 호출)
+            workers: 작업 스레드 수 (동시에 보내는 최대 요청 수)
+            max_pending: 장치별 대기 한도 (넘으면 가장 오래된 대기 샘플을 최신 샘플로 대체)
+            publish_async_func: (토픽, 데이터, 토큰, 완료 콜백)을 받아 바로 반환하는 전송 함수
+                                (주면 publish_func 대신 사용, 완료 콜백은 (응답 코드, 응답 본문)으로 호출)
+            outbox: 열린 아웃박스 (Outbox, None이면 실패한 샘플은 버려짐)
+        """
+        self.publish_func = publish_func
+        self.publish_async_func = publish_async_func
+        self.outbox = outbox
+        self.token = token
+        self.refresh_callback = refresh_callback
+        self.result_callback = result_callback
+        self.workers = max(1, workers)
+        self.max_pending = max(1, max_pending)
+
+        self._lanes: Dict[Any, deque] = {}
+        self._ready: deque = deque()  # 대기 샘플이 있고 전송 중이 아닌 레인
+        self._busy = set()  # 전송 중인 레인
+        self._cond = threading.Condition()
+        self._refresh_lock = threading.Lock()
+        self._refresh_failed_token: Optional[str] = None
+        self._threads: List[threading.Thread] = []
+        self._live_seqs = set()  # 파이프라인에서 처리 중인 아웃박스 순번 (재전송에서 제외)
+        self._live_lock = threading.Lock()
+        self._replay_wakeup = threading.Event()
+        self._replay_thread: Optional[threading.Thread] = None
+        self.is_running = False
+
+        # 통계
+        self.submitted_count = 0
+        self.sent_count = 0
+        self.failed_count = 0
+        self.coalesced_count = 0
+        self.cancelled_count = 0
+        self.refresh_count = 0
+        self.in_flight = 0
+        self.awaiting = 0  # 전송 계층에 넘기고 완료를 기다리는 요청 수 (publish_async_func 사용 시)
+        self.replayed_count = 0
+
+    def start(self) -> bool:
+        """
+        작업 스레드 시작
+
+        Returns:
+            bool: 성공 여부
+        """
+        with self._cond:
+            if self.is_running:
+                return True
+            self.is_running = True
+            self._threads = [threading.Thread(target=self._run, daemon=True, name=f"upload-{i}")
+                             for i in range(self.workers)]
+        for thread in self._threads:
+            thread.start()
+        if self.outbox is not None:
+            self._replay_wakeup.clear()
+            self._replay_thread = threading.Thread(target=self._replay_loop, daemon=True, name="upload-replay")
+            self._replay_thread.start()
+        return True
+
+    def stop(self, timeout: float = 5.0) -> bool:
+        """
+        작업 스레드 중지 (timeout 안에서 대기 중인 샘플을 모두 보내고, 남으면 취소)
+        아웃박스를 쓰면 취소된 샘플은 아웃박스에 남아 다음 실행 때 다시 보낸다.
+
+        Args:
+            timeout: 최대 대기 시간(초)
+
+        Returns:
+            bool: 대기 샘플을 모두 처리했으면 True
+        """
+        with self._cond:
+            self.is_running = False
+            self._cond.notify_all()
+        self._replay_wakeup.set()
+        deadline = time.monotonic() + timeout
+        for thread in self._threads:
+            thread.join(max(0.0, deadline - time.monotonic()))
+        self._threads = []
+        if self._replay_thread is not None:
+            self._replay_thread.join(max(0.0, deadline - time.monotonic()))
+            self._replay_thread = None
+
+        cancelled: List[UploadResult] = []
+        with self._cond:
+            for lane in self._lanes.values():
+                cancelled.extend(lane)
+                lane.clear()
+            self._ready.clear()
+            self.cancelled_count += len(cancelled)
+        for result in cancelled:
+            result._finish("cancelled", None, "업로드 중지로 취소됨")
+            self._settle(result)
+            self._notify(result)
+        if self.outbox is not None:
+            self.outbox.flush_acks()
+        return not cancelled
+
+    def set_token(self, token: Optional[str]):
+        """
+        액세스 토큰 교체 (재로그인 후 호출)
+
+        Args:
+            token: 새 액세스 토큰
+        """
+        with self._refresh_lock:
+            self.token = token
+            self._refresh_failed_token = None
+
+    def submit(self, topic: str, payload: Any, device_id=None) -> UploadResult:
+        """
+        업로드 요청 추가 (바로 반환, 전송은 작업 스레드에서)
+
+        Args:
+            topic: MQTT 토픽
+            payload: 보낼 데이터 (작업 스레드에서 읽으므로 이후 변경하면 안 됨)
+            device_id: 장치 id (None이면 토픽으로 레인 구분)
+
+        Returns:
+            UploadResult: 요청 결과 (처리가 끝나면 채워짐)
+        """
+        result = UploadResult(topic, payload, device_id)
+        if self.outbox is not None:
+            with self._live_lock:
+                result.outbox_seq = self.outbox.put(topic, payload, device_id)
+                if result.outbox_seq is not None:
+                    self._live_seqs.add(result.outbox_seq)
+        key = device_id if device_id is not None else topic
+        dropped = None
+        with self._cond:
+            self.submitted_count += 1
+            lane = self._lanes.get(key)
+            if lane is None:
+                lane = self._lanes[key] = deque()
+            if len(lane) >= self.max_pending:
+                dropped = lane.popleft()
+                self.coalesced_count += 1
+            elif not lane and key not in self._busy:
+                self._ready.append(key)
+            lane.append(result)
+            self._cond.notify()
+        if dropped is not None:
+            dropped._finish("coalesced", None, "대기열 초과로 최신 샘플로 대체됨")
+            self._settle(dropped)
+            self._notify(dropped)
+        return result
+
+    def get_pending_count(self) -> int:
+        """전송 대기 중인 샘플 수 반환 (전송 중인 요청 제외)"""
+        with self._cond:
+            return sum(len(lane) for lane in self._lanes.values())
+
+    def get_stats(self) -> Dict[str, Any]:
+        """파이프라인 통계 반환 (제출/성공/실패/대체/취소 수, 대기/전송 중 수)"""
+        with self._cond:
+            return {
+                "submitted": self.submitted_count,
+                "sent": self.sent_count,
+                "failed": self.failed_count,
+                "coalesced": self.coalesced_count,
+                "cancelled": self.cancelled_count,
+                "refreshed": self.refresh_count,
+                "pending": sum(len(lane) for lane in self._lanes.values()),
+                "in_flight": self.in_flight + self.awaiting,
+                "replayed": self.replayed_count,
+                "outbox": self.outbox.get_count() if self.outbox is not None else 0,
+            }
+
+    def _run(self):
+        """작업 루프 (중지 요청 후에도 대기 샘플이나 완료를 기다리는 요청이 남아 있으면 계속 처리)"""
+        while True:
+            with self._cond:
+                while not self._ready and (self.is_running or self.awaiting):
+                    self._cond.wait()
+                if not self._ready:
+                    return
+                key = self._ready.popleft()
+                lane = self._lanes[key]
+                # 비동기 전송은 넘기는 비용이 작으므로 레인에 쌓인 요청을 한 번에 넘김
+                count = len(lane) if self.publish_async_func is not None else 1
+                results = [lane.popleft() for _ in range(count)]
+                self._busy.add(key)
+                self.in_flight += count
+            try:
+                for result in results:
+                    if self.publish_async_func is not None:
+                        self._send_async(result)
+                    else:
+                        self._send(result)
+            finally:
+                with self._cond:
+                    self._busy.discard(key)
+                    self.in_flight -= count
+                    if self._lanes.get(key):
+                        self._ready.append(key)
+                        self._cond.notify()
+                    else:
+                        self._lanes.pop(key, None)
+
+    def _send(self, result: UploadResult):
+        """요청 하나 전송 (401이면 토큰을 재발급받아 한 번 더 시도)"""
+        token = self.token
+        try:
+            code, message = self.publish_func(result.topic, result.payload, token)
+            result.attempts += 1
+            if code == 401 and self.refresh_callback is not None:
+                new_token = self._refresh(token)
+                if new_token:
+                    result.token_refreshed = True
+                    code, message = self.publish_func(result.topic, result.payload, new_token)
+                    result.attempts += 1
+        except Exception as e:
+            code, message = 500, f"예외 발생: {str(e)}"
+        self._record(result, code, message)
+
+    def _send_async(self, result: UploadResult):
+        """전송 계층에 넘기고 바로 반환 (401 로 되돌아온 요청은 토큰을 재발급받아 다시 넘김)"""
+        token = self.token
+        if result._failed_token is not None:
+            new_token = self._refresh(result._failed_token)
+            result._failed_token = None
+            if not new_token:
+                self._record(result, result.code, result.message)
+                return
+            result.token_refreshed = True
+            token = new_token
+        with self._cond:
+            self.awaiting += 1
+
+        def on_done(code, message):
+            self._on_async_done(result, token, code, message)
+
+        try:
+            self.publish_async_func(result.topic, result.payload, token, on_done)
+        except Exception as e:
+            on_done(500, f"예외 발생: {str(e)}")
+
+    def _on_async_done(self, result: UploadResult, token: Optional[str], code: int, message: str):
+        """비동기 전송 완료 처리 (전송 계층의 스레드에서 호출)"""
+        result.attempts += 1
+        with self._cond:
+            self.awaiting -= 1
+            self._cond.notify_all()
+        if code == 401 and self.refresh_callback is not None and not result.token_refreshed:
+            # 재발급은 작업 스레드에서 하도록 레인 맨 앞에 다시 넣음
+            result.code, result.message = code, message
+            result._failed_token = token
+            self._requeue(result)
+            return
+        self._record(result, code, message)
+
+    def _requeue(self, result: UploadResult):
+        key = result.device_id if result.device_id is not None else result.topic
+        with self._cond:
+            lane = self._lanes.get(key)
+            if lane is None:
+                lane = self._lanes[key] = deque()
+            if not lane and key not in self._busy:
+                self._ready.append(key)
+            lane.appendleft(result)
+            self._cond.notify()
+
+    def _record(self, result: UploadResult, code: Optional[int], message: Optional[str]):
+        """결과 기록 및 통계 갱신, 결과 콜백 호출"""
+        status = "sent" if code == 200 else "failed"
+        with self._cond:
+            if status == "sent":
+                self.sent_count += 1
+            else:
+                self.failed_count += 1
+        result._finish(status, code, message)
+        self._settle(result)
+        self._notify(result)
+
+    @staticmethod
+    def _is_delivered(code: Optional[int]) -> bool:
+        """아웃박스에서 지워도 되는 결과인지 여부 (성공 또는 다시 보내도 소용없는 요청 오류)"""
+        if code is None:
+            return False
+        return code == 200 or (400 <= code < 500 and code not in (401, 408, 429))
+
+    def _settle(self, result: UploadResult):
+        """처리가 끝난 샘플을 아웃박스에서 지우거나 재전송 대상으로 남김"""
+        if result.outbox_seq is None:
+            return
+        # 처리 중 표시를 먼저 지우면 재전송 스레드가 전송 완료 표시 전의 행을 다시 보낼 수 있으므로 ack 먼저
+        if self._is_delivered(result.code):
+            self.outbox.ack(result.outbox_seq)
+        with self._live_lock:
+            self._live_seqs.discard(result.outbox_seq)
+
+    def _replay_loop(self):
+        """아웃박스 재전송 루프 (저장 순서대로, 실패하면 outbox.retry_interval 뒤 다시 시도)"""
+        outbox = self.outbox
+        cursor = 0
+        next_time = time.monotonic()
+        while self.is_running:
+            outbox.expire()
+            with self._live_lock:
+                rows = outbox.peek(outbox.replay_batch, after=cursor)
+                live = set(self._live_seqs)
+            if not rows:
+                # 끝까지 읽었으면 처음부터 다시 (처리 중에 실패해 남은 샘플 포함)
+                cursor = 0
+                self._replay_wakeup.wait(1.0)
+                continue
+            batch = [row for row in rows if row[0] not in live]
+            failed_seq = None
+            if batch:
+                failed_seq, next_time = self._replay_batch(batch, next_time)
+            if failed_seq is None:
+                cursor = rows[-1][0]
+            else:
+                cursor = failed_seq - 1
+                self._replay_wakeup.wait(outbox.retry_interval)
+
+    def _replay_batch(self, batch: List[Tuple[int, str, Any, Any]], next_time: float):
+        """
+        메시지 묶음 재전송 (속도 제한 적용)
+
+        Args:
+            batch: (순번, 토픽, 데이터, 장치 id) 목록 (순번 순)
+            next_time: 다음 메시지를 보낼 수 있는 시각 (time.monotonic 기준)
+
+        Returns:
+            (처음 실패한 순번 또는 None, 다음 메시지를 보낼 수 있는 시각)
+        """
+        interval = 1.0 / self.outbox.replay_rate if self.outbox.replay_rate else 0.0
+        codes: Dict[int, Tuple[int, str]] = {}
+        done = threading.Semaphore(0)
+        handed: List[Tuple[int, str, Any, Optional[str]]] = []
+        for seq, topic, payload, device_id in batch:
+            delay = next_time - time.monotonic()
+            if not self.is_running or (delay > 0 and self._replay_wakeup.wait(delay)):
+                break
+            next_time = max(next_time, time.monotonic()) + interval
+            if self.publish_async_func is not None:
+                token = self.token
+                self._hand_off_replay(seq, topic, payload, token, codes, done)
+                handed.append((seq, topic, payload, token))
+            else:
+                codes[seq] = self._publish_replay(topic, payload)
+                if not self._is_delivered(codes[seq][0]):
+                    break
+        self._wait_replay(done, len(handed))
+        # 401 로 돌아온 메시지는 토큰을 재발급받아 한 번 더 넘김 (_publish_replay 와 같은 규칙)
+        unauthorized = [item for item in handed if codes.get(item[0], (None, None))[0] == 401]
+        if unauthorized and self.refresh_callback is not None and self.is_running:
+            new_token = self._refresh(unauthorized[0][3])
+            if new_token:
+                done = threading.Semaphore(0)
+                for seq, topic, payload, _ in unauthorized:
+                    self._hand_off_replay(seq, topic, payload, new_token, codes, done)
+                self._wait_replay(done, len(unauthorized))
+
+        failed_seq = None
+        for seq, _, _, _ in batch:
+            code = codes.get(seq, (None, None))[0]
+            if self._is_delivered(code):
+                self.outbox.ack(seq)
+                with self._cond:
+                    self.replayed_count += 1
+            elif failed_seq is None:
+                failed_seq = seq
+        return failed_seq, next_time
+
+    def _hand_off_replay(self, seq: int, topic: str, payload: Any, token: Optional[str],
+                         codes: Dict[int, Tuple[int, str]], done: threading.Semaphore):
+        """
+        재전송 메시지 하나를 전송 계층에 넘김 (완료되면 codes 에 기록하고 done 해제)
+
+        Args:
+            seq: 아웃박스 순번
+            topic: 토픽
+            payload: 데이터
+            token: 사용할 토큰
+            codes: 순번별 (응답 코드, 메시지)
+            done: 완료마다 해제할 세마포어
+        """
+        def on_done(code, message):
+            codes[seq] = (code, message)
+            done.release()
+
+        try:
+            self.publish_async_func(topic, payload, token, on_done)
+        except Exception as e:
+            on_done(500, f"예외 발생: {str(e)}")
+
+    @staticmethod
+    def _wait_replay(done: threading.Semaphore, count: int):
+        """넘긴 재전송 메시지가 모두 끝날 때까지 대기 (한 건당 최대 60초)"""
+        for _ in range(count):
+            if not done.acquire(timeout=60):
+                break
+
+    def _publish_replay(self, topic: str, payload: Any) -> Tuple[int, str]:
+        """재전송 한 건 (401이면 토큰을 재발급받아 한 번 더 시도)"""
+        token = self.token
+        try:
+            code, message = self.publish_func(topic, payload, token)
+            if code == 401 and self.refresh_callback is not None:
+                new_token = self._refresh(token)
+                if new_token:
+                    code, message = self.publish_func(topic, payload, new_token)
+            return code, message
+        except Exception as e:
+            return 500, f"예외 발생: {str(e)}"
+
+    def _refresh(self, failed_token: Optional[str]) -> Optional[str]:
+        """
+        토큰 재발급 (여러 작업 스레드가 동시에 401을 받아도 한 번만 재발급)
+
+        Args:
+            failed_token: 401 응답을 받은 토큰
+
+        Returns:
+            Optional[str]: 사용할 새 토큰 (실패 시 None)
+        """
+        with self._refresh_lock:
+            if self.token and self.token != failed_token:
+                return self.token  # 다른 스레드가 이미 재발급함
+            if failed_token == self._refresh_failed_token:
+                return None  # 같은 토큰으로 이미 재발급에 실패함 (set_token 전까지 재시도 안 함)
+            try:
+                new_token = self.refresh_callback()
+            except Exception as e:
+                print(f"토큰 재발급 오류: {e}")
+                new_token = None
+            if new_token:
+                self.token = new_token
+                self.refresh_count += 1
+            else:
+                self._refresh_failed_token = failed_token
+            return new_token
+
+    def _notify(self, result: UploadResult):
+        if self.result_callback is None:
+            return
+        try:
+            self.result_callback(result)
+        except Exception as e:
+            print(f"업로드 결과 콜백 오류: {e}")
@@ -7,10 +7,15 @@ import os
 import csv
 from datetime import datetime
 import time
+import threading
 from typing import Dict, Any, Callable
 from ..core.serial_handler import SerialHandler
 from ..core.csv_handler import CsvHandler
 from ..core.data_processor import DataProcessor
+from ..core.csv_loader import StreamingCsvLoader
+from ..core.session_catalog import SessionCatalog
+from ..core.export_job import ExportJob
+from ..core.parquet_handler import PYARROW_AVAILABLE
 from ..config.settings import DEFAULT_DATA_DIR, CSV_TIMESTAMP_FORMAT, DEFAULT_BAUD_RATE, DEFAULT_PORT
 
 class DataControl(ttk.LabelFrame):
@@ -44,6 +49,11 @@ class DataControl(ttk.LabelFrame):
         self.csv_writer = None
         self.last_update_time = 0
         self.update_count = 0
+        self.loader = None  # 진행 중인 스트리밍 로더
+        self._load_result = None
+        self._load_summary = ""
+        self.catalog = SessionCatalog(DEFAULT_DATA_DIR)  # 수집 파일 메타데이터
+        self.export_job = None  # 진행 중인 내보내기 작업
         
         # UI 초기화
         self.setup_ui()
@@ -117,7 +127,7 @@ class DataControl(ttk.LabelFrame):
         self.data_limit_combo = ttk.Combobox(
             limit_frame,
             textvariable=self.data_limit_var,
-            values=["최근 100개", "최근 500개", "최근 1000개"],
+            values=["최근 100개", "최근 500개", "최근 1000개", "제한 없음"],
             state="readonly",
             width=12
         )
@@ -324,7 +334,8 @@ class DataControl(ttk.LabelFrame):
         try:
             # CSV 파일 초기화
             current_time = datetime.now().strftime(CSV_TIMESTAMP_FORMAT)
-            csv_path = os.path.join(DEFAULT_DATA_DIR, f"duet_data_{current_time}.csv")
+            extension = getattr(self.csv_handler, "FILE_EXTENSION", ".csv")
+            csv_path = os.path.join(DEFAULT_DATA_DIR, f"duet_data_{current_time}{extension}")
             
             # 데이터 디렉토리 확인
             os.makedirs(DEFAULT_DATA_DIR, exist_ok=True)
@@ -435,19 +446,27 @@ class DataControl(ttk.LabelFrame):
             print(f"데이터 추가 중 오류: {e}")
             
     def save_csv(self):
-        """CSV 파일 저장"""
+        """CSV 파일 저장 (작업 스레드에서 청크 단위로 기록하고 진행률 표시, 다시 누르면 취소)"""
+        # 저장 중이면 취소
+        if self.export_job is not None:
+            self.export_job.cancel()
+            return
+            
         try:
-            # 현재 데이터프레임 가져오기
-            df = self.data_processor.get_dataframe()
+            # 디스크로 옮긴 구간 + 메모리 데이터 스냅샷 (작업 중에도 수신/그래프 갱신은 계속됨)
+            source = self.data_processor.get_export_source()
             
-            if df.empty:
+            if source.total_rows == 0:
                 messagebox.showinfo("알림", "저장할 데이터가 없습니다.")
                 return
             
-            # 저장 경로 선택
+            # 저장 경로 선택 (확장자로 형식 결정)
+            filetypes = [("CSV 파일", "*.csv"), ("압축 CSV 파일", "*.csv.gz")]
+            if PYARROW_AVAILABLE:
+                filetypes.append(("Parquet 파일", "*.parquet"))
             file_path = filedialog.asksaveasfilename(
                 defaultextension=".csv",
-                filetypes=[("CSV 파일", "*.csv"), ("모든 파일", "*.*")],
+                filetypes=filetypes + [("모든 파일", "*.*")],
                 initialdir=DEFAULT_DATA_DIR,
                 title="CSV 파일 저장"
             )
@@ -455,23 +474,53 @@ class DataControl(ttk.LabelFrame):
             if not file_path:
                 return
             
-            # CSV 저장
-            success = self.csv_handler.save_dataframe(df, file_path)
-            
-            if success:
-                messagebox.showinfo("성공", f"데이터가 성공적으로 저장되었습니다: {file_path}")
-            else:
-                messagebox.showerror("저장 실패", "데이터 저장 중 오류가 발생했습니다.")
+            # 백그라운드 저장 시작
+            self.export_job = ExportJob(source, file_path)
+            self.save_button.config(text="저장 취소")
+            self.status_label.config(text="저장 중... 0%")
+            self.export_job.start()
+            self.after(200, self._poll_export)
                 
         except Exception as e:
+            self.export_job = None
             messagebox.showerror("저장 오류", f"CSV 파일 저장 중 오류 발생: {e}")
             
+    def _poll_export(self):
+        """저장 진행률 표시 (Tk 스레드에서 주기적으로 호출)"""
+        job = self.export_job
+        if job is None:
+            return
+        if job.result is None:
+            self.status_label.config(text=f"저장 중... {job.progress * 100:.0f}% ({job.rows_written:,}행)")
+            self.after(200, self._poll_export)
+            return
+            
+        self.export_job = None
+        self.save_button.config(text="CSV 파일 저장")
+        self.status_label.config(text="데이터 수집 중..." if self.is_collecting else "준비")
+        if isinstance(job.result, Exception):
+            messagebox.showerror("저장 실패", f"데이터 저장 중 오류가 발생했습니다: {job.result}")
+        elif job.result == "cancelled":
+            messagebox.showinfo("알림", "저장이 취소되었습니다.")
+        elif job.warnings:
+            messagebox.showwarning(
+                "저장 완료 (일부 누락)",
+                f"데이터를 저장했지만 일부가 빠졌습니다: {job.file_path}\n\n" + "\n".join(job.warnings)
+            )
+        else:
+            messagebox.showinfo("성공", f"데이터가 성공적으로 저장되었습니다: {job.file_path}")
+            
     def load_csv(self):
-        """CSV 파일 로드"""
+        """CSV 파일 로드 (작업 스레드에서 청크 단위로 읽고 진행률 표시, 다시 누르면 취소)"""
+        # 로드 중이면 취소
+        if self.loader is not None:
+            self.loader.cancel()
+            return
+            
         try:
             # 파일 경로 선택
             file_path = filedialog.askopenfilename(
-                filetypes=[("CSV 파일", "*.csv"), ("모든 파일", "*.*")],
+                filetypes=[("CSV 파일", "*.csv *.csv.gz *.csv.zst"), ("Parquet 파일", "*.parquet"), ("SQLite 데이터베이스", "*.db"), ("바이너리 로그", "*.dlog"), ("모든 파일", "*.*")],
                 initialdir=DEFAULT_DATA_DIR,
                 title="CSV 파일 로드"
             )
@@ -479,23 +528,85 @@ class DataControl(ttk.LabelFrame):
             if not file_path:
                 return
             
-            # CSV 로드
-            df = self.csv_handler.load_csv(file_path)
-            
-            if df is None or df.empty:
-                messagebox.showerror("로드 실패", "CSV 파일을 로드할 수 없거나 비어 있습니다.")
-                return
-            
-            # 데이터 프로세서에 업데이트
-            if hasattr(self.data_processor, 'set_dataframe'):
+            if not file_path.endswith((".csv", ".csv.gz", ".csv.zst")):
+                # CSV가 아니면 핸들러로 한 번에 로드
+                df = self.csv_handler.load_csv(file_path)
+                if df is None or df.empty:
+                    messagebox.showerror("로드 실패", "파일을 로드할 수 없거나 비어 있습니다.")
+                    return
                 self.data_processor.set_dataframe(df)
                 messagebox.showinfo("성공", f"데이터가 성공적으로 로드되었습니다: {len(df)}행")
-            else:
-                messagebox.showerror("기능 부재", "데이터 프로세서에 데이터프레임을 설정하는 메서드가 없습니다.")
+                return
+            
+            # 스트리밍 로드 시작 (카탈로그에 메타데이터가 있으면 행 수 기준 진행률과 요약 표시)
+            meta = self.catalog.get(file_path)
+            self._load_summary = self._describe_session(meta)
+            self.loader = StreamingCsvLoader(file_path, total_rows=meta.get("rows") if meta else None,
+                                             cache=getattr(self.csv_handler, "load_cache", None))
+            self._load_result = None
+            self.data_processor.clear_data()
+            self.load_button.config(text="로드 취소")
+            self.status_label.config(text=f"로드 중... 0% {self._load_summary}")
+            threading.Thread(target=self._load_worker, args=(self.loader,), daemon=True).start()
+            self.after(200, self._poll_load)
                 
         except Exception as e:
+            self.loader = None
             messagebox.showerror("로드 오류", f"CSV 파일 로드 중 오류 발생: {e}")
             
+    @staticmethod
+    def _describe_session(meta) -> str:
+        """
+        세션 메타데이터 한 줄 요약
+        
+        Args:
+            meta: 카탈로그 메타데이터 (None이면 빈 문자열)
+            
+        Returns:
+            str: "[장치 817, 2025-01-01 00:00 ~ 2025-01-01 06:00, 21,600행]" 형식 요약
+        """
+        if not meta:
+            return ""
+        parts = []
+        if meta.get("device_ids"):
+            parts.append("장치 " + ", ".join(str(d) for d in meta["device_ids"]))
+        if meta.get("start") and meta.get("end"):
+            parts.append(f"{meta['start'][:16].replace('T', ' ')} ~ {meta['end'][:16].replace('T', ' ')}")
+        parts.append(f"{meta.get('rows', 0):,}행")
+        return "[" + ", ".join(parts) + "]"
+            
+    def _load_worker(self, loader: StreamingCsvLoader):
+        """로드 작업 스레드: 청크를 데이터 프로세서에 바로 적재"""
+        try:
+            loader.fold_into(self.data_processor)
+            self._load_result = "cancelled" if loader.is_cancelled() else "done"
+        except Exception as e:
+            self._load_result = e
+            
+    def _poll_load(self):
+        """로드 진행률 표시 (Tk 스레드에서 주기적으로 호출)"""
+        loader = self.loader
+        if loader is None:
+            return
+        if self._load_result is None:
+            self.status_label.config(
+                text=f"로드 중... {loader.progress * 100:.0f}% ({loader.rows_read:,}행) {self._load_summary}")
+            self.after(200, self._poll_load)
+            return
+            
+        result = self._load_result
+        self.loader = None
+        self.load_button.config(text="CSV 파일 로드")
+        self.status_label.config(text="준비")
+        if isinstance(result, Exception):
+            messagebox.showerror("로드 오류", f"CSV 파일 로드 중 오류 발생: {result}")
+        elif result == "cancelled":
+            messagebox.showinfo("알림", f"로드가 취소되었습니다: {loader.rows_read:,}행까지 읽음")
+        elif loader.rows_read == 0:
+            messagebox.showerror("로드 실패", "CSV 파일을 로드할 수 없거나 비어 있습니다.")
+        else:
+            messagebox.showinfo("성공", f"데이터가 성공적으로 로드되었습니다: {loader.rows_read:,}행")
+            
     def data_received_callback(self, data: Dict[str, Any]):
         """
         시리얼 데이터 수신 콜백
@@ -4,8 +4,9 @@ LED 디스플레이 모듈
 import tkinter as tk
 from tkinter import ttk
 from typing import Dict, Any, Optional, List
-from duet_monitor.config.settings import LED_COLORS, LED_SIZE
+from duet_monitor.config.settings import LED_SIZE
 from duet_monitor.utils.helpers import get_unit_for_sensor
+from duet_monitor.core.state_classifier import SensorStateClassifier
 
 class LedDisplay(ttk.LabelFrame):
     def __init__(self, parent: tk.Widget):
@@ -39,6 +40,9 @@ class LedDisplay(ttk.LabelFrame):
         self.status_led = None
         self.is_active = False
         
+        # 상태가 전달되지 않았을 때 사용할 판정기
+        self.state_classifier = SensorStateClassifier()
+        
         # UI 초기화
         self.setup_ui()
         
@@ -295,12 +299,13 @@ class LedDisplay(ttk.LabelFrame):
         except Exception as e:
             print(f"LED 생성 오류: {e}")
             
-    def update_basic_leds(self, values: Dict[str, Any]):
+    def update_basic_leds(self, values: Dict[str, Any], states: Optional[Dict[str, str]] = None):
         """
         기본 LED 상태 업데이트
         
         Args:
             values: 센서 값 딕셔너리
+            states: 센서별 상태 (None이면 직접 판정)
         """
         try:
             # 값이 없는 경우 처리
@@ -318,78 +323,17 @@ class LedDisplay(ttk.LabelFrame):
                 if numeric_sensors:
                     self.create_basic_leds(numeric_sensors)
             
+            # 센서별 상태는 설정의 규칙 표로 한 번에 판정
+            if states is None:
+                states = self.state_classifier.classify(values)
+            
             # LED 상태 업데이트
             for name, (canvas, led) in self.leds.items():
                 if name in values:
                     value = values[name]
                     if isinstance(value, (int, float)) and not isinstance(value, bool):
-                        # 센서별 공식/권장 정상 범위에 따른 색상
-                        color = 'gray'  # 기본값
-                        # 온도
-                        if name.lower() == 'temperature':
-                            if value < 18:
-                                color = 'blue'
-                            elif 18 <= value <= 26:
-                                color = 'green'
-                            elif 26 < value <= 30:
-                                color = 'yellow'
-                            else:
-                                color = 'red'
-                        # 습도
-                        elif name.lower() == 'humidity':
-                            if value < 30:
-                                color = 'blue'
-                            elif 30 <= value < 40 or 60 < value <= 70:
-                                color = 'yellow'
-                            elif 40 <= value <= 60:
-                                color = 'green'
-                            else:
-                                color = 'red'
-                        # 압력(일반적으로 980~1050hPa가 정상)
-                        elif name.lower() == 'pressure':
-                            if 980 <= value <= 1050:
-                                color = 'green'
-                            elif 950 <= value < 980 or 1050 < value <= 1080:
-                                color = 'yellow'
-                            else:
-                                color = 'red'
-                        # CO2 (eco2)
-                        elif name.lower() == 'eco2':
-                            if 400 <= value <= 1000:
-                                color = 'green'
-                            elif 1000 < value <= 2000:
-                                color = 'yellow'
-                            else:
-                                color = 'red'
-                        # TVOC
-                        elif name.lower() == 'tvoc':
-                            if value <= 200:
-                                color = 'green'
-                            elif 200 < value <= 400:
-                                color = 'yellow'
-                        # 미세먼지(pm10, pm25, pm100)
-                        elif 'pm10' in name.lower() or 'pm25' in name.lower() or 'pm100' in name.lower():
-                            if value <= 15:
-                                color = 'green'
-                            elif 15 < value <= 35:
-                                color = 'yellow'
-                            else:
-                                color = 'red'
-                        # pt1, pt2 내부 미세먼지 값
-                        elif name.startswith('pt1_') or name.startswith('pt2_'):
-                            if 'pm10standard' in name.lower() or 'pm25standard' in name.lower() or 'pm100standard' in name.lower():
-                                if value <= 15:
-                                    color = 'green'
-                                elif 15 < value <= 35:
-                                    color = 'yellow'
-                                else:
-                                    color = 'red'
-                            else:
-                                color = 'green'  # 기타 파티클은 별도 기준 없음
-                        # 기타 센서(임계값 미정)
-                        else:
-                            color = 'green'
                         # LED 색상 업데이트
+                        color = self.state_classifier.get_color(states.get(name, "unknown"))
                         canvas.itemconfig(led, fill=color)
                         # 레이블에 값 업데이트
                         unit = get_unit_for_sensor(name)
@@ -400,16 +344,17 @@ class LedDisplay(ttk.LabelFrame):
         except Exception as e:
             print(f"LED 업데이트 오류: {e}")
             
-    def update_leds(self, values: Dict[str, Any]):
+    def update_leds(self, values: Dict[str, Any], states: Optional[Dict[str, str]] = None):
         """
         LED 상태 업데이트
         
         Args:
             values: 센서 값 딕셔너리
+            states: 센서별 상태 (None이면 직접 판정)
         """
         try:
             # 기본 LED 업데이트
-            self.update_basic_leds(values)
+            self.update_basic_leds(values, states)
             
             # 초기화되지 않은 경우 LED 생성
             if not self.initialized and values:
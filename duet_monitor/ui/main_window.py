@@ -16,12 +16,16 @@ from ..core.data_collector import DataCollector
 from ..core.data_processor import DataProcessor
 from ..core.serial_handler import SerialHandler
 from ..core.csv_handler import CsvHandler
+from ..core.ingest_batcher import IngestBatcher
+from ..core.journal import WriteAheadJournal
 from .graph_view import GraphView
 from .led_display import LedDisplay
 from .data_table import DataTable
 from .stats_view import StatsView
 from ..config.settings import (
-    DEFAULT_BAUD_RATE, DEFAULT_PORT, APP_TITLE, FONT_FAMILY, SENSOR_UNITS, GRAPH_COLORS
+    DEFAULT_BAUD_RATE, DEFAULT_PORT, APP_TITLE, FONT_FAMILY, SENSOR_UNITS, GRAPH_COLORS,
+    INGEST_BATCH_SIZE, INGEST_BATCH_INTERVAL_MS, JOURNAL_ENABLED, DEFAULT_DATA_DIR, CSV_TIMESTAMP_FORMAT,
+    CSV_COMPRESSION_WAIT_S
 )
 import os
 import sys
@@ -69,6 +73,23 @@ class MainWindow:
         self._update_scheduled = False
         self._last_sensor_columns = []  # 마지막 센서 컬럼 목록 저장
         
+        # 선기록 저널 (지난 실행에서 반영되지 않은 배치 복구)
+        self.journal = None
+        if JOURNAL_ENABLED:
+            self.journal = WriteAheadJournal()
+            self._recover_journal()
+            if not self.journal.open():
+                self.journal = None
+        
+        # 수신 샘플을 모아서 한 번에 데이터프레임/저장 파일에 반영
+        self.ingest_batcher = IngestBatcher(
+            self.commit_batch,
+            INGEST_BATCH_SIZE,
+            INGEST_BATCH_INTERVAL_MS,
+            journal=self.journal
+        )
+        self.ingest_batcher.start()
+        
         # UI 초기화
         self.setup_ui()
         
@@ -79,6 +100,7 @@ class MainWindow:
         if "--test" in sys.argv:
             self.data_processor.generate_test_data(100)
             self.data_received_callback(self.data_processor.get_latest_values())
+            self.ingest_batcher.flush()
             
             # LED 디스플레이 테스트 데이터 전송
             if hasattr(self, 'led_display'):
@@ -411,12 +433,12 @@ class MainWindow:
             # 통계 정보 업데이트
             if hasattr(self, 'stats_view'):
                 latest_values = self.data_processor.get_latest_values()
-                self.stats_view.update_stats(latest_values)
+                self.stats_view.update_stats(latest_values, self.data_processor.get_twin_stats())
             
             # LED 디스플레이 업데이트
             if hasattr(self, 'led_display'):
                 latest_values = self.data_processor.get_latest_values()
-                self.led_display.update_leds(latest_values)
+                self.led_display.update_leds(latest_values, self.data_processor.get_sensor_states())
             
             # 센서 제어 패널 업데이트
             if hasattr(self, 'sensor_control'):
@@ -605,19 +627,84 @@ class MainWindow:
         """
         from duet_monitor.utils.debug import debug_print_main
         debug_print_main(f"[MainWindow] data_received_callback 진입: {data}")
-        self.data_processor.update_dataframe(data)
-        df = self.data_processor.get_dataframe()
-        debug_print_main(f"[MainWindow] data_received_callback 후 DataFrame 컬럼: {list(df.columns)}")
-        debug_print_main(f"[MainWindow] data_received_callback 후 DataFrame 마지막 행: {df.iloc[-1].to_dict() if not df.empty else '없음'}")
-        # 센서 체크박스는 컬럼이 바뀔 때만 갱신
-        current_columns = list(df.columns) if df is not None else []
+        # 데이터프레임 반영은 배치 수집기가 크기/시간 조건에 따라 일괄 처리
+        self.ingest_batcher.add(data)
+        
+    def commit_batch(self, batch):
+        """
+        배치 커밋: 데이터프레임에 반영하고 수집 중이면 저장 파일에 추가
+        
+        Args:
+            batch: 샘플 딕셔너리 리스트
+            
+        Returns:
+            저장 파일 추가에 실패하면 False, 추가했으면 저장소의 동기화 완료 콜백 등록 함수
+            (저널 반영 완료는 디스크 동기화 후 표시), 저장하지 않으면 None
+        """
+        self.data_processor.update_dataframe_batch(batch)
+        data_control = getattr(self, 'data_control', None)
+        if data_control is not None and data_control.is_collecting and self.csv_handler:
+            if not self.csv_handler.append_batch(batch):
+                return False
+            return getattr(self.csv_handler, "when_durable", None)
+        return None
+            
+    def _recover_journal(self):
+        """저널에 남은 미반영 배치를 복구 파일(duet_recovered_*)에 기록"""
+        try:
+            pending = self.journal.recover()
+            if not pending:
+                return
+            current_time = datetime.now().strftime(CSV_TIMESTAMP_FORMAT)
+            extension = getattr(self.csv_handler, "FILE_EXTENSION", ".csv")
+            path = os.path.join(DEFAULT_DATA_DIR, f"duet_recovered_{current_time}{extension}")
+            if not self.csv_handler.initialize(path):
+                return
+            rows = 0
+            applied = []
+            for seq, batch in pending:
+                if self.csv_handler.append_batch(batch):
+                    applied.append(seq)
+                    rows += len(batch)
+            # 닫으면서 디스크에 동기화된 배치만 반영 완료 표시
+            if not self.csv_handler.close():
+                applied = []
+            self.journal.open()
+            for seq in applied:
+                self.journal.mark_applied(seq)
+            self.journal.close()
+            print(f"저널 복구: 배치 {len(pending)}개({rows}행) → {path}")
+        except Exception as e:
+            print(f"저널 복구 실패: {e}")
+            
+    def refresh_sensor_columns(self):
+        """컬럼 목록이 바뀌었을 때만 센서 체크박스/그래프 센서 목록 갱신"""
+        current_columns = self.data_processor.get_columns()
         if current_columns != self._last_sensor_columns:
             if hasattr(self, 'update_sensor_checkboxes'):
                 self.update_sensor_checkboxes()
             self._last_sensor_columns = current_columns
-        # graph_view 등은 필요시만 갱신
-        if hasattr(self, 'graph_view') and hasattr(self.graph_view, 'update_sensor_list'):
-            self.graph_view.update_sensor_list(df)
+            # graph_view 등은 필요시만 갱신
+            if hasattr(self, 'graph_view') and hasattr(self.graph_view, 'update_sensor_list'):
+                self.graph_view.update_sensor_list(self.data_processor.get_dataframe())
+        
+    def update_alarm_status(self, states: Dict[str, str]):
+        """
+        경보 상태 센서를 상태 표시줄에 표시
+        
+        Args:
+            states: 센서별 상태
+        """
+        status_message_type = getattr(self, 'status_message_type', {"current": None})
+        if status_message_type.get("current") == "error":
+            return
+        alarms = self.data_processor.state_classifier.get_alarms(states)
+        if alarms:
+            self.status_label.config(text=f"⚠ 경보: {', '.join(alarms[:5])}", foreground="red")
+            status_message_type["current"] = "alarm"
+        elif status_message_type.get("current") == "alarm":
+            self.status_label.config(text="데이터 수집 중...", foreground="green")
+            status_message_type["current"] = None
         
     def on_closing(self):
         """윈도우 종료 이벤트 핸들러"""
@@ -625,6 +712,20 @@ class MainWindow:
         if self.serial_handler:
             self.serial_handler.close()
             
+        # 남은 배치 커밋 후 저장 파일을 닫아 동기화 (반영 완료 표시가 저널에 기록되도록 저널보다 먼저)
+        self.ingest_batcher.stop()
+        if self.csv_handler:
+            self.csv_handler.close()
+            # 마지막 세그먼트 압축이 끝날 때까지 대기 (시간 안에 못 끝내면 다음 실행 때 다시 압축)
+            wait_compression = getattr(self.csv_handler, "wait_compression", None)
+            if wait_compression and not wait_compression(CSV_COMPRESSION_WAIT_S):
+                print("세그먼트 압축을 끝내지 못했습니다. 다음 실행 때 다시 압축합니다.")
+        if self.journal:
+            self.journal.close()
+            
+        # 디스크로 옮긴 이번 실행의 기록 삭제
+        self.data_processor.close()
+            
         # 종료
         self.root.destroy()
         
@@ -681,24 +782,33 @@ class MainWindow:
 
     def periodic_update_graph(self):
         """주기적 그래프/LED/통계/테이블 등 전체 UI 갱신"""
-        self.update_graph()
-        # LED 디스플레이
-        if hasattr(self, 'led_display'):
-            latest_values = self.data_processor.get_latest_values()
-            self.led_display.update_leds(latest_values)
-        # 센서 제어 패널 7세그먼트
-        if hasattr(self, 'sensor_control'):
-            latest_values = self.data_processor.get_latest_values()
-            self.sensor_control.update_sensor_list(latest_values)
-            self.sensor_control.update_display(latest_values)
-        # 테이블/통계 (경량 모드 아닐 때만)
-        if not self.is_lightweight_mode:
-            if hasattr(self, 'data_table'):
-                df = self.data_processor.get_dataframe()
-                if df is not None and not df.empty:
-                    self.data_table.update_table(df)
-            if hasattr(self, 'stats_view'):
+        try:
+            self.refresh_sensor_columns()
+            self.update_graph()
+            # 센서 상태 판정 (LED와 경보 표시에 공통 사용)
+            states = self.data_processor.get_sensor_states()
+            self.update_alarm_status(states)
+            # LED 디스플레이
+            if hasattr(self, 'led_display'):
                 latest_values = self.data_processor.get_latest_values()
-                self.stats_view.update_stats(latest_values)
-        self._update_scheduled = False
-        self.schedule_update_graph()
\ No newline at end of file
+                self.led_display.update_leds(latest_values, states)
+            # 센서 제어 패널 7세그먼트
+            if hasattr(self, 'sensor_control'):
+                latest_values = self.data_processor.get_latest_values()
+                self.sensor_control.update_sensor_list(latest_values)
+                self.sensor_control.update_display(latest_values)
+            # 테이블/통계 (경량 모드 아닐 때만)
+            if not self.is_lightweight_mode:
+                if hasattr(self, 'data_table'):
+                    df = self.data_processor.get_dataframe()
+                    if df is not None and not df.empty:
+                        self.data_table.update_table(df)
+                if hasattr(self, 'stats_view'):
+                    latest_values = self.data_processor.get_latest_values()
+                    self.stats_view.update_stats(latest_values, self.data_processor.get_twin_stats())
+        except Exception as e:
+            print(f"UI 갱신 오류: {e}")
+        finally:
+            # 한 번 실패해도 다음 갱신은 계속 예약
+            self._update_scheduled = False
+            self.schedule_update_graph()
\ No newline at end of file
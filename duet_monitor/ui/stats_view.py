@@ -1,6 +1,7 @@
 """
 통계 뷰 모듈
 """
+import math
 import tkinter as tk
 from tkinter import ttk
 import pandas as pd
@@ -76,8 +77,14 @@ class StatsView(ttk.LabelFrame):
         section_frame.pack(fill=tk.X, padx=5, pady=5)
         return section_frame
         
-    def update_stats(self, values: Dict[str, Any]):
-        """통계 정보 업데이트"""
+    def update_stats(self, values: Dict[str, Any], twin_stats: Optional[Dict[str, Dict[str, Any]]] = None):
+        """
+        통계 정보 업데이트
+        
+        Args:
+            values: 최신 센서 값
+            twin_stats: pt1/pt2 트윈 센서 일치도 통계 (DataProcessor.get_twin_stats)
+        """
         if not values:
             return
             
@@ -127,6 +134,10 @@ class StatsView(ttk.LabelFrame):
                             value = f"{value:.2f}"
                         self._add_stat_row(group_frame, f"{sensor}{unit_text}", value)
                         
+            # 트윈 센서 일치도 섹션 (드리프트 표시)
+            if twin_stats:
+                self._add_twin_section(twin_stats)
+                
             # 스크롤 영역 업데이트
             self.canvas.configure(scrollregion=self.canvas.bbox("all"))
             
@@ -158,6 +169,20 @@ class StatsView(ttk.LabelFrame):
         # 딕셔너리에 저장
         self.stats_labels[label] = (label_widget, value_widget)
         
+    def _add_twin_section(self, twin_stats: Dict[str, Dict[str, Any]]):
+        """트윈 센서 일치도 섹션 추가"""
+        twin_frame = self.create_stats_section("트윈 센서 일치도")
+        for name, stats in sorted(twin_stats.items()):
+            corr = stats.get("correlation", math.nan)
+            ratio = stats.get("ratio", math.nan)
+            corr_text = "-" if math.isnan(corr) else f"{corr:.2f}"
+            ratio_text = "-" if math.isnan(ratio) else f"{ratio:.2f}"
+            status = "⚠ 드리프트" if stats.get("drift") else "정상"
+            self._add_stat_row(
+                twin_frame, name,
+                f"r={corr_text} 비율={ratio_text} 편차={stats.get('bias', 0.0):+.2f} [{status}]"
+            )
+            
     def _group_sensors(self, values: Dict[str, Any]) -> Dict[str, List[str]]:
         """
         센서 그룹화
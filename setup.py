@@ -11,6 +11,9 @@ setup(
         "matplotlib==3.8.3",
         "numpy>=1.24.0"
     ],
+    extras_require={
+        "parquet": ["pyarrow>=14.0.0"],
+    },
     entry_points={
         'console_scripts': [
             'duet-monitor=duet_monitor.main:main',